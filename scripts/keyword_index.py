@@ -0,0 +1,137 @@
+"""
+Keyword Index for the Resume Analyzer
+Single-pass keyword occurrence index that answers presence and evidence-snippet queries
+"""
+
+import bisect
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+from skill_matcher import AhoCorasick
+
+# Characters that re.IGNORECASE treats as 'i'/'s' although str.lower() leaves them alone
+_REGEX_CASE_FOLDS = ('ı', 'ſ')
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == '_'
+
+
+class KeywordIndex:
+    """
+    Occurrences of a fixed keyword vocabulary in one text.
+
+    contains() mirrors `keyword in text.lower()` and evidence() mirrors the first
+    match of re.findall(r'.{0,50}\\bkeyword\\b.{0,50}', text, re.IGNORECASE), both
+    answered from offsets collected in a single scan. Texts where lowercasing
+    shifts offsets fall back to the regex.
+    """
+
+    def __init__(self, text: str, lower: str, occurrences: Dict[str, List[int]]):
+        self.text = text
+        self.lower = lower
+        self._occurrences = occurrences
+        self._whole_words: Dict[str, List[int]] = {}
+        self._exact = len(lower) == len(text) and not any(ch in text for ch in _REGEX_CASE_FOLDS)
+
+    def contains(self, keyword: str) -> bool:
+        """Return whether keyword occurs anywhere in the lowercased text"""
+        starts = self._occurrences.get(keyword)
+        if starts is None:
+            return keyword in self.lower
+        return bool(starts)
+
+    def matches(self, keywords: Iterable[str]) -> List[str]:
+        """Return the keywords that occur in the text, in the given order"""
+        return [kw for kw in keywords if self.contains(kw)]
+
+    def _boundary(self, pos: int) -> bool:
+        text = self.text
+        before = pos > 0 and _is_word_char(text[pos - 1])
+        after = pos < len(text) and _is_word_char(text[pos])
+        return before != after
+
+    def _word_starts(self, keyword: str) -> List[int]:
+        starts = self._whole_words.get(keyword)
+        if starts is None:
+            size = len(keyword)
+            starts = [q for q in self._occurrences[keyword] if self._boundary(q) and self._boundary(q + size)]
+            self._whole_words[keyword] = starts
+        return starts
+
+    def evidence(self, keyword: str, context: int = 50) -> Optional[str]:
+        """
+        Return the text around the first whole-word occurrence of keyword
+
+        Args:
+            keyword: Lowercase keyword
+            context: Characters kept on each side (snippets never cross a line break)
+
+        Returns:
+            Stripped snippet, or None when keyword does not occur as a whole word
+        """
+        if not self._exact or keyword not in self._occurrences:
+            pattern = rf'.{{0,{context}}}\b{re.escape(keyword)}\b.{{0,{context}}}'
+            found = re.search(pattern, self.text, re.IGNORECASE)
+            return found.group(0).strip() if found else None
+
+        starts = self._word_starts(keyword)
+        if not starts:
+            return None
+
+        text = self.text
+        first = starts[0]
+        line_start = text.rfind('\n', 0, first) + 1
+        line_end = text.find('\n', first)
+        if line_end == -1:
+            line_end = len(text)
+
+        # Leftmost start that can reach the first occurrence without crossing a newline
+        start = max(line_start, first - context)
+        # The greedy prefix settles on the last occurrence it can reach from there
+        last = starts[bisect.bisect_right(starts, min(start + context, line_end - 1)) - 1]
+        end = min(last + len(keyword) + context, line_end)
+        return text[start:end].strip()
+
+
+class KeywordScanner:
+    """
+    Compiles a keyword vocabulary once and indexes texts against it, keeping
+    recent indexes so the same resume or job description is scanned once.
+    """
+
+    def __init__(self, keywords: Iterable[str], cache_size: int = 256):
+        """
+        Initialize the scanner
+
+        Args:
+            keywords: Lowercase keywords to index
+            cache_size: Indexed texts kept for reuse
+        """
+        self.keywords = list(dict.fromkeys(keywords))
+        self.cache_size = cache_size
+        self._automaton = AhoCorasick({kw: kw for kw in self.keywords})
+        self._cache: "OrderedDict[str, KeywordIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def index(self, text: str) -> KeywordIndex:
+        """Return the keyword index for text, scanning it on first use"""
+        with self._lock:
+            cached = self._cache.get(text)
+            if cached is not None:
+                self._cache.move_to_end(text)
+                return cached
+
+        lower = text.lower()
+        occurrences: Dict[str, List[int]] = {kw: [] for kw in self.keywords}
+        for start, _, keyword in self._automaton.iter_matches(lower):
+            occurrences[keyword].append(start)
+        index = KeywordIndex(text, lower, occurrences)
+
+        with self._lock:
+            self._cache[text] = index
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return index
@@ -8,12 +8,15 @@ import os
 import sys
 import json
 import logging
+import socketserver
+import threading
+import hashlib
 from typing import Dict, List, Any, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict, field
 import PyPDF2
 import spacy
 import re
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 
 # LangChain imports
 try:
@@ -29,10 +32,95 @@ except ImportError:
     LANGCHAIN_AVAILABLE = False
     logging.warning("LangChain not available. Using basic analysis.")
 
+# Shared embedding engine from the Python services (loads the model once, batches and caches vectors)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'services', 'python'))
+try:
+    from embedding_engine import get_embedding_engine
+    EMBEDDING_ENGINE_AVAILABLE = True
+except ImportError:
+    EMBEDDING_ENGINE_AVAILABLE = False
+try:
+    from document_extraction import get_extraction_engine
+    EXTRACTION_ENGINE_AVAILABLE = True
+except ImportError:
+    EXTRACTION_ENGINE_AVAILABLE = False
+
+# Skill taxonomy (aliases, categories, priorities) lives next to this script
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from skill_matcher import get_skill_taxonomy
+from keyword_index import KeywordScanner
+from semantic_similarity import SemanticSimilarityEngine
+
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# spaCy settings: skill extraction only reads noun chunks (tagger + parser), so the
+# lean mode skips the pipes that do not feed them
+SPACY_LEAN = os.getenv('SPACY_LEAN', 'true').lower() != 'false'
+SPACY_LEAN_EXCLUDE = ['ner', 'lemmatizer', 'textcat', 'textcat_multilabel', 'entity_ruler']
+SPACY_BATCH_SIZE = int(os.getenv('SPACY_BATCH_SIZE', '16'))
+SPACY_N_PROCESS = int(os.getenv('SPACY_N_PROCESS', '1'))
+NLP_CACHE_SIZE = int(os.getenv('NLP_CACHE_SIZE', '1024'))
+
+# Semantic similarity: words per embedded chunk and chunk embeddings kept in memory
+SEMANTIC_CHUNK_WORDS = int(os.getenv('SEMANTIC_CHUNK_WORDS', '150'))
+SEMANTIC_CACHE_SIZE = int(os.getenv('SEMANTIC_CACHE_SIZE', '4096'))
+
+# Experience categories scored by _analyze_experience
+EXPERIENCE_CATEGORIES = [
+    {
+        'category': 'Leadership & Management',
+        'keywords': ['lead', 'manage', 'supervise', 'direct', 'oversee', 'coordinate', 'mentor', 'guide', 'head'],
+        'weight': 0.25,
+        'description': 'Experience leading teams, managing projects, or supervising others'
+    },
+    {
+        'category': 'Team Collaboration',
+        'keywords': ['team', 'collaborate', 'group', 'cross-functional', 'stakeholder', 'partner', 'work with'],
+        'weight': 0.20,
+        'description': 'Working effectively in team environments and with stakeholders'
+    },
+    {
+        'category': 'Project Management',
+        'keywords': ['project', 'deliver', 'timeline', 'deadline', 'milestone', 'scope', 'budget', 'agile', 'scrum'],
+        'weight': 0.20,
+        'description': 'Managing projects from inception to completion'
+    },
+    {
+        'category': 'Client Interaction',
+        'keywords': ['client', 'customer', 'user', 'stakeholder', 'business', 'requirement', 'meeting', 'presentation'],
+        'weight': 0.15,
+        'description': 'Direct interaction with clients, customers, or end users'
+    },
+    {
+        'category': 'Problem Solving',
+        'keywords': ['solve', 'debug', 'troubleshoot', 'optimize', 'improve', 'fix', 'resolve', 'analyze'],
+        'weight': 0.10,
+        'description': 'Identifying and solving complex technical problems'
+    },
+    {
+        'category': 'Innovation & Development',
+        'keywords': ['develop', 'create', 'build', 'design', 'architect', 'implement', 'innovate', 'research'],
+        'weight': 0.10,
+        'description': 'Creating new solutions and driving innovation'
+    }
+]
+
+# Industry vocabularies used to detect a job's domain
+INDUSTRY_PATTERNS = {
+    'fintech': ['financial', 'banking', 'payment', 'trading', 'investment', 'fintech'],
+    'healthcare': ['healthcare', 'medical', 'patient', 'clinical', 'hospital', 'health'],
+    'ecommerce': ['ecommerce', 'retail', 'shopping', 'cart', 'payment', 'marketplace'],
+    'education': ['education', 'learning', 'student', 'academic', 'course', 'teaching'],
+    'saas': ['saas', 'software as a service', 'subscription', 'platform', 'cloud'],
+    'gaming': ['game', 'gaming', 'player', 'unity', 'unreal', 'mobile game'],
+    'automotive': ['automotive', 'vehicle', 'car', 'transportation', 'fleet'],
+    'manufacturing': ['manufacturing', 'production', 'factory', 'supply chain', 'logistics'],
+    'media': ['media', 'content', 'video', 'streaming', 'broadcast', 'publishing'],
+    'travel': ['travel', 'booking', 'hotel', 'flight', 'tourism', 'hospitality']
+}
+
 @dataclass
 class ResumeAnalysisRequest:
     """Request structure for resume analysis"""
@@ -58,6 +146,7 @@ class AnalysisResult:
     experience_analysis: List[Dict[str, Any]]
     highlights: List[Dict[str, Any]]
     overall_summary: str
+    semantic_matches: List[Dict[str, Any]] = field(default_factory=list)
 
 class ResumeAnalyzer:
     """Advanced Resume Analysis using AI and NLP"""
@@ -66,7 +155,15 @@ class ResumeAnalyzer:
         self.nlp = None
         self.llm = None
         self.embeddings = None
+        self.similarity_engine = None
         self.text_splitter = None
+        self._noun_chunk_cache: "OrderedDict[str, List[str]]" = OrderedDict()
+        self._noun_chunk_lock = threading.Lock()
+        self.skill_taxonomy = get_skill_taxonomy()
+        self.keyword_scanner = KeywordScanner(
+            [kw for category in EXPERIENCE_CATEGORIES for kw in category['keywords']] +
+            [kw for keywords in INDUSTRY_PATTERNS.values() for kw in keywords]
+        )
         
         self._initialize_models()
     
@@ -74,8 +171,11 @@ class ResumeAnalyzer:
         """Initialize AI models and NLP tools"""
         try:
             # Initialize spaCy for NLP
-            self.nlp = spacy.load("en_core_web_sm")
-            logger.info("✅ spaCy model loaded successfully")
+            if SPACY_LEAN:
+                self.nlp = spacy.load("en_core_web_sm", exclude=SPACY_LEAN_EXCLUDE)
+            else:
+                self.nlp = spacy.load("en_core_web_sm")
+            logger.info(f"✅ spaCy model loaded successfully (pipes: {', '.join(self.nlp.pipe_names)})")
         except OSError:
             logger.warning("❌ spaCy model not found. Please install: python -m spacy download en_core_web_sm")
             self.nlp = None
@@ -95,8 +195,16 @@ class ResumeAnalyzer:
                     logger.warning("⚠️ OpenAI API key not found. Using basic analysis.")
                 
                 # Initialize embeddings for semantic similarity
-                self.embeddings = HuggingFaceEmbeddings(
-                    model_name="sentence-transformers/all-MiniLM-L6-v2"
+                if EMBEDDING_ENGINE_AVAILABLE:
+                    self.embeddings = get_embedding_engine("sentence-transformers/all-MiniLM-L6-v2")
+                else:
+                    self.embeddings = HuggingFaceEmbeddings(
+                        model_name="sentence-transformers/all-MiniLM-L6-v2"
+                    )
+                self.similarity_engine = SemanticSimilarityEngine(
+                    self.embeddings,
+                    max_words=SEMANTIC_CHUNK_WORDS,
+                    cache_size=SEMANTIC_CACHE_SIZE
                 )
                 self.text_splitter = RecursiveCharacterTextSplitter(
                     chunk_size=1000,
@@ -108,6 +216,18 @@ class ResumeAnalyzer:
                 logger.error(f"❌ Error initializing AI models: {e}")
                 self.llm = None
                 self.embeddings = None
+                self.similarity_engine = None
+    
+    def warm_up(self):
+        """Load lazily initialised models now so the first request is not slow"""
+        if self.nlp:
+            self.nlp("warm up")
+        if self.embeddings:
+            try:
+                self.embeddings.embed_query("warm up")
+                logger.info("✅ Embedding model warmed up")
+            except Exception as e:
+                logger.warning(f"⚠️ Embedding warm-up failed: {e}")
     
     def extract_text_from_pdf(self, pdf_path: str) -> str:
         """Extract text from PDF resume"""
@@ -116,11 +236,15 @@ class ResumeAnalyzer:
                 logger.error(f"PDF file not found: {pdf_path}")
                 return ""
             
-            text = ""
-            with open(pdf_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
+            if EXTRACTION_ENGINE_AVAILABLE:
+                result = get_extraction_engine().extract(pdf_path, 'pdf')
+                if not result.ok:
+                    raise RuntimeError(result.error)
+                text = result.text("\n")
+            else:
+                with open(pdf_path, 'rb') as file:
+                    pdf_reader = PyPDF2.PdfReader(file)
+                    text = "\n".join(page.extract_text() for page in pdf_reader.pages)
             
             logger.info(f"✅ Extracted {len(text)} characters from PDF")
             return text.strip()
@@ -131,34 +255,64 @@ class ResumeAnalyzer:
     
     def extract_skills_with_nlp(self, text: str) -> List[str]:
         """Extract skills using NLP and pattern matching"""
-        if not self.nlp:
-            return self._extract_skills_basic(text)
-        
-        doc = self.nlp(text.lower())
-        skills = set()
-        
-        # Technical skills patterns
-        tech_patterns = [
-            r'\b(?:javascript|python|java|c\+\+|c#|php|ruby|go|rust|swift|kotlin)\b',
-            r'\b(?:react|angular|vue|svelte|ember)\b',
-            r'\b(?:node\.js|express|django|flask|spring|laravel)\b',
-            r'\b(?:mysql|postgresql|mongodb|redis|cassandra|elasticsearch)\b',
-            r'\b(?:docker|kubernetes|jenkins|gitlab|github|git)\b',
-            r'\b(?:aws|azure|gcp|heroku|vercel|netlify)\b',
-            r'\b(?:html|css|sass|scss|tailwind|bootstrap)\b',
-            r'\b(?:typescript|babel|webpack|vite|rollup)\b'
-        ]
-        
-        for pattern in tech_patterns:
-            matches = re.findall(pattern, text.lower())
-            skills.update(matches)
+        return self.extract_skills_batch([text])[0]
+    
+    def extract_skills_batch(self, texts: List[str]) -> List[List[str]]:
+        """
+        Extract skills from many texts, parsing them together with nlp.pipe
         
-        # Extract noun chunks that might be skills
-        for chunk in doc.noun_chunks:
-            if len(chunk.text) > 2 and chunk.text.lower() not in ['experience', 'work', 'job', 'company']:
-                skills.add(chunk.text.lower())
+        Args:
+            texts: Resume texts
+            
+        Returns:
+            One skill list per text, in the same order
+        """
+        if not self.nlp:
+            return [self._extract_skills_basic(text) for text in texts]
         
-        return list(skills)[:20]  # Limit to top 20 skills
+        results = []
+        for text, noun_chunks in zip(texts, self._parse_noun_chunks(texts)):
+            # Taxonomy skills (canonical names) in one pass over the text, ahead of noun chunks
+            skills = self.skill_taxonomy.find_skills(text)
+            seen = set(skills)
+            
+            # Noun chunks that might be skills
+            for chunk_text in noun_chunks:
+                if len(chunk_text) > 2 and chunk_text not in ['experience', 'work', 'job', 'company'] and chunk_text not in seen:
+                    seen.add(chunk_text)
+                    skills.append(chunk_text)
+            
+            results.append(skills[:20])  # Limit to top 20 skills
+        return results
+    
+    def _parse_noun_chunks(self, texts: List[str]) -> List[List[str]]:
+        """Noun chunks of each lowercased text, cached by text hash so a resume is parsed once"""
+        lowered = [text.lower() for text in texts]
+        keys = [hashlib.sha1(text.encode('utf-8')).hexdigest() for text in lowered]
+        
+        found: Dict[str, List[str]] = {}
+        pending: Dict[str, str] = {}
+        with self._noun_chunk_lock:
+            for key, text in zip(keys, lowered):
+                if key in self._noun_chunk_cache:
+                    self._noun_chunk_cache.move_to_end(key)
+                    found[key] = self._noun_chunk_cache[key]
+                elif key not in pending:
+                    pending[key] = text
+        
+        if pending:
+            n_process = SPACY_N_PROCESS if len(pending) > SPACY_BATCH_SIZE else 1
+            docs = self.nlp.pipe(pending.values(), batch_size=SPACY_BATCH_SIZE, n_process=n_process)
+            for key, doc in zip(pending, docs):
+                # Only the chunk strings are kept; whole Doc objects would hold every token and vector
+                found[key] = [chunk.text for chunk in doc.noun_chunks]
+            with self._noun_chunk_lock:
+                for key in pending:
+                    self._noun_chunk_cache[key] = found[key]
+                while len(self._noun_chunk_cache) > NLP_CACHE_SIZE:
+                    self._noun_chunk_cache.popitem(last=False)
+        
+        return [found[key] for key in keys]
     
     def _extract_skills_basic(self, text: str) -> List[str]:
         """Basic skill extraction without NLP"""
@@ -174,24 +328,26 @@ class ResumeAnalyzer:
     
     def calculate_semantic_similarity(self, text1: str, text2: str) -> float:
         """Calculate semantic similarity between two texts"""
-        if not self.embeddings:
-            return self._calculate_basic_similarity(text1, text2)
+        return self.semantic_match(text1, text2)['score']
+    
+    def semantic_match(self, resume_text: str, job_description: str) -> Dict[str, Any]:
+        """
+        Chunk-level semantic comparison of a resume and a job description
+        
+        Returns:
+            Dict with score (0-1, how well the resume covers the job description)
+            and passages (best-matching job/resume chunk pairs)
+        """
+        if not self.similarity_engine:
+            return {'score': self._calculate_basic_similarity(resume_text, job_description), 'passages': []}
         
         try:
-            # Create embeddings
-            embedding1 = self.embeddings.embed_query(text1)
-            embedding2 = self.embeddings.embed_query(text2)
-            
-            # Calculate cosine similarity
-            import numpy as np
-            similarity = np.dot(embedding1, embedding2) / (
-                np.linalg.norm(embedding1) * np.linalg.norm(embedding2)
-            )
-            return float(similarity)
+            match = self.similarity_engine.compare(resume_text, job_description)
+            return {'score': match.score, 'passages': match.passages}
         
         except Exception as e:
             logger.error(f"Error calculating semantic similarity: {e}")
-            return self._calculate_basic_similarity(text1, text2)
+            return {'score': self._calculate_basic_similarity(resume_text, job_description), 'passages': []}
     
     def _calculate_basic_similarity(self, text1: str, text2: str) -> float:
         """Basic similarity calculation using word overlap"""
@@ -414,7 +570,8 @@ class ResumeAnalyzer:
         experience_analysis = self._analyze_experience(resume_text, request.job_description)
         
         # Calculate overall score with semantic similarity
-        semantic_score = self.calculate_semantic_similarity(resume_text, request.job_description) * 100
+        semantic = self.semantic_match(resume_text, request.job_description)
+        semantic_score = semantic['score'] * 100
         overall_score = self._calculate_weighted_score(
             skills_analysis['score'],
             experience_analysis['score'],
@@ -450,12 +607,113 @@ class ResumeAnalyzer:
             suggestions=suggestions,
             experience_analysis=experience_analysis.get('detailed_categories', []),
             highlights=highlights,
-            overall_summary=self._generate_summary(int(overall_score), skills_analysis, experience_analysis)
+            overall_summary=self._generate_summary(int(overall_score), skills_analysis, experience_analysis),
+            semantic_matches=semantic['passages']
         )
         
         logger.info(f"✅ Analysis complete. Overall score: {overall_score}%")
         return result
     
+    def _semantic_matrix(self, resume_texts: List[str], job_texts: List[str]):
+        """
+        Semantic score of every resume against every job, embedding each chunk once
+        
+        Returns:
+            NumPy array of shape (len(resume_texts), len(job_texts))
+        """
+        import numpy as np
+        
+        if self.similarity_engine:
+            try:
+                return self.similarity_engine.matrix(resume_texts, job_texts)
+            except Exception as e:
+                logger.error(f"Error calculating semantic similarity matrix: {e}")
+        
+        return np.array([
+            [self._calculate_basic_similarity(resume_text, job_text) for job_text in job_texts]
+            for resume_text in resume_texts
+        ], dtype=np.float32).reshape(len(resume_texts), len(job_texts))
+    
+    def analyze_batch(self, resumes: List[Dict[str, Any]], jobs: List[Dict[str, Any]]):
+        """
+        Score every resume against every job
+        
+        Each resume and job is parsed, skill-extracted and embedded once; the
+        semantic scores for the whole matrix come from one matrix product.
+        LLM suggestions and highlights are not generated in batch mode.
+        
+        Args:
+            resumes: Dicts with id, resume_text or resume_path, and optional user_skills
+            jobs: Dicts with id, job_description, job_title and optional job_requirements
+            
+        Yields:
+            One score dict per (resume, job) pair, or an error dict per unreadable resume
+        """
+        prepared_resumes = []
+        for resume in resumes:
+            resume_text = resume.get('resume_text') or ""
+            if not resume_text and resume.get('resume_path'):
+                resume_text = self.extract_text_from_pdf(os.path.join(os.getcwd(), 'public', resume['resume_path']))
+            if not resume_text:
+                yield {'resume_id': resume.get('id'), 'error': 'No resume text available'}
+                continue
+            
+            prepared_resumes.append({
+                'id': resume.get('id'),
+                'text': resume_text,
+                'user_skills': resume.get('user_skills', [])
+            })
+        
+        # All resumes go through the NLP pipeline together
+        extracted = self.extract_skills_batch([r['text'] for r in prepared_resumes])
+        for resume, extracted_skills in zip(prepared_resumes, extracted):
+            resume['skills'] = list(set(resume.pop('user_skills') + extracted_skills))
+        
+        prepared_jobs = [
+            {
+                'id': job.get('id'),
+                'description': job.get('job_description', ''),
+                'keywords': self._extract_job_keywords(job.get('job_description', ''), job.get('job_title', '')),
+                'required_skills': self._extract_required_skills(job.get('job_description', ''), job.get('job_requirements', []))
+            }
+            for job in jobs
+        ]
+        
+        if not prepared_resumes or not prepared_jobs:
+            return
+        
+        semantic = self._semantic_matrix(
+            [r['text'] for r in prepared_resumes],
+            [j['description'] for j in prepared_jobs]
+        ) * 100
+        
+        for i, resume in enumerate(prepared_resumes):
+            for j, job in enumerate(prepared_jobs):
+                skills_analysis = self._analyze_skills(resume['skills'], job['required_skills'])
+                keyword_analysis = self._analyze_keywords(resume['text'], job['keywords'])
+                experience_analysis = self._analyze_experience(resume['text'], job['description'])
+                semantic_score = float(semantic[i, j])
+                overall_score = self._calculate_weighted_score(
+                    skills_analysis['score'],
+                    experience_analysis['score'],
+                    keyword_analysis['score'],
+                    semantic_score
+                )
+                
+                yield {
+                    'resume_id': resume['id'],
+                    'job_id': job['id'],
+                    'overall_score': int(overall_score),
+                    'skills_score': skills_analysis['score'],
+                    'experience_score': experience_analysis['score'],
+                    'keyword_score': keyword_analysis['score'],
+                    'semantic_score': round(semantic_score, 1),
+                    'matched_skills': skills_analysis['matched'],
+                    'missing_skills': skills_analysis['missing'],
+                    'found_keywords': keyword_analysis['found'],
+                    'missing_keywords': keyword_analysis['missing']
+                }
+    
     def _extract_job_keywords(self, job_description: str, job_title: str) -> List[str]:
         """Extract important keywords from job description"""
         text = f"{job_title} {job_description}".lower()
@@ -503,75 +761,12 @@ class ResumeAnalyzer:
     
     def _analyze_skills(self, user_skills: List[str], required_skills: List[str]) -> Dict[str, Any]:
         """Analyze skill match with detailed categorization and prioritization"""
-        user_skills_lower = [skill.lower().strip() for skill in user_skills]
-        required_skills_lower = [skill.lower().strip() for skill in required_skills]
-        
-        # Enhanced skill matching with variations
-        skill_variations = {
-            'javascript': ['js', 'javascript', 'ecmascript', 'es6', 'es2015', 'es2020'],
-            'typescript': ['ts', 'typescript'],
-            'react': ['react', 'reactjs', 'react.js'],
-            'angular': ['angular', 'angularjs', 'angular2+'],
-            'vue': ['vue', 'vuejs', 'vue.js'],
-            'node.js': ['node', 'nodejs', 'node.js'],
-            'express': ['express', 'expressjs', 'express.js'],
-            'mongodb': ['mongo', 'mongodb'],
-            'postgresql': ['postgres', 'postgresql', 'psql'],
-            'mysql': ['mysql'],
-            'python': ['python', 'py'],
-            'java': ['java'],
-            'c++': ['c++', 'cpp', 'cplusplus'],
-            'c#': ['c#', 'csharp', 'c-sharp'],
-            'php': ['php'],
-            'html': ['html', 'html5'],
-            'css': ['css', 'css3'],
-            'sass': ['sass', 'scss'],
-            'docker': ['docker', 'containerization'],
-            'kubernetes': ['kubernetes', 'k8s'],
-            'aws': ['aws', 'amazon web services'],
-            'azure': ['azure', 'microsoft azure'],
-            'gcp': ['gcp', 'google cloud platform', 'google cloud'],
-            'git': ['git', 'version control'],
-            'github': ['github'],
-            'gitlab': ['gitlab'],
-            'jenkins': ['jenkins', 'ci/cd'],
-            'rest api': ['rest', 'restful', 'api', 'rest api'],
-            'graphql': ['graphql', 'gql'],
-            'redis': ['redis'],
-            'elasticsearch': ['elasticsearch', 'elastic search'],
-            'microservices': ['microservices', 'microservice architecture'],
-            'agile': ['agile', 'scrum', 'kanban'],
-            'machine learning': ['ml', 'machine learning', 'artificial intelligence', 'ai'],
-            'data science': ['data science', 'data analysis', 'analytics'],
-            'devops': ['devops', 'dev ops'],
-            'linux': ['linux', 'unix'],
-            'windows': ['windows'],
-            'macos': ['macos', 'mac os']
-        }
-        
-        # Categorize skills by priority and type
-        skill_categories = {
-            'core_programming': ['javascript', 'python', 'java', 'c++', 'c#', 'php', 'typescript'],
-            'frontend_frameworks': ['react', 'angular', 'vue', 'svelte'],
-            'backend_frameworks': ['node.js', 'express', 'django', 'flask', 'spring'],
-            'databases': ['mongodb', 'postgresql', 'mysql', 'redis', 'elasticsearch'],
-            'cloud_platforms': ['aws', 'azure', 'gcp'],
-            'devops_tools': ['docker', 'kubernetes', 'jenkins', 'git', 'github', 'gitlab'],
-            'styling': ['html', 'css', 'sass', 'bootstrap', 'tailwind'],
-            'soft_skills': ['agile', 'scrum', 'leadership', 'teamwork', 'communication']
-        }
+        taxonomy = self.skill_taxonomy
         
-        # Normalize skills using variations
-        def normalize_skill(skill):
-            skill_lower = skill.lower().strip()
-            for normalized, variations in skill_variations.items():
-                if skill_lower in variations:
-                    return normalized
-            return skill_lower
-        
-        # Normalize all skills
-        normalized_user_skills = [normalize_skill(skill) for skill in user_skills]
-        normalized_required_skills = [normalize_skill(skill) for skill in required_skills]
+        # Normalize all skills to canonical taxonomy names
+        normalized_user_skills = [taxonomy.normalize(skill) for skill in user_skills]
+        normalized_required_skills = [taxonomy.normalize(skill) for skill in required_skills]
+        user_skill_set = set(normalized_user_skills)
         
         # Find matches with detailed analysis
         matched_skills = []
@@ -579,15 +774,13 @@ class ResumeAnalyzer:
         partial_matches = []
         
         for req_skill in normalized_required_skills:
-            exact_match = req_skill in normalized_user_skills
-            partial_match = any(req_skill in user_skill or user_skill in req_skill 
-                              for user_skill in normalized_user_skills)
-            
-            if exact_match:
+            if req_skill in user_skill_set:
                 matched_skills.append(req_skill)
-            elif partial_match:
-                partial_user_skill = next((user_skill for user_skill in normalized_user_skills 
-                                         if req_skill in user_skill or user_skill in req_skill), None)
+                continue
+            
+            partial_user_skill = next((user_skill for user_skill in normalized_user_skills 
+                                     if req_skill in user_skill or user_skill in req_skill), None)
+            if partial_user_skill is not None:
                 partial_matches.append({
                     'required': req_skill,
                     'user_has': partial_user_skill,
@@ -602,11 +795,10 @@ class ResumeAnalyzer:
         nice_to_have_missing = []
         
         for missing_skill in missing_skills:
-            if missing_skill in skill_categories['core_programming']:
+            priority = taxonomy.priority(missing_skill)
+            if priority == 'critical':
                 critical_missing.append(missing_skill)
-            elif missing_skill in skill_categories['frontend_frameworks'] or \
-                 missing_skill in skill_categories['backend_frameworks'] or \
-                 missing_skill in skill_categories['databases']:
+            elif priority == 'important':
                 important_missing.append(missing_skill)
             else:
                 nice_to_have_missing.append(missing_skill)
@@ -646,60 +838,21 @@ class ResumeAnalyzer:
     
     def _analyze_experience(self, resume_text: str, job_description: str) -> Dict[str, Any]:
         """Analyze experience match with detailed breakdown"""
-        resume_lower = resume_text.lower()
-        job_lower = job_description.lower()
+        # Each text is scanned once for every category and industry keyword
+        resume_index = self.keyword_scanner.index(resume_text)
+        job_index = self.keyword_scanner.index(job_description)
         
         # Extract years of experience with more patterns
         resume_years = self._extract_years_experience(resume_text)
         job_years = self._extract_required_years(job_description)
         
-        # Define comprehensive experience categories
-        experience_categories = [
-            {
-                'category': 'Leadership & Management',
-                'keywords': ['lead', 'manage', 'supervise', 'direct', 'oversee', 'coordinate', 'mentor', 'guide', 'head'],
-                'weight': 0.25,
-                'description': 'Experience leading teams, managing projects, or supervising others'
-            },
-            {
-                'category': 'Team Collaboration',
-                'keywords': ['team', 'collaborate', 'group', 'cross-functional', 'stakeholder', 'partner', 'work with'],
-                'weight': 0.20,
-                'description': 'Working effectively in team environments and with stakeholders'
-            },
-            {
-                'category': 'Project Management',
-                'keywords': ['project', 'deliver', 'timeline', 'deadline', 'milestone', 'scope', 'budget', 'agile', 'scrum'],
-                'weight': 0.20,
-                'description': 'Managing projects from inception to completion'
-            },
-            {
-                'category': 'Client Interaction',
-                'keywords': ['client', 'customer', 'user', 'stakeholder', 'business', 'requirement', 'meeting', 'presentation'],
-                'weight': 0.15,
-                'description': 'Direct interaction with clients, customers, or end users'
-            },
-            {
-                'category': 'Problem Solving',
-                'keywords': ['solve', 'debug', 'troubleshoot', 'optimize', 'improve', 'fix', 'resolve', 'analyze'],
-                'weight': 0.10,
-                'description': 'Identifying and solving complex technical problems'
-            },
-            {
-                'category': 'Innovation & Development',
-                'keywords': ['develop', 'create', 'build', 'design', 'architect', 'implement', 'innovate', 'research'],
-                'weight': 0.10,
-                'description': 'Creating new solutions and driving innovation'
-            }
-        ]
-        
         detailed_analysis = []
         total_weighted_score = 0
         
-        for category in experience_categories:
+        for category in EXPERIENCE_CATEGORIES:
             # Check for keywords in both resume and job description
-            resume_matches = [kw for kw in category['keywords'] if kw in resume_lower]
-            job_mentions = [kw for kw in category['keywords'] if kw in job_lower]
+            resume_matches = resume_index.matches(category['keywords'])
+            job_mentions = job_index.matches(category['keywords'])
             
             # Calculate relevance
             has_experience = len(resume_matches) > 0
@@ -727,11 +880,9 @@ class ResumeAnalyzer:
             evidence = []
             for keyword in resume_matches[:3]:  # Top 3 matches
                 # Find context around the keyword
-                import re
-                pattern = rf'.{{0,50}}\b{re.escape(keyword)}\b.{{0,50}}'
-                matches = re.findall(pattern, resume_text, re.IGNORECASE)
-                if matches:
-                    evidence.append(matches[0].strip())
+                snippet = resume_index.evidence(keyword)
+                if snippet:
+                    evidence.append(snippet)
             
             detailed_analysis.append({
                 'category': category['category'],
@@ -806,24 +957,11 @@ class ResumeAnalyzer:
 
     def _extract_industry_keywords(self, job_description: str) -> List[str]:
         """Extract industry-specific keywords from job description"""
-        industry_patterns = {
-            'fintech': ['financial', 'banking', 'payment', 'trading', 'investment', 'fintech'],
-            'healthcare': ['healthcare', 'medical', 'patient', 'clinical', 'hospital', 'health'],
-            'ecommerce': ['ecommerce', 'retail', 'shopping', 'cart', 'payment', 'marketplace'],
-            'education': ['education', 'learning', 'student', 'academic', 'course', 'teaching'],
-            'saas': ['saas', 'software as a service', 'subscription', 'platform', 'cloud'],
-            'gaming': ['game', 'gaming', 'player', 'unity', 'unreal', 'mobile game'],
-            'automotive': ['automotive', 'vehicle', 'car', 'transportation', 'fleet'],
-            'manufacturing': ['manufacturing', 'production', 'factory', 'supply chain', 'logistics'],
-            'media': ['media', 'content', 'video', 'streaming', 'broadcast', 'publishing'],
-            'travel': ['travel', 'booking', 'hotel', 'flight', 'tourism', 'hospitality']
-        }
-        
-        job_lower = job_description.lower()
+        job_index = self.keyword_scanner.index(job_description)
         found_industries = []
         
-        for industry, keywords in industry_patterns.items():
-            if any(keyword in job_lower for keyword in keywords):
+        for industry, keywords in INDUSTRY_PATTERNS.items():
+            if any(job_index.contains(keyword) for keyword in keywords):
                 found_industries.extend(keywords)
         
         return found_industries
@@ -833,8 +971,7 @@ class ResumeAnalyzer:
         if not industry_keywords:
             return 70  # Neutral score if no industry context
         
-        resume_lower = resume_text.lower()
-        matches = [kw for kw in industry_keywords if kw in resume_lower]
+        matches = self.keyword_scanner.index(resume_text).matches(industry_keywords)
         
         if not matches:
             return 30  # Low score for no industry match
@@ -975,13 +1112,163 @@ class ResumeAnalyzer:
         
         return base_summary + detailed_breakdown + recommendations
 
+def result_to_dict(result: AnalysisResult) -> Dict[str, Any]:
+    """Serialize an AnalysisResult for JSON output"""
+    return asdict(result)
+
+
+def error_result(message: str) -> Dict[str, Any]:
+    """JSON payload returned when an analysis fails"""
+    return {
+        'error': message,
+        'overall_score': 0,
+        'skills_score': 0,
+        'experience_score': 0,
+        'keyword_score': 0,
+        'matched_skills': [],
+        'missing_skills': [],
+        'found_keywords': [],
+        'missing_keywords': [],
+        'suggestions': [],
+        'experience_analysis': [],
+        'highlights': [],
+        'overall_summary': 'Analysis failed due to an error.'
+    }
+
+
+def handle_request(analyzer: ResumeAnalyzer, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Answer one resident-mode request
+
+    The payload is a ResumeAnalysisRequest plus an optional "id" that is echoed
+    back, or {"command": "ping"} to check the worker is alive.
+    """
+    request_id = payload.pop('id', None)
+    if payload.get('command') == 'ping':
+        response = {'ok': True}
+    else:
+        try:
+            response = result_to_dict(analyzer.analyze_resume(ResumeAnalysisRequest(**payload)))
+        except Exception as e:
+            logger.error(f"❌ Analysis failed: {e}")
+            response = error_result(str(e))
+    if request_id is not None:
+        response['id'] = request_id
+    return response
+
+
+def _parse_line(line: str) -> Optional[Dict[str, Any]]:
+    try:
+        payload = json.loads(line)
+        return payload if isinstance(payload, dict) else None
+    except json.JSONDecodeError:
+        return None
+
+
+def serve_stdio(analyzer: ResumeAnalyzer):
+    """Read JSON-lines requests from stdin and write one JSON line per response to stdout"""
+    logger.info("🟢 Resume analyzer worker ready (stdin/stdout)")
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        payload = _parse_line(line)
+        response = handle_request(analyzer, payload) if payload is not None else error_result("Invalid JSON request")
+        sys.stdout.write(json.dumps(response) + "\n")
+        sys.stdout.flush()
+
+
+def serve_socket(analyzer: ResumeAnalyzer, socket_path: str):
+    """Serve JSON-lines requests on a Unix socket; each connection may send many requests"""
+    analysis_lock = threading.Lock()
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for raw in self.rfile:
+                line = raw.decode('utf-8').strip()
+                if not line:
+                    continue
+                payload = _parse_line(line)
+                if payload is None:
+                    response = error_result("Invalid JSON request")
+                else:
+                    with analysis_lock:
+                        response = handle_request(analyzer, payload)
+                self.wfile.write((json.dumps(response) + "\n").encode('utf-8'))
+                self.wfile.flush()
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    with socketserver.ThreadingUnixStreamServer(socket_path, Handler) as server:
+        logger.info(f"🟢 Resume analyzer worker listening on {socket_path}")
+        try:
+            server.serve_forever()
+        finally:
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+
+
+def run_batch(manifest_path: str, output_path: Optional[str] = None):
+    """
+    Score a JSONL manifest of resumes and jobs, streaming one JSON line per pair
+    
+    Manifest lines look like {"type": "resume", "id": ..., "resume_path"|"resume_text": ..., "user_skills": [...]}
+    or {"type": "job", "id": ..., "job_title": ..., "job_description": ..., "job_requirements": [...]}.
+    """
+    resumes, jobs = [], []
+    with open(manifest_path, 'r', encoding='utf-8') as manifest:
+        for line_number, line in enumerate(manifest, 1):
+            line = line.strip()
+            if not line:
+                continue
+            record = _parse_line(line)
+            if record is None or record.get('type') not in ('resume', 'job'):
+                logger.warning(f"⚠️ Skipping invalid manifest line {line_number}")
+                continue
+            (resumes if record['type'] == 'resume' else jobs).append(record)
+    
+    logger.info(f"📦 Batch: {len(resumes)} resumes x {len(jobs)} jobs")
+    analyzer = ResumeAnalyzer()
+    output = open(output_path, 'w', encoding='utf-8') if output_path else sys.stdout
+    try:
+        for row in analyzer.analyze_batch(resumes, jobs):
+            output.write(json.dumps(row) + "\n")
+            output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
 def main():
     """Main function for command-line usage"""
     if len(sys.argv) < 2:
         print("Usage: python resume_analyzer.py <json_request>")
         print("   or: python resume_analyzer.py --test")
+        print("   or: python resume_analyzer.py --serve             (JSON lines on stdin/stdout)")
+        print("   or: python resume_analyzer.py --socket <path>     (JSON lines on a Unix socket)")
+        print("   or: python resume_analyzer.py --batch <manifest.jsonl> [output.jsonl]")
         sys.exit(1)
     
+    if sys.argv[1] == "--batch":
+        if len(sys.argv) < 3:
+            print("Usage: python resume_analyzer.py --batch <manifest.jsonl> [output.jsonl]")
+            sys.exit(1)
+        run_batch(sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else None)
+        return
+    
+    # Resident modes: load models once, then answer many requests
+    if sys.argv[1] in ("--serve", "--socket"):
+        analyzer = ResumeAnalyzer()
+        analyzer.warm_up()
+        if sys.argv[1] == "--serve":
+            serve_stdio(analyzer)
+        else:
+            if len(sys.argv) < 3:
+                print("Usage: python resume_analyzer.py --socket <path>")
+                sys.exit(1)
+            serve_socket(analyzer, sys.argv[2])
+        return
+    
     try:        # Check for test mode
         if sys.argv[1] == "--test":
             # Run a simple test
@@ -1004,40 +1291,10 @@ def main():
         result = analyzer.analyze_resume(request)
         
         # Output result as JSON
-        result_dict = {
-            'overall_score': result.overall_score,
-            'skills_score': result.skills_score,
-            'experience_score': result.experience_score,
-            'keyword_score': result.keyword_score,
-            'matched_skills': result.matched_skills,
-            'missing_skills': result.missing_skills,
-            'found_keywords': result.found_keywords,
-            'missing_keywords': result.missing_keywords,
-            'suggestions': result.suggestions,
-            'experience_analysis': result.experience_analysis,
-            'highlights': result.highlights,
-            'overall_summary': result.overall_summary
-        }
-        
-        print(json.dumps(result_dict, indent=2))
+        print(json.dumps(result_to_dict(result), indent=2))
     
     except Exception as e:
-        error_result = {
-            'error': str(e),
-            'overall_score': 0,
-            'skills_score': 0,
-            'experience_score': 0,
-            'keyword_score': 0,
-            'matched_skills': [],
-            'missing_skills': [],
-            'found_keywords': [],
-            'missing_keywords': [],
-            'suggestions': [],
-            'experience_analysis': [],
-            'highlights': [],
-            'overall_summary': 'Analysis failed due to an error.'
-        }
-        print(json.dumps(error_result, indent=2))
+        print(json.dumps(error_result(str(e)), indent=2))
         sys.exit(1)
 
 if __name__ == "__main__":
@@ -0,0 +1,176 @@
+"""
+Semantic Similarity Engine for the Resume Analyzer
+Chunked document embeddings with a content-hash cache and NumPy similarity matrices
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+_SEGMENT_SPLIT = re.compile(r'(?<=[.!?])\s+|\n+')
+
+
+@dataclass
+class SimilarityMatch:
+    """Similarity between two documents"""
+    score: float
+    best: float
+    passages: List[Dict[str, Any]] = field(default_factory=list)
+
+
+class SemanticSimilarityEngine:
+    """
+    Compares documents chunk by chunk instead of as one embedding.
+
+    Long resumes no longer lose everything past the model's token window:
+    each document is split into sentence-packed chunks, every chunk is
+    embedded (misses only, in one batched call) and the score is how well
+    the resume covers the job description - the mean, over job chunks, of
+    the best resume-chunk cosine. Two single-chunk texts score exactly their
+    plain cosine similarity.
+    """
+
+    def __init__(self, embeddings, max_words: int = 150, cache_size: int = 4096):
+        """
+        Initialize the engine
+
+        Args:
+            embeddings: Object with embed_documents(texts) -> list of vectors
+            max_words: Words per chunk (all-MiniLM-L6-v2 reads about 256 word pieces)
+            cache_size: Chunk embeddings kept in memory
+        """
+        self.embeddings = embeddings
+        self.max_words = max_words
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def chunk(self, text: str) -> List[str]:
+        """Split text into chunks of whole sentences/lines of at most max_words words"""
+        chunks: List[str] = []
+        current: List[str] = []
+        for segment in _SEGMENT_SPLIT.split(text or ""):
+            words = segment.split()
+            if current and len(current) + len(words) > self.max_words:
+                chunks.append(" ".join(current))
+                current = []
+            while len(words) > self.max_words:
+                chunks.append(" ".join(words[:self.max_words]))
+                words = words[self.max_words:]
+            current.extend(words)
+        if current:
+            chunks.append(" ".join(current))
+        return chunks
+
+    def _embed(self, chunks: List[str]) -> np.ndarray:
+        """Unit-normalised embeddings for chunks, computing only uncached ones"""
+        keys = [hashlib.sha1(chunk.encode('utf-8')).hexdigest() for chunk in chunks]
+        found: Dict[str, np.ndarray] = {}
+        pending: Dict[str, str] = {}
+        with self._lock:
+            for key, chunk in zip(keys, chunks):
+                vector = self._cache.get(key)
+                if vector is not None:
+                    self._cache.move_to_end(key)
+                    found[key] = vector
+                elif key not in pending:
+                    pending[key] = chunk
+        self.hits += len(keys) - len(pending)
+        self.misses += len(pending)
+
+        if pending:
+            vectors = np.asarray(self.embeddings.embed_documents(list(pending.values())), dtype=np.float32)
+            vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+            with self._lock:
+                for key, vector in zip(pending, vectors):
+                    found[key] = vector
+                    self._cache[key] = vector
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        if not keys:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.stack([found[key] for key in keys])
+
+    def _chunk_all(self, texts: List[str]) -> Tuple[List[List[str]], np.ndarray]:
+        """Chunk every text and embed all chunks together"""
+        chunked = [self.chunk(text) for text in texts]
+        vectors = self._embed([c for chunks in chunked for c in chunks])
+        return chunked, vectors
+
+    def compare(self, resume_text: str, job_text: str, top_passages: int = 3) -> SimilarityMatch:
+        """
+        Score a resume against a job description
+
+        Args:
+            resume_text: Resume text
+            job_text: Job description text
+            top_passages: Best-matching (job chunk, resume chunk) pairs to return
+
+        Returns:
+            SimilarityMatch with the coverage score, the best single chunk
+            similarity and the top passages
+        """
+        (resume_chunks, job_chunks), vectors = self._chunk_all([resume_text, job_text])
+        if not resume_chunks or not job_chunks:
+            return SimilarityMatch(score=0.0, best=0.0)
+
+        sims = vectors[:len(resume_chunks)] @ vectors[len(resume_chunks):].T
+        best_resume = sims.argmax(axis=0)
+        best_sims = sims[best_resume, np.arange(len(job_chunks))]
+
+        passages = [
+            {
+                'job_passage': job_chunks[j],
+                'resume_passage': resume_chunks[best_resume[j]],
+                'similarity': round(float(best_sims[j]), 3)
+            }
+            for j in np.argsort(-best_sims)[:top_passages]
+        ]
+        return SimilarityMatch(
+            score=float(best_sims.mean()),
+            best=float(best_sims.max()),
+            passages=passages
+        )
+
+    def matrix(self, resume_texts: List[str], job_texts: List[str]) -> np.ndarray:
+        """
+        Coverage score of every resume against every job
+
+        Returns:
+            Array of shape (len(resume_texts), len(job_texts)); 0 where a text is empty
+        """
+        chunked, vectors = self._chunk_all(list(resume_texts) + list(job_texts))
+        counts = np.array([len(chunks) for chunks in chunked])
+        resume_counts, job_counts = counts[:len(resume_texts)], counts[len(resume_texts):]
+        result = np.zeros((len(resume_texts), len(job_texts)), dtype=np.float32)
+        if not resume_counts.sum() or not job_counts.sum():
+            return result
+
+        n_resume_chunks = int(resume_counts.sum())
+        sims = vectors[:n_resume_chunks] @ vectors[n_resume_chunks:].T
+
+        # Best resume chunk per (resume, job chunk), then mean over each job's chunks
+        resume_rows = np.flatnonzero(resume_counts)
+        job_cols = np.flatnonzero(job_counts)
+        resume_starts = np.concatenate(([0], np.cumsum(resume_counts)[:-1]))[resume_rows]
+        job_starts = np.concatenate(([0], np.cumsum(job_counts)[:-1]))[job_cols]
+        best = np.maximum.reduceat(sims, resume_starts, axis=0)
+        coverage = np.add.reduceat(best, job_starts, axis=1) / job_counts[job_cols]
+        result[np.ix_(resume_rows, job_cols)] = coverage
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "cached_chunks": len(self._cache),
+            "cache_size": self.cache_size,
+            "hits": self.hits,
+            "misses": self.misses
+        }
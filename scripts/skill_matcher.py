@@ -0,0 +1,181 @@
+"""
+Skill Taxonomy Matcher for the Resume Analyzer
+Aho-Corasick matching of a skill taxonomy (aliases, categories, priorities) loaded once from JSON
+"""
+
+import json
+import os
+import threading
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+DEFAULT_TAXONOMY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'skill_taxonomy.json')
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == '_'
+
+
+class AhoCorasick:
+    """
+    Multi-pattern automaton: every pattern is found in one pass over the text,
+    so matching cost grows with the text rather than with the number of patterns.
+    """
+
+    def __init__(self, patterns: Dict[str, Any]):
+        """
+        Build the automaton
+
+        Args:
+            patterns: Mapping of pattern string to the value reported when it matches
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, Any]]] = [[]]
+
+        for pattern, value in patterns.items():
+            if not pattern:
+                continue
+            state = 0
+            for ch in pattern:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append((len(pattern), value))
+
+        # Breadth-first pass sets failure links and merges the outputs of suffix states
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                self._out[nxt].extend(self._out[self._fail[nxt]])
+
+    def __len__(self) -> int:
+        return len(self._goto)
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, Any]]:
+        """Yield (start, end, value) for every pattern occurrence, overlapping ones included"""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, value in out[state]:
+                yield i - length + 1, i + 1, value
+
+
+class SkillTaxonomy:
+    """
+    Canonical skills with their aliases, categories and gap priorities.
+
+    Aliases normalise skill names and are matched in free text. Loose aliases
+    (e.g. "ai", "api") only normalise explicit skill lists: they are too
+    ambiguous to count as a skill mention in resume text.
+    """
+
+    def __init__(self, skills: List[Dict[str, Any]], category_priority: Optional[Dict[str, str]] = None):
+        """
+        Initialize the taxonomy
+
+        Args:
+            skills: Entries with name, category, aliases and optional loose_aliases
+            category_priority: Mapping of category to 'critical' or 'important'
+        """
+        self.category_priority = category_priority or {}
+        self._canonical: Dict[str, str] = {}
+        self._category: Dict[str, str] = {}
+        text_patterns: Dict[str, str] = {}
+
+        for entry in skills:
+            name = entry['name'].lower().strip()
+            if entry.get('category'):
+                self._category.setdefault(name, entry['category'])
+            for alias in [name] + list(entry.get('aliases', [])):
+                alias = alias.lower().strip()
+                # First entry wins when two skills claim the same alias
+                self._canonical.setdefault(alias, name)
+                text_patterns.setdefault(alias, name)
+            for alias in entry.get('loose_aliases', []):
+                self._canonical.setdefault(alias.lower().strip(), name)
+
+        self._automaton = AhoCorasick(text_patterns)
+
+    @classmethod
+    def from_file(cls, path: str) -> 'SkillTaxonomy':
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return cls(data.get('skills', []), data.get('category_priority'))
+
+    def __len__(self) -> int:
+        return len(set(self._canonical.values()))
+
+    def normalize(self, skill: str) -> str:
+        """Map a skill name or alias to its canonical name (unknown skills are lowercased)"""
+        skill_lower = skill.lower().strip()
+        return self._canonical.get(skill_lower, skill_lower)
+
+    def category(self, skill: str) -> Optional[str]:
+        return self._category.get(self.normalize(skill))
+
+    def priority(self, skill: str) -> str:
+        """Return 'critical', 'important' or 'nice_to_have' for a missing skill"""
+        return self.category_priority.get(self.category(skill), 'nice_to_have')
+
+    def find_mentions(self, text: str) -> List[Tuple[int, int, str]]:
+        """
+        Find whole-word skill mentions in text
+
+        Overlapping matches resolve to the leftmost longest one, so "node.js"
+        is not also reported as "js" and "google cloud platform" not as "google cloud".
+
+        Returns:
+            (start, end, canonical name) for each mention, in text order
+        """
+        text_lower = text.lower()
+        size = len(text_lower)
+        candidates = []
+        for start, end, name in self._automaton.iter_matches(text_lower):
+            if start > 0 and _is_word_char(text_lower[start - 1]):
+                continue
+            if end < size and _is_word_char(text_lower[end]):
+                continue
+            candidates.append((start, end, name))
+        candidates.sort(key=lambda m: (m[0], -m[1]))
+
+        mentions = []
+        covered = 0
+        for start, end, name in candidates:
+            if start >= covered:
+                mentions.append((start, end, name))
+                covered = end
+        return mentions
+
+    def find_skills(self, text: str) -> List[str]:
+        """Return the canonical skills mentioned in text, in order of first mention"""
+        return list(dict.fromkeys(name for _, _, name in self.find_mentions(text)))
+
+
+_taxonomy: Optional[SkillTaxonomy] = None
+_taxonomy_lock = threading.Lock()
+
+
+def get_skill_taxonomy() -> SkillTaxonomy:
+    """
+    Return the process-wide taxonomy, loaded from SKILL_TAXONOMY_PATH or skill_taxonomy.json
+    """
+    global _taxonomy
+    with _taxonomy_lock:
+        if _taxonomy is None:
+            _taxonomy = SkillTaxonomy.from_file(os.getenv('SKILL_TAXONOMY_PATH', DEFAULT_TAXONOMY_PATH))
+        return _taxonomy
@@ -4,18 +4,72 @@ Analyzes resumes and ranks candidates for job positions using Google Gemini AI
 """
 
 import os
-import json
-import re
-import io
-from typing import List, Dict, Any
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 import google.generativeai as genai
 from datetime import datetime
 from dotenv import load_dotenv
+from rate_limiter import get_rate_limiter
+from text_cache import ExtractedTextCache
+from document_extraction import get_extraction_engine
+from prompt_budget import PromptBudget
+from json_stream_parser import missing_keys, parse_llm_json
+from single_flight import SingleFlight, flight_key
+from candidate_prefilter import PrefilterConfig, PrefilterResult, get_pre_ranker
+from job_profile import JobProfile, JobProfileCache, parse_experience_bounds
 
 # Load environment variables from .env.local
 load_dotenv('.env.local')
 
+# Keys _build_candidate_score reads from a parsed analysis
+ANALYSIS_SCORE_KEYS = ('overall_score', 'skill_match_score', 'experience_score', 'education_score')
+ANALYSIS_DETAIL_KEYS = ('criteria_analysis', 'strengths', 'weaknesses', 'recommendation', 'detailed_feedback')
+
+# Everything after the resume in the analysis prompt
+ANALYSIS_PROMPT_SUFFIX = """
+
+Please analyze this resume and provide scoring in the following JSON format only:
+
+{
+    "overall_score": <0-100>,
+    "skill_match_score": <0-100>,
+    "experience_score": <0-100>,
+    "education_score": <0-100>,
+    "criteria_analysis": {
+        "technical_skills": {
+            "score": <0-100>,
+            "found_skills": ["skill1", "skill2"],
+            "missing_skills": ["skill3", "skill4"],
+            "reasoning": "explanation"
+        },
+        "experience": {
+            "score": <0-100>,
+            "years_found": <number>,
+            "relevant_experience": ["exp1", "exp2"],
+            "reasoning": "explanation"
+        },
+        "education": {
+            "score": <0-100>,
+            "qualifications": ["qual1", "qual2"],
+            "reasoning": "explanation"
+        },
+        "soft_skills": {
+            "score": <0-100>,
+            "identified_skills": ["skill1", "skill2"],
+            "reasoning": "explanation"
+        }
+    },
+    "strengths": ["strength1", "strength2", "strength3"],
+    "weaknesses": ["weakness1", "weakness2"],
+    "recommendation": "HIGHLY_RECOMMENDED|RECOMMENDED|CONSIDER|NOT_RECOMMENDED",
+    "detailed_feedback": "Brief explanation of the overall assessment"
+}
+
+Focus on technical skill alignment, relevant work experience, educational background, soft skills, and career progression. Provide only the JSON response without any additional text."""
+
 @dataclass
 class CandidateScore:
     candidate_id: str
@@ -28,9 +82,10 @@ class CandidateScore:
     strengths: List[str]
     weaknesses: List[str]
     recommendation: str
+    prescreen_score: Optional[float] = None
 
 class AIResumeAnalyzer:
-    def __init__(self):
+    def __init__(self, max_concurrency: Optional[int] = None, requests_per_minute: Optional[float] = None):
         # Set up Gemini
         gemini_api_key = os.getenv('GEMINI_API_KEY')
         if not gemini_api_key:
@@ -38,31 +93,124 @@ class AIResumeAnalyzer:
         
         genai.configure(api_key=gemini_api_key)
         self.model = genai.GenerativeModel('gemini-1.5-flash')
+        
+        # Concurrent scoring: resume parsing and pre-ranking run on one bounded pool and
+        # Gemini calls on another, paced by a limiter shared with every other Gemini caller
+        # in the process. A timed-out Gemini call keeps its thread until the SDK returns,
+        # so it must not hold up resume parsing.
+        self.max_concurrency = max_concurrency or int(os.getenv('SHORTLIST_CONCURRENCY', '8'))
+        self.request_timeout = float(os.getenv('GEMINI_REQUEST_TIMEOUT', '60'))
+        self.rate_limiter = get_rate_limiter(
+            'gemini',
+            requests_per_minute or float(os.getenv('GEMINI_REQUESTS_PER_MINUTE', '60'))
+        )
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency,
+            thread_name_prefix='shortlist'
+        )
+        self._llm_executor = ThreadPoolExecutor(
+            max_workers=self.max_concurrency,
+            thread_name_prefix='gemini'
+        )
+        
+        # Parsed resume text survives restarts and is re-parsed only when the file changes
+        self.text_cache = ExtractedTextCache(os.getenv('RESUME_TEXT_CACHE_PATH'))
+        
+        # Resume/JD text is trimmed to a token budget before it goes into the prompt
+        self.prompt_budget = PromptBudget()
+        
+        # Identical prompts already in flight (duplicate UI requests) share one Gemini call
+        self.flights = SingleFlight('gemini-analysis')
+        
+        # Stage 1 of shortlisting: local scoring picks which candidates reach Gemini
+        self.pre_ranker = get_pre_ranker()
+        
+        # Requirements, trimmed JD and prompt prefix are compiled once per job version
+        self.job_profiles = JobProfileCache(int(os.getenv('JOB_PROFILE_CACHE_SIZE', '256')))
     
     def analyze_resume_for_job(self, resume_text: str, job_description: str, job_requirements: Dict) -> Dict[str, Any]:
         """
         Analyze a single resume against job requirements using Gemini AI
         """
         try:
-            prompt = self._create_analysis_prompt(resume_text, job_description, job_requirements)
+            profile = self.compile_job_profile(None, job_description, job_requirements)
+            prompt = self._create_analysis_prompt(resume_text, profile)
             
-            response = self.model.generate_content(prompt)
-            
-            analysis_text = response.text
+            analysis_text = self.flights.do_sync(flight_key(prompt), lambda: self._generate(prompt))
             return self._parse_ai_response(analysis_text)
             
         except Exception as e:
             print(f"Error analyzing resume: {e}")
             return self._create_fallback_analysis()
     
-    def _create_analysis_prompt(self, resume_text: str, job_description: str, job_requirements: Dict) -> str:
+    async def analyze_resume_for_job_async(self, resume_text: str, job_description: str, job_requirements: Dict) -> Dict[str, Any]:
         """
-        Create a detailed prompt for Gemini AI analysis
+        Non-blocking variant of analyze_resume_for_job, paced by the Gemini rate limiter
+        """
+        profile = self.compile_job_profile(None, job_description, job_requirements)
+        return await self._analyze_with_profile_async(resume_text, profile)
+    
+    async def _analyze_with_profile_async(self, resume_text: str, profile: JobProfile) -> Dict[str, Any]:
+        """
+        Score one resume against a compiled job profile
+        """
+        try:
+            prompt = self._create_analysis_prompt(resume_text, profile)
+            
+            analysis_text = await self.flights.do(flight_key(prompt), lambda: self._generate_async(prompt))
+            return self._parse_ai_response(analysis_text)
+            
+        except Exception as e:
+            print(f"Error analyzing resume: {e!r}")
+            return self._create_fallback_analysis()
+    
+    def _generate(self, prompt: str) -> str:
+        """Send a prompt to Gemini (paced by the shared rate limiter) and return the response text"""
+        self.rate_limiter.acquire_sync()
+        return self.model.generate_content(prompt).text
+    
+    async def _generate_async(self, prompt: str) -> str:
+        """Non-blocking variant of _generate, bounded by the request timeout"""
+        await self.rate_limiter.acquire()
+        loop = asyncio.get_running_loop()
+        response = await asyncio.wait_for(
+            loop.run_in_executor(self._llm_executor, self.model.generate_content, prompt),
+            timeout=self.request_timeout
+        )
+        return response.text
+    
+    def get_job_profile(self, job_data: Dict) -> JobProfile:
+        """
+        Compiled profile for a job, reused across candidates and shortlisting runs until the job changes
+        """
+        return self.compile_job_profile(
+            job_data.get('id') or job_data.get('_id'),
+            job_data.get('description', ''),
+            self._build_job_requirements(job_data)
+        )
+    
+    def compile_job_profile(self, job_id: Optional[str], job_description: str, job_requirements: Dict) -> JobProfile:
         """
-        return f"""You are an expert HR recruiter and resume analyst. Analyze the following resume against the job requirements and provide detailed scoring.
+        Look up (or build) the profile for a job description and its prepared requirements
+        """
+        return self.job_profiles.get(
+            str(job_id) if job_id else None, job_description, job_requirements, self._build_job_profile
+        )
+    
+    def _build_job_profile(self, job_id: Optional[str], content_hash: str, job_description: str,
+                           job_requirements: Dict) -> JobProfile:
+        """
+        Compile the candidate-independent parts of the analysis: trimmed JD, prompt prefix, skills and experience bounds
+        """
+        required_skills = job_requirements.get('required_skills') or []
+        job_context = [job_requirements.get('title'), ' '.join(required_skills)]
+        job_text = self.prompt_budget.fit_job(job_description, job_context)
+        min_years, max_years = parse_experience_bounds(job_requirements.get('experience_years'), job_description)
+        
+        prompt_prefix = f"""You are an expert HR recruiter and resume analyst. Analyze the following resume against the job requirements and provide detailed scoring.
 
 JOB DESCRIPTION:
-{job_description}
+{job_text.text}
 
 JOB REQUIREMENTS:
 - Title: {job_requirements.get('title', 'Not specified')}
@@ -73,66 +221,52 @@ JOB REQUIREMENTS:
 - Education: {job_requirements.get('education', 'Not specified')}
 
 CANDIDATE RESUME:
-{resume_text}
-
-Please analyze this resume and provide scoring in the following JSON format only:
-
-{{
-    "overall_score": <0-100>,
-    "skill_match_score": <0-100>,
-    "experience_score": <0-100>,
-    "education_score": <0-100>,
-    "criteria_analysis": {{
-        "technical_skills": {{
-            "score": <0-100>,
-            "found_skills": ["skill1", "skill2"],
-            "missing_skills": ["skill3", "skill4"],
-            "reasoning": "explanation"
-        }},
-        "experience": {{
-            "score": <0-100>,
-            "years_found": <number>,
-            "relevant_experience": ["exp1", "exp2"],
-            "reasoning": "explanation"
-        }},
-        "education": {{
-            "score": <0-100>,
-            "qualifications": ["qual1", "qual2"],
-            "reasoning": "explanation"
-        }},
-        "soft_skills": {{
-            "score": <0-100>,
-            "identified_skills": ["skill1", "skill2"],
-            "reasoning": "explanation"
-        }}
-    }},
-    "strengths": ["strength1", "strength2", "strength3"],
-    "weaknesses": ["weakness1", "weakness2"],
-    "recommendation": "HIGHLY_RECOMMENDED|RECOMMENDED|CONSIDER|NOT_RECOMMENDED",
-    "detailed_feedback": "Brief explanation of the overall assessment"
-}}
-
-Focus on technical skill alignment, relevant work experience, educational background, soft skills, and career progression. Provide only the JSON response without any additional text."""
+"""
+        
+        return JobProfile(
+            job_id=job_id,
+            content_hash=content_hash,
+            description=job_description,
+            requirements=job_requirements,
+            skills=frozenset(skill.lower().strip() for skill in required_skills),
+            min_years=min_years,
+            max_years=max_years,
+            prompt_prefix=prompt_prefix,
+            resume_query=f"{job_description} {' '.join(str(item) for item in job_context if item)}",
+            job_text=job_text
+        )
+    
+    def _create_analysis_prompt(self, resume_text: str, profile: JobProfile) -> str:
+        """
+        Create a detailed prompt for Gemini AI analysis
+        """
+        resume = self.prompt_budget.fit_resume(resume_text, profile.resume_query, profile.job_text)
+        tokens_saved = resume.tokens_saved + profile.job_text.tokens_saved
+        if tokens_saved > 0:
+            print(f"Prompt budget: saved {tokens_saved} tokens "
+                  f"(resume {resume.original_tokens} -> {resume.tokens}, "
+                  f"JD {profile.job_text.original_tokens} -> {profile.job_text.tokens})")
+        
+        return profile.prompt_prefix + resume.text + ANALYSIS_PROMPT_SUFFIX
     
     def _parse_ai_response(self, response_text: str) -> Dict[str, Any]:
         """
         Parse Gemini AI response and extract structured data
         """
         try:
-            # Clean the response - remove markdown formatting if present
-            cleaned_text = response_text.strip()
-            if cleaned_text.startswith('```json'):
-                cleaned_text = cleaned_text[7:]
-            if cleaned_text.endswith('```'):
-                cleaned_text = cleaned_text[:-3]
-            
-            # Try to extract JSON from the response
-            json_match = re.search(r'\{.*\}', cleaned_text, re.DOTALL)
-            if json_match:
-                json_str = json_match.group()
-                return json.loads(json_str)
-            else:
+            # Markdown fences, surrounding prose and truncated output are handled by the parser
+            analysis = parse_llm_json(response_text)
+            missing = missing_keys(analysis, ANALYSIS_SCORE_KEYS)
+            if missing:
+                # A partial set of scores is not comparable with other candidates
+                print(f"Gemini response is missing {', '.join(missing)} - using fallback analysis")
                 return self._create_fallback_analysis()
+            
+            # Output cut off after the scores keeps them; later sections come from the fallback
+            fallback = self._create_fallback_analysis()
+            for key in missing_keys(analysis, ANALYSIS_DETAIL_KEYS):
+                analysis[key] = fallback[key]
+            return analysis
         except Exception as e:
             print(f"Error parsing Gemini response: {e}")
             return self._create_fallback_analysis()
@@ -176,61 +310,206 @@ Focus on technical skill alignment, relevant work experience, educational backgr
             "detailed_feedback": "Analysis unavailable - manual review recommended"
         }
 
-    def shortlist_candidates(self, job_data: Dict, candidates: List[Dict]) -> List[CandidateScore]:
+    def shortlist_candidates(self, job_data: Dict, candidates: List[Dict],
+                             prefilter: Optional[PrefilterConfig] = None) -> List[CandidateScore]:
         """
         Analyze all candidates for a job and return ranked shortlist
         """
-        scored_candidates = []
+        return asyncio.run(self.shortlist_candidates_async(job_data, candidates, prefilter=prefilter))
+    
+    async def shortlist_candidates_async(self, job_data: Dict, candidates: List[Dict],
+                                         deadline: Optional[float] = None,
+                                         prefilter: Optional[PrefilterConfig] = None) -> List[CandidateScore]:
+        """
+        Score candidates concurrently and return the ranked shortlist
         
-        for candidate in candidates:
-            try:
-                # Get resume text
-                resume_text = self._extract_resume_text(candidate)
-                
-                # Prepare job requirements
-                job_requirements = {
-                    'title': job_data.get('title', ''),
-                    'department': job_data.get('department', ''),
-                    'level': job_data.get('level', ''),
-                    'required_skills': self._extract_required_skills(job_data),
-                    'experience_years': self._extract_experience_requirement(job_data),
-                    'education': job_data.get('education_requirement', '')
-                }
-                
-                # Analyze resume
-                analysis = self.analyze_resume_for_job(
-                    resume_text, 
-                    job_data.get('description', ''), 
-                    job_requirements
-                )
-                
-                # Create candidate score object
-                candidate_score = CandidateScore(
-                    candidate_id=str(candidate['_id']),
-                    candidate_name=candidate.get('applicantName', 'Unknown'),
-                    overall_score=analysis['overall_score'],
-                    skill_match_score=analysis['skill_match_score'],
-                    experience_score=analysis['experience_score'],
-                    education_score=analysis['education_score'],
-                    criteria_analysis=analysis['criteria_analysis'],
-                    strengths=analysis['strengths'],
-                    weaknesses=analysis['weaknesses'],
-                    recommendation=analysis['detailed_feedback']                )
-                
-                scored_candidates.append(candidate_score)
-                
-            except Exception as e:
-                print(f"Error processing candidate {candidate.get('_id', 'unknown')}: {e}")
+        Candidates are first ranked locally (see prefilter_candidates) and only
+        the selected ones are scored with Gemini. At most max_concurrency
+        candidates are scored at once. A candidate that fails is skipped; if
+        deadline (seconds) passes, scoring stops and the candidates finished
+        so far are returned. The deadline covers stage 1 as well: scoring only
+        gets the time pre-ranking leaves, and nothing is returned if
+        pre-ranking itself runs past it.
+        
+        Args:
+            deadline: Seconds for the whole shortlist, measured from the call
+            prefilter: Stage 1 settings (defaults to PrefilterConfig.from_job(job_data))
+        """
+        started = time.perf_counter()
+        
+        try:
+            candidates, resume_texts, result = await asyncio.wait_for(
+                self.prefilter_candidates(job_data, candidates, prefilter), timeout=deadline
+            )
+        except asyncio.TimeoutError:
+            print(f"⏱️ Shortlist deadline reached while pre-ranking {len(candidates)} candidates")
+            return []
+        
+        tasks = self._start_scoring(job_data, candidates, resume_texts, result)
+        if not tasks:
+            return []
+        
+        remaining = None if deadline is None else max(0.0, deadline - (time.perf_counter() - started))
+        done, pending = await asyncio.wait(tasks, timeout=remaining)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+            print(f"⏱️ Shortlist deadline reached: {len(pending)} of {len(tasks)} candidates not scored")
+        
+        scored_candidates = []
+        for candidate, task in zip(candidates, tasks):
+            if task not in done:
+                continue
+            if task.exception() is not None:
+                print(f"Error processing candidate {candidate.get('_id', 'unknown')}: {task.exception()}")
                 continue
+            scored_candidates.append(task.result())
         
         # Sort by overall score (highest first)
         scored_candidates.sort(key=lambda x: x.overall_score, reverse=True)
         
+        print(f"✅ Scored {len(scored_candidates)}/{len(candidates)} candidates in {time.perf_counter() - started:.1f}s")
         return scored_candidates
     
-    def _extract_resume_text(self, candidate: Dict) -> str:
+    async def iter_candidate_scores(self, job_data: Dict, candidates: List[Dict],
+                                    resume_texts: Optional[List[str]] = None,
+                                    prefilter_result: Optional[PrefilterResult] = None):
+        """
+        Score candidates concurrently, yielding (candidate, score, error) as each one finishes
+        
+        Closing the generator early cancels the candidates still being scored.
+        Pass the output of prefilter_candidates to score only the selected candidates.
+        """
+        tasks = self._start_scoring(job_data, candidates, resume_texts, prefilter_result)
+        task_candidates = dict(zip(tasks, candidates))
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    candidate = task_candidates[task]
+                    if task.exception() is not None:
+                        yield candidate, None, task.exception()
+                    else:
+                        yield candidate, task.result(), None
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+    
+    async def prefilter_candidates(self, job_data: Dict, candidates: List[Dict],
+                                   config: Optional[PrefilterConfig] = None):
+        """
+        Stage 1 of shortlisting: rank every candidate locally and keep the ones worth a Gemini call
+        
+        Resume texts are extracted here once and reused for stage 2.
+        
+        Args:
+            job_data: Job being shortlisted for
+            candidates: All applicants
+            config: top_k/min_score settings (defaults to PrefilterConfig.from_job(job_data))
+            
+        Returns:
+            (selected candidates best first, their resume texts, PrefilterResult
+            whose selected/scores refer to positions in the returned list)
+        """
+        config = config or PrefilterConfig.from_job(job_data)
+        
+        # Load cached resume texts with one query and parse the rest in parallel up front
+        loop = asyncio.get_running_loop()
+        resume_texts = await loop.run_in_executor(self._executor, self._load_resume_texts, candidates)
+        
+        result = await loop.run_in_executor(
+            self._executor, self.pre_ranker.select, job_data, candidates, resume_texts, config,
+            self.get_job_profile(job_data)
+        )
+        if result.ranked:
+            print(f"🔎 Pre-ranked {len(candidates)} candidates in {result.elapsed * 1000:.0f}ms: "
+                  f"{len(result.selected)} sent to Gemini (top_k={config.top_k}, min_score={config.min_score})")
+        
+        selected = result.selected
+        return (
+            [candidates[i] for i in selected],
+            [resume_texts[i] for i in selected],
+            PrefilterResult(
+                selected=list(range(len(selected))),
+                scores={pos: result.scores[i] for pos, i in enumerate(selected) if i in result.scores},
+                elapsed=result.elapsed,
+                ranked=result.ranked
+            )
+        )
+    
+    def _start_scoring(self, job_data: Dict, candidates: List[Dict], resume_texts: Optional[List[str]] = None,
+                       prefilter_result: Optional[PrefilterResult] = None) -> List[asyncio.Task]:
+        """
+        Create one scoring task per candidate, sharing the compiled job profile and a concurrency limit
+        """
+        profile = self.get_job_profile(job_data)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        scores = prefilter_result.scores if prefilter_result else {}
+        
+        return [
+            asyncio.create_task(self._score_candidate(
+                candidate, profile, semaphore,
+                resume_text=resume_texts[i] if resume_texts is not None else None,
+                prescreen_score=scores[i]['overall_score'] if i in scores else None
+            ))
+            for i, candidate in enumerate(candidates)
+        ]
+    
+    async def _score_candidate(self, candidate: Dict, profile: JobProfile, semaphore: asyncio.Semaphore,
+                               resume_text: Optional[str] = None, prescreen_score: Optional[float] = None) -> CandidateScore:
+        """
+        Parse one candidate's resume (unless already extracted) and score it with Gemini
+        """
+        async with semaphore:
+            if resume_text is None:
+                loop = asyncio.get_running_loop()
+                resume_text = await loop.run_in_executor(self._executor, self._extract_resume_text, candidate)
+            
+            analysis = await self._analyze_with_profile_async(resume_text, profile)
+            
+            score = self._build_candidate_score(candidate, analysis)
+            score.prescreen_score = prescreen_score
+            return score
+    
+    def _build_job_requirements(self, job_data: Dict) -> Dict[str, Any]:
+        """
+        Prepare job requirements once per job
+        """
+        return {
+            'title': job_data.get('title', ''),
+            'department': job_data.get('department', ''),
+            'level': job_data.get('level', ''),
+            'required_skills': self._extract_required_skills(job_data),
+            'experience_years': self._extract_experience_requirement(job_data),
+            'education': job_data.get('education_requirement', '')
+        }
+    
+    def _build_candidate_score(self, candidate: Dict, analysis: Dict[str, Any]) -> CandidateScore:
+        """
+        Create candidate score object from an analysis
+        """
+        return CandidateScore(
+            candidate_id=str(candidate['_id']),
+            candidate_name=candidate.get('applicantName', 'Unknown'),
+            overall_score=analysis['overall_score'],
+            skill_match_score=analysis['skill_match_score'],
+            experience_score=analysis['experience_score'],
+            education_score=analysis['education_score'],
+            criteria_analysis=analysis['criteria_analysis'],
+            strengths=analysis['strengths'],
+            weaknesses=analysis['weaknesses'],
+            recommendation=analysis['detailed_feedback']
+        )
+    
+    def _extract_resume_text(self, candidate: Dict, file_texts: Optional[Dict[str, str]] = None) -> str:
         """
         Extract text from candidate's resume - now with actual file parsing
+        
+        Args:
+            file_texts: Output of prefetch_resume_texts; when given, the file is not looked up again
         """
         resume_parts = []
         
@@ -243,11 +522,10 @@ Focus on technical skill alignment, relevant work experience, educational backgr
         
         # Try to extract text from actual resume file
         resume_file_text = ""
-        if candidate.get('resumePath'):
-            resume_file_text = self._extract_text_from_file(candidate['resumePath'])
-        elif candidate.get('resume_filename'):
-            # Try to construct path from filename
-            resume_path = f"/uploads/application-resumes/{candidate['resume_filename']}"
+        resume_path = self._resume_file_path(candidate)
+        if resume_path and file_texts is not None:
+            resume_file_text = file_texts.get(os.path.abspath(self._full_resume_path(resume_path)), "")
+        elif resume_path:
             resume_file_text = self._extract_text_from_file(resume_path)
         
         if resume_file_text:
@@ -281,17 +559,56 @@ Focus on technical skill alignment, relevant work experience, educational backgr
         
         return final_text
     
+    def _resume_file_path(self, candidate: Dict) -> Optional[str]:
+        """
+        Public path of a candidate's resume file, if any
+        """
+        if candidate.get('resumePath'):
+            return candidate['resumePath']
+        if candidate.get('resume_filename'):
+            # Try to construct path from filename
+            return f"/uploads/application-resumes/{candidate['resume_filename']}"
+        return None
+    
+    def _full_resume_path(self, file_path: str) -> str:
+        """
+        Convert a public path such as /uploads/x.pdf to a filesystem path
+        """
+        # Convert relative path to absolute path
+        if file_path.startswith('/'):
+            file_path = file_path[1:]  # Remove leading slash
+        
+        # Construct full path
+        return os.path.join(os.getcwd(), 'public', file_path.replace('/', os.sep))
+    
+    def _load_resume_texts(self, candidates: List[Dict]) -> List[str]:
+        """
+        Resume text for every candidate, from one prefetch batch (blocking; run in the executor)
+        """
+        file_texts = self.prefetch_resume_texts(candidates)
+        return [self._extract_resume_text(candidate, file_texts) for candidate in candidates]
+    
+    def prefetch_resume_texts(self, candidates: List[Dict]) -> Optional[Dict[str, str]]:
+        """
+        Load the resume texts of a whole applicant list in one batch
+        
+        Returns:
+            Text per absolute file path (missing or unreadable files are absent),
+            or None if the batch failed and files must be read one by one
+        """
+        paths = [self._full_resume_path(p) for p in map(self._resume_file_path, candidates) if p]
+        try:
+            return self.text_cache.prefetch(paths, self._parse_resume_file, max_workers=self.max_concurrency)
+        except Exception as e:
+            print(f"⚠️ Resume text prefetch failed: {e}")
+            return None
+    
     def _extract_text_from_file(self, file_path: str) -> str:
         """
         Extract text from resume file (PDF, DOCX, etc.)
         """
         try:
-            # Convert relative path to absolute path
-            if file_path.startswith('/'):
-                file_path = file_path[1:]  # Remove leading slash
-            
-            # Construct full path
-            full_path = os.path.join(os.getcwd(), 'public', file_path.replace('/', os.sep))
+            full_path = self._full_resume_path(file_path)
             
             print(f"🔍 Trying to read resume file: {full_path}")
             
@@ -299,6 +616,17 @@ Focus on technical skill alignment, relevant work experience, educational backgr
                 print(f"❌ Resume file not found: {full_path}")
                 return ""
             
+            return self.text_cache.get_or_extract(full_path, self._parse_resume_file)
+                
+        except Exception as e:
+            print(f"❌ Error extracting text from file {file_path}: {str(e)}")
+            return ""
+    
+    def _parse_resume_file(self, full_path: str) -> str:
+        """
+        Parse a resume file without the cache
+        """
+        try:
             # Determine file type and extract text
             file_extension = os.path.splitext(full_path)[1].lower()
             
@@ -314,7 +642,7 @@ Focus on technical skill alignment, relevant work experience, educational backgr
                 return ""
                 
         except Exception as e:
-            print(f"❌ Error extracting text from file {file_path}: {str(e)}")
+            print(f"❌ Error extracting text from file {full_path}: {str(e)}")
             return ""
     
     def _extract_required_skills(self, job_data: Dict) -> List[str]:
@@ -362,64 +690,35 @@ Focus on technical skill alignment, relevant work experience, educational backgr
 
 # Document processing utilities
 class DocumentProcessor:
-    """Utility class for processing different document types"""
+    """Utility class for processing different document types (parsing runs in the shared extraction pool)"""
+    
+    @staticmethod
+    def _extract(source, file_type: str, label: str) -> str:
+        result = get_extraction_engine().extract(source, file_type)
+        if not result.ok:
+            print(f"Error reading {file_type.upper()} {label}: {result.error}")
+            return ""
+        return result.text("\n").strip()
     
     @staticmethod
     def extract_text_from_pdf(file_path: str) -> str:
         """Extract text from PDF file"""
-        try:
-            import PyPDF2
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-                return text.strip()
-        except Exception as e:
-            print(f"Error reading PDF {file_path}: {str(e)}")
-            return ""
+        return DocumentProcessor._extract(file_path, 'pdf', file_path)
     
     @staticmethod
     def extract_text_from_pdf_bytes(pdf_bytes: bytes) -> str:
         """Extract text from PDF bytes"""
-        try:
-            import PyPDF2
-            pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_bytes))
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            return text.strip()
-        except Exception as e:
-            print(f"Error reading PDF bytes: {str(e)}")
-            return ""
+        return DocumentProcessor._extract(pdf_bytes, 'pdf', 'bytes')
     
     @staticmethod
     def extract_text_from_docx(file_path: str) -> str:
         """Extract text from DOCX file"""
-        try:
-            from docx import Document
-            doc = Document(file_path)
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text.strip()
-        except Exception as e:
-            print(f"Error reading DOCX {file_path}: {str(e)}")
-            return ""
+        return DocumentProcessor._extract(file_path, 'docx', file_path)
     
     @staticmethod
     def extract_text_from_docx_bytes(docx_bytes: bytes) -> str:
         """Extract text from DOCX bytes"""
-        try:
-            from docx import Document
-            doc = Document(io.BytesIO(docx_bytes))
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text.strip()
-        except Exception as e:
-            print(f"Error reading DOCX bytes: {str(e)}")
-            return ""
+        return DocumentProcessor._extract(docx_bytes, 'docx', 'bytes')
 
 # Example usage and testing
 if __name__ == "__main__":
@@ -3,13 +3,16 @@ AI Resume Analysis Service API
 FastAPI service for analyzing resumes and ranking candidates
 """
 
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 from typing import List, Dict, Any, Optional
 import os
 from datetime import datetime
+from dataclasses import asdict
 import json
 import logging
+import time
 from dotenv import load_dotenv
 
 # Load environment variables from .env.local
@@ -22,6 +25,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 # Import our AI analyzer
 from ai_resume_analyzer import AIResumeAnalyzer
+from candidate_prefilter import PrefilterConfig
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -37,6 +41,19 @@ except Exception as e:
     logger.error(f"[ERROR] Failed to initialize AI analyzer: {e}")
     ai_analyzer = None
 
+# Seconds before /analyze-candidates returns the candidates scored so far (unset = wait for all)
+SHORTLIST_DEADLINE = float(os.getenv("SHORTLIST_DEADLINE")) if os.getenv("SHORTLIST_DEADLINE") else None
+
+# Criteria reported with every shortlist
+ANALYSIS_CRITERIA = [
+    "Technical Skills Match",
+    "Relevant Experience",
+    "Educational Background",
+    "Soft Skills Assessment",
+    "Career Progression",
+    "Job Level Alignment"
+]
+
 # Pydantic models for request/response
 class JobData(BaseModel):
     id: str
@@ -46,9 +63,11 @@ class JobData(BaseModel):
     description: str
     jobDescriptionText: str
     requirements: List[str] = []
+    prefilterTopK: Optional[int] = None  # candidates sent to the LLM after local pre-ranking (0 = no cap)
+    prefilterMinScore: Optional[float] = None  # local score a candidate needs to reach the LLM
 
 class CandidateData(BaseModel):
-    _id: str
+    id: str = Field(alias="_id")  # a bare _id field would be treated as private and dropped
     applicantId: str
     applicantName: str
     applicantEmail: str
@@ -64,6 +83,11 @@ class AnalysisRequest(BaseModel):
     job: JobData
     candidates: List[CandidateData]
 
+class StreamAnalysisRequest(AnalysisRequest):
+    top_k: int = 10
+    stop_after: Optional[int] = None  # stop once this many candidates reach min_score
+    min_score: float = 80.0
+
 class CandidateScore(BaseModel):
     candidate_id: str
     candidate_name: str
@@ -75,6 +99,7 @@ class CandidateScore(BaseModel):
     strengths: List[str]
     weaknesses: List[str]
     recommendation: str
+    prescreen_score: Optional[float] = None
 
 class AnalysisResponse(BaseModel):
     success: bool
@@ -82,6 +107,12 @@ class AnalysisResponse(BaseModel):
     criteria: List[str]
     analysis_metadata: Dict[str, Any]
 
+@app.on_event("shutdown")
+def flush_text_cache():
+    """Write access times the resume text cache is still holding in memory"""
+    if ai_analyzer:
+        ai_analyzer.text_cache.flush()
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
@@ -89,7 +120,9 @@ async def health_check():
         "status": "healthy",
         "service": "AI Resume Analysis Service",
         "version": "1.0.0",
-        "ai_analyzer_status": "available" if ai_analyzer else "unavailable"
+        "ai_analyzer_status": "available" if ai_analyzer else "unavailable",
+        "single_flight": ai_analyzer.flights.stats() if ai_analyzer else None,
+        "job_profiles": ai_analyzer.job_profiles.stats() if ai_analyzer else None
     }
 
 @app.post("/analyze-candidates", response_model=AnalysisResponse)
@@ -106,10 +139,14 @@ async def analyze_candidates(request: AnalysisRequest):
         
         # Convert request data to dict format for analyzer
         job_data = request.job.dict()
-        candidates_data = [candidate.dict() for candidate in request.candidates]
+        candidates_data = [candidate.dict(by_alias=True) for candidate in request.candidates]
         
-        # Perform AI analysis
-        shortlisted_candidates = ai_analyzer.shortlist_candidates(job_data, candidates_data)
+        # Perform AI analysis (candidates are scored concurrently; stragglers past the deadline are dropped)
+        shortlisted_candidates = await ai_analyzer.shortlist_candidates_async(
+            job_data,
+            candidates_data,
+            deadline=SHORTLIST_DEADLINE
+        )
         
         # Convert results to response format
         shortlist = []
@@ -124,27 +161,20 @@ async def analyze_candidates(request: AnalysisRequest):
                 "criteria_analysis": candidate.criteria_analysis,
                 "strengths": candidate.strengths,
                 "weaknesses": candidate.weaknesses,
-                "recommendation": candidate.recommendation
+                "recommendation": candidate.recommendation,
+                "prescreen_score": candidate.prescreen_score
             })
         
-        # Define analysis criteria
-        criteria = [
-            "Technical Skills Match",
-            "Relevant Experience",
-            "Educational Background",
-            "Soft Skills Assessment",
-            "Career Progression",
-            "Job Level Alignment"
-        ]
-        
         # Analysis metadata
         analysis_metadata = {
             "total_candidates": len(request.candidates),
+            "scored_candidates": len(shortlist),
             "analysis_date": datetime.now().isoformat(),
             "job_title": request.job.title,
             "job_level": request.job.level,
             "ai_model": "gpt-3.5-turbo",
-            "analysis_version": "1.0"
+            "analysis_version": "1.0",
+            "prefilter": PrefilterConfig.from_job(job_data).to_dict()
         }
         
         logger.info(f"[OK] AI analysis completed successfully")
@@ -153,7 +183,7 @@ async def analyze_candidates(request: AnalysisRequest):
         return AnalysisResponse(
             success=True,
             shortlist=shortlist,
-            criteria=criteria,
+            criteria=ANALYSIS_CRITERIA,
             analysis_metadata=analysis_metadata
         )
         
@@ -161,6 +191,137 @@ async def analyze_candidates(request: AnalysisRequest):
         logger.error(f"[ERROR] Error during AI analysis: {e}")
         raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
 
+@app.post("/analyze-candidates/stream")
+async def analyze_candidates_stream(request: StreamAnalysisRequest, http_request: Request):
+    """
+    Analyze candidates and stream results as newline-delimited JSON
+    
+    Emits a "start" frame straight away, a "prefilter" frame once local
+    pre-ranking has picked the candidates to score, one "candidate" (or
+    "error") frame per candidate as soon as it is scored, each with progress
+    counters and the current top_k leaderboard, and a final "summary" frame
+    with the ranked shortlist. If pre-ranking fails, a fatal "error" frame
+    ends the stream.
+    Scoring stops when the client disconnects, or once stop_after candidates
+    have reached min_score.
+    """
+    if not ai_analyzer:
+        raise HTTPException(status_code=503, detail="AI analyzer not available")
+    
+    job_data = request.job.dict()
+    candidates_data = [candidate.dict(by_alias=True) for candidate in request.candidates]
+    
+    def frame(payload: Dict[str, Any]) -> str:
+        return json.dumps(payload, default=str) + "\n"
+    
+    async def event_generator():
+        started = time.perf_counter()
+        scored = []
+        failed = 0
+        strong = 0
+        stopped_early = False
+        
+        yield frame({
+            "type": "start",
+            "candidates": len(candidates_data),
+            "job_title": request.job.title
+        })
+        
+        # Stage 1: only candidates that survive local pre-ranking are scored by the LLM
+        try:
+            selected, resume_texts, prefilter = await ai_analyzer.prefilter_candidates(job_data, candidates_data)
+        except Exception as e:
+            logger.error(f"[ERROR] Pre-ranking failed: {e}")
+            yield frame({
+                "type": "error",
+                "stage": "prefilter",
+                "fatal": True,
+                "error": str(e),
+                "elapsed": round(time.perf_counter() - started, 2)
+            })
+            return
+        total = len(selected)
+        
+        yield frame({
+            "type": "prefilter",
+            "total": total,
+            "prefilter": prefilter.report(len(candidates_data)),
+            "elapsed": round(time.perf_counter() - started, 2)
+        })
+        
+        scores = ai_analyzer.iter_candidate_scores(job_data, selected, resume_texts, prefilter)
+        try:
+            async for candidate, score, error in scores:
+                if error is not None:
+                    failed += 1
+                    logger.error(f"[ERROR] Candidate {candidate.get('_id', 'unknown')} failed: {error}")
+                else:
+                    scored.append(score)
+                    scored.sort(key=lambda x: x.overall_score, reverse=True)
+                    if score.overall_score >= request.min_score:
+                        strong += 1
+                
+                progress = {
+                    "completed": len(scored) + failed,
+                    "scored": len(scored),
+                    "failed": failed,
+                    "total": total,
+                    "elapsed": round(time.perf_counter() - started, 2)
+                }
+                leaderboard = [
+                    {
+                        "candidate_id": c.candidate_id,
+                        "candidate_name": c.candidate_name,
+                        "overall_score": c.overall_score
+                    }
+                    for c in scored[:request.top_k]
+                ]
+                
+                if error is not None:
+                    yield frame({
+                        "type": "error",
+                        "candidate_id": str(candidate.get('_id', candidate.get('applicantId', 'unknown'))),
+                        "error": str(error),
+                        "progress": progress,
+                        "leaderboard": leaderboard
+                    })
+                else:
+                    yield frame({
+                        "type": "candidate",
+                        "candidate": asdict(score),
+                        "progress": progress,
+                        "leaderboard": leaderboard
+                    })
+                
+                if request.stop_after and strong >= request.stop_after:
+                    stopped_early = True
+                    break
+                if await http_request.is_disconnected():
+                    logger.info("[STOP] Client disconnected, cancelling remaining candidates")
+                    return
+        finally:
+            await scores.aclose()
+        
+        yield frame({
+            "type": "summary",
+            "success": True,
+            "shortlist": [asdict(c) for c in scored],
+            "criteria": ANALYSIS_CRITERIA,
+            "stopped_early": stopped_early,
+            "analysis_metadata": {
+                "total_candidates": len(candidates_data),
+                "llm_candidates": total,
+                "scored_candidates": len(scored),
+                "failed_candidates": failed,
+                "analysis_date": datetime.now().isoformat(),
+                "job_title": request.job.title,
+                "job_level": request.job.level,
+                "elapsed": round(time.perf_counter() - started, 2)
+            }
+        })
+    
+    return StreamingResponse(event_generator(), media_type="application/x-ndjson")
+
 @app.get("/analysis-criteria")
 async def get_analysis_criteria():
     """
@@ -205,6 +366,7 @@ async def root():
         "endpoints": [
             "/health",
             "/analyze-candidates",
+            "/analyze-candidates/stream",
             "/analysis-criteria"
         ]
     }
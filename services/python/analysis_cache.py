@@ -0,0 +1,156 @@
+"""
+Persistent Analysis Cache for X-ceed Python Services
+Content-addressed SQLite cache for LLM analysis results with TTL and LRU eviction
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
+
+
+def _normalize_text(text: Optional[str]) -> str:
+    """Collapse whitespace so cosmetic differences don't defeat the cache"""
+    return re.sub(r'\s+', ' ', text or '').strip()
+
+
+class AnalysisCache:
+    """
+    On-disk cache of analysis results keyed by a hash of everything that
+    influences the LLM output (inputs, model and prompt version).
+
+    Entries expire after ttl_seconds and the least recently used entries are
+    evicted once max_entries is exceeded. Safe to share between threads, and
+    between worker processes pointing at the same file.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, ttl_seconds: int = 7 * 24 * 3600,
+                 max_entries: int = 5000):
+        """
+        Initialize the cache
+
+        Args:
+            db_path: SQLite file path (defaults to services/python/.cache/analysis_cache.sqlite3)
+            ttl_seconds: Time-to-live for each entry
+            max_entries: Maximum entries kept before LRU eviction
+        """
+        self.db_path = db_path or os.path.join(DEFAULT_CACHE_DIR, 'analysis_cache.sqlite3')
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS analysis_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_accessed REAL NOT NULL
+            )
+        """)
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_analysis_cache_accessed ON analysis_cache(last_accessed)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(resume_text: str, job_description: str, job_title: str,
+                 job_requirements: Optional[List[str]], model: str, prompt_version: str) -> str:
+        """
+        Build a content hash for an analysis request
+
+        Returns:
+            Hex SHA-256 digest
+        """
+        payload = {
+            "resume_text": _normalize_text(resume_text),
+            "job_description": _normalize_text(job_description),
+            "job_title": _normalize_text(job_title).lower(),
+            "job_requirements": sorted(_normalize_text(str(r)).lower() for r in (job_requirements or [])),
+            "model": model,
+            "prompt_version": prompt_version
+        }
+        encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached value, or None on miss/expiry"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM analysis_cache WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            value, created_at = row
+            if now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM analysis_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE analysis_cache SET last_accessed = ? WHERE key = ?", (now, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+
+        return json.loads(value)
+
+    def set(self, key: str, value: Dict[str, Any]):
+        """Store a value and evict least recently used entries beyond max_entries"""
+        now = time.time()
+        encoded = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO analysis_cache (key, value, created_at, last_accessed) VALUES (?, ?, ?, ?)",
+                (key, encoded, now, now)
+            )
+            self._conn.execute(
+                "DELETE FROM analysis_cache WHERE created_at < ?", (now - self.ttl_seconds,)
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM analysis_cache").fetchone()[0]
+            overflow = count - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM analysis_cache WHERE key IN "
+                    "(SELECT key FROM analysis_cache ORDER BY last_accessed ASC LIMIT ?)",
+                    (overflow,)
+                )
+                self.evictions += overflow
+            self._conn.commit()
+
+    def clear(self):
+        """Remove every entry"""
+        with self._lock:
+            self._conn.execute("DELETE FROM analysis_cache")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for this process plus current size"""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM analysis_cache").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions
+        }
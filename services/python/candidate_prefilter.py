@@ -0,0 +1,251 @@
+"""
+Candidate Pre-Ranker for X-ceed Python Services
+Local first-stage scoring that decides which applicants are worth an LLM analysis
+"""
+
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from job_profile import parse_resume_years, skill_pattern
+
+# The deterministic scorers live with the resume analyzer script
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'scripts')
+
+
+@dataclass
+class PrefilterConfig:
+    """
+    Which pre-ranked candidates go on to LLM scoring.
+
+    Candidates scoring below min_score are dropped, and at most top_k of the
+    rest are kept. top_k = 0 and min_score = 0 disable the respective limit;
+    with both disabled every candidate is sent to the LLM.
+    """
+    top_k: int = 25
+    min_score: float = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        return self.top_k > 0 or self.min_score > 0
+
+    @classmethod
+    def from_job(cls, job_data: Dict[str, Any]) -> 'PrefilterConfig':
+        """
+        Settings for one job: prefilterTopK / prefilterMinScore on the job,
+        falling back to SHORTLIST_PREFILTER_TOP_K / SHORTLIST_PREFILTER_MIN_SCORE
+        """
+        top_k = job_data.get('prefilterTopK')
+        min_score = job_data.get('prefilterMinScore')
+        return cls(
+            top_k=int(top_k if top_k is not None else os.getenv('SHORTLIST_PREFILTER_TOP_K', '25')),
+            min_score=float(min_score if min_score is not None else os.getenv('SHORTLIST_PREFILTER_MIN_SCORE', '0'))
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"top_k": self.top_k, "min_score": self.min_score}
+
+
+@dataclass
+class PrefilterResult:
+    """Outcome of the local ranking stage"""
+    selected: List[int]
+    scores: Dict[int, Dict[str, Any]] = field(default_factory=dict)
+    elapsed: float = 0.0
+    ranked: bool = True
+
+    def report(self, total: int) -> Dict[str, Any]:
+        return {
+            "ranked": self.ranked,
+            "total_candidates": total,
+            "sent_to_llm": len(self.selected),
+            "filtered_out": total - len(self.selected),
+            "elapsed": round(self.elapsed, 3)
+        }
+
+
+class CandidatePreRanker:
+    """
+    Scores applicants against a job with the resume analyzer's skill, keyword,
+    experience and embedding-similarity scorers - no LLM calls - so only the
+    most promising ones are analyzed by Gemini.
+
+    The analyzer (spaCy pipeline and embedding model) is loaded on first use
+    and shared by every shortlist, so batches are scored one at a time.
+    If it cannot be loaded, candidates are ranked from the compiled job
+    profile instead (required-skill coverage plus JD embedding similarity),
+    and failing that every candidate is passed through unranked.
+    """
+
+    def __init__(self):
+        self._analyzer = None
+        self._unavailable = False
+        self._embeddings = None
+        self._lock = threading.Lock()
+        self._analyze_lock = threading.Lock()
+
+    def _get_analyzer(self):
+        with self._lock:
+            if self._analyzer is None and not self._unavailable:
+                try:
+                    if SCRIPTS_DIR not in sys.path:
+                        sys.path.append(SCRIPTS_DIR)
+                    from resume_analyzer import ResumeAnalyzer
+                    self._analyzer = ResumeAnalyzer()
+                except Exception as e:
+                    print(f"⚠️ Resume analyzer unavailable for pre-ranking, using the job profile instead: {e}")
+                    self._unavailable = True
+            return self._analyzer
+
+    def _get_embeddings(self):
+        with self._lock:
+            if self._embeddings is None:
+                try:
+                    from embedding_engine import get_embedding_engine
+                    self._embeddings = get_embedding_engine()
+                except Exception as e:
+                    print(f"⚠️ Embeddings unavailable for pre-ranking: {e}")
+                    self._embeddings = False
+            return self._embeddings or None
+
+    @staticmethod
+    def _experience_score(profile, text: str) -> Optional[int]:
+        """
+        How well the years a resume claims fit the job's range: full marks
+        inside it, proportional below the minimum, 80 above the maximum, and
+        50 when the resume states no figure. None when the job sets no minimum.
+        """
+        if profile.min_years is None:
+            return None
+        years = parse_resume_years(text)
+        if years is None:
+            return 50
+        if years < profile.min_years:
+            return int(years / profile.min_years * 100)
+        if profile.max_years is not None and years > profile.max_years:
+            return 80
+        return 100
+
+    def _score_with_profile(self, profile, resume_texts: List[str]) -> Optional[Dict[int, Dict[str, Any]]]:
+        """
+        Required-skill coverage, blended with the experience fit when the job
+        states a years range and JD embedding similarity when embeddings are available
+        """
+        if not profile.skills:
+            return None
+
+        semantic = None
+        embeddings = self._get_embeddings()
+        if embeddings is not None:
+            try:
+                job_vector = profile.embedding(embeddings)
+                vectors = np.asarray(embeddings.embed_documents(resume_texts), dtype=np.float32)
+                vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+                semantic = np.clip(vectors @ job_vector, 0, 1) * 100 if job_vector is not None else None
+            except Exception as e:
+                print(f"⚠️ Embedding similarity failed during pre-ranking: {e}")
+
+        patterns = [skill_pattern(skill) for skill in profile.skills]
+        scores = {}
+        for index, text in enumerate(resume_texts):
+            skills_score = int(sum(1 for pattern in patterns if pattern.search(text)) / len(patterns) * 100)
+            row = {'skills_score': skills_score}
+            weighted = [(skills_score, 0.7)]
+            experience_score = self._experience_score(profile, text)
+            if experience_score is not None:
+                row['experience_score'] = experience_score
+                weighted.append((experience_score, 0.2))
+            if semantic is not None:
+                row['semantic_score'] = round(float(semantic[index]), 1)
+                weighted.append((row['semantic_score'], 0.3))
+            row['overall_score'] = int(sum(value * weight for value, weight in weighted) / sum(w for _, w in weighted))
+            scores[index] = row
+        return scores
+
+    def score(self, job_data: Dict[str, Any], candidates: List[Dict[str, Any]],
+              resume_texts: List[str], profile=None) -> Optional[Dict[int, Dict[str, Any]]]:
+        """
+        Score every candidate locally
+
+        Args:
+            job_data: Job with description, title and requirements
+            candidates: Applicants (their skills lists are used as declared skills)
+            resume_texts: Extracted resume text per candidate
+            profile: Compiled JobProfile, used when the resume analyzer is unavailable
+
+        Returns:
+            Score dict (overall_score, skills_score, ...) per candidate index,
+            or None when no local scorer is available
+        """
+        analyzer = self._get_analyzer()
+        if analyzer is None:
+            return self._score_with_profile(profile, resume_texts) if profile is not None else None
+
+        job_description = job_data.get('jobDescriptionText') or job_data.get('description', '')
+        skills = [c.get('skills') if isinstance(c.get('skills'), list) else [] for c in candidates]
+        resumes = [
+            {'id': index, 'resume_text': text, 'user_skills': skills[index]}
+            for index, text in enumerate(resume_texts)
+        ]
+        jobs = [{
+            'id': job_data.get('id'),
+            'job_description': job_description,
+            'job_title': job_data.get('title', ''),
+            'job_requirements': job_data.get('requirements') or []
+        }]
+
+        # spaCy pipelines are not safe to share between threads
+        with self._analyze_lock:
+            rows = analyzer.analyze_batch(resumes, jobs)
+
+        scores = {}
+        for row in rows:
+            if 'error' not in row:
+                scores[row['resume_id']] = row
+        return scores
+
+    def select(self, job_data: Dict[str, Any], candidates: List[Dict[str, Any]], resume_texts: List[str],
+               config: PrefilterConfig, profile=None) -> PrefilterResult:
+        """
+        Rank candidates locally and pick the ones to send to the LLM
+
+        Args:
+            profile: Compiled JobProfile for the job (see score)
+
+        Returns:
+            PrefilterResult whose selected indexes are ordered best first
+        """
+        started = time.perf_counter()
+        everyone = list(range(len(candidates)))
+        if not config.enabled or not candidates:
+            return PrefilterResult(selected=everyone, ranked=False)
+
+        scores = self.score(job_data, candidates, resume_texts, profile)
+        if scores is None:
+            return PrefilterResult(selected=everyone, ranked=False, elapsed=time.perf_counter() - started)
+
+        ranked = sorted(scores, key=lambda i: scores[i]['overall_score'], reverse=True)
+        selected = [i for i in ranked if scores[i]['overall_score'] >= config.min_score]
+        if config.top_k > 0:
+            selected = selected[:config.top_k]
+        return PrefilterResult(selected=selected, scores=scores, elapsed=time.perf_counter() - started)
+
+
+_pre_ranker: Optional[CandidatePreRanker] = None
+_pre_ranker_lock = threading.Lock()
+
+
+def get_pre_ranker() -> CandidatePreRanker:
+    """
+    Return the process-wide pre-ranker, creating it on first call
+    """
+    global _pre_ranker
+    with _pre_ranker_lock:
+        if _pre_ranker is None:
+            _pre_ranker = CandidatePreRanker()
+        return _pre_ranker
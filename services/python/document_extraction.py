@@ -0,0 +1,370 @@
+"""
+Document Extraction Engine for X-ceed Python Services
+Process-pool PDF/DOCX/TXT text extraction with timeouts, page limits and an async API
+"""
+
+import asyncio
+import io
+import multiprocessing
+import os
+import signal
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Union
+
+Source = Union[str, bytes]
+
+# Workers are started from a clean server process (spawn where forkserver is unavailable)
+# rather than forked from the service, which holds threads, locks and open connections
+_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+# Extra seconds the parent waits past a job's own deadline before treating its worker as hung
+WORKER_DEADLINE_GRACE = 5.0
+
+
+@dataclass
+class ExtractionResult:
+    """Text extracted from one document"""
+    parts: List[str] = field(default_factory=list)
+    pages_read: int = 0
+    total_pages: Optional[int] = None
+    truncated: bool = False
+    error: Optional[str] = None
+    timed_out: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def text(self, separator: str = "\n") -> str:
+        """Join pages (PDF) or paragraphs (DOCX) with a separator"""
+        return separator.join(self.parts)
+
+
+def _open_source(source: Source):
+    return io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else open(source, 'rb')
+
+
+class _PdfPages:
+    """Page count plus a lazy page-text iterator over an open PDF"""
+
+    def __init__(self, handle, backend: str):
+        self.backend = backend
+        if backend == "pdfplumber":
+            import pdfplumber
+            self._pdf = pdfplumber.open(handle)
+            self._pages = self._pdf.pages
+        else:
+            import PyPDF2
+            self._pdf = None
+            self._pages = PyPDF2.PdfReader(handle).pages
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+    def iter_text(self, max_pages: Optional[int] = None) -> Iterator[str]:
+        for index, page in enumerate(self._pages):
+            if max_pages is not None and index >= max_pages:
+                break
+            yield page.extract_text() or ""
+            if self.backend == "pdfplumber":
+                # pdfplumber keeps parsed layout objects per page unless flushed
+                page.flush_cache()
+
+    def close(self):
+        if self._pdf is not None:
+            self._pdf.close()
+
+
+def iter_pdf_pages(source: Source, max_pages: Optional[int] = None,
+                   backend: str = "pypdf2") -> Iterator[str]:
+    """
+    Yield the text of each PDF page in order, one page in memory at a time
+
+    Args:
+        source: File path or PDF bytes
+        max_pages: Stop after this many pages
+        backend: "pypdf2" or "pdfplumber"
+    """
+    with _open_source(source) as handle:
+        pages = _PdfPages(handle, backend)
+        try:
+            yield from pages.iter_text(max_pages)
+        finally:
+            pages.close()
+
+
+def extract_document(source: Source, file_type: str, max_pages: Optional[int] = None,
+                     max_chars: Optional[int] = None, pdf_backend: str = "pypdf2") -> ExtractionResult:
+    """
+    Extract text in the current process (this is what pool workers run)
+
+    Args:
+        source: File path or file bytes
+        file_type: 'pdf', 'docx'/'doc' or 'txt'
+        max_pages: PDF page limit
+        max_chars: Stop once this many characters have been collected
+        pdf_backend: "pypdf2" or "pdfplumber"
+    """
+    file_type = file_type.lower().lstrip('.')
+    result = ExtractionResult()
+    chars = 0
+
+    def add(part: str) -> bool:
+        nonlocal chars
+        if max_chars is not None and chars + len(part) > max_chars:
+            result.parts.append(part[:max(0, max_chars - chars)])
+            result.truncated = True
+            return False
+        result.parts.append(part)
+        chars += len(part)
+        return True
+
+    try:
+        if file_type == 'pdf':
+            with _open_source(source) as handle:
+                pages = _PdfPages(handle, pdf_backend)
+                try:
+                    result.total_pages = len(pages)
+                    for page_text in pages.iter_text(max_pages):
+                        result.pages_read += 1
+                        if not add(page_text):
+                            break
+                finally:
+                    pages.close()
+            if result.pages_read < result.total_pages:
+                result.truncated = True
+        elif file_type in ('docx', 'doc'):
+            from docx import Document
+            with _open_source(source) as handle:
+                for paragraph in Document(handle).paragraphs:
+                    if not add(paragraph.text):
+                        break
+        elif file_type == 'txt':
+            if isinstance(source, (bytes, bytearray)):
+                add(bytes(source).decode('utf-8'))
+            else:
+                with open(source, 'r', encoding='utf-8') as f:
+                    add(f.read())
+        else:
+            result.error = f"Unsupported file type: {file_type}"
+    except Exception as e:
+        result.error = str(e)
+    return result
+
+
+class _DeadlineExceeded(BaseException):
+    """Raised by the worker alarm; a BaseException so extract_document does not swallow it"""
+
+
+def _raise_deadline(signum, frame):
+    raise _DeadlineExceeded()
+
+
+def _extract_with_deadline(timeout: float, *args) -> ExtractionResult:
+    """
+    Pool entry point: extract_document with a deadline that starts when the worker picks the job up
+
+    Where SIGALRM exists the worker interrupts itself and stays usable; elsewhere
+    the parent's backstop timeout is the only limit.
+    """
+    if not hasattr(signal, 'setitimer'):
+        return extract_document(*args)
+    previous = signal.signal(signal.SIGALRM, _raise_deadline)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return extract_document(*args)
+    except _DeadlineExceeded:
+        return ExtractionResult(error=f"Extraction timed out after {timeout:g}s", timed_out=True)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+class DocumentExtractionEngine:
+    """
+    Runs document parsing in a process pool.
+
+    Parsing is CPU bound and some PDFs make PyPDF2 spin for a long time, so
+    work is sent to worker processes: the event loop stays free and the GIL
+    is not shared with the web server.
+
+    The per-document timeout is enforced inside the worker (SIGALRM) and
+    counts from the moment a worker starts the job, so time spent queued
+    behind other documents never counts against it, and a worker that times
+    out stays usable. The parent only steps in as a backstop - after the
+    timeout plus WORKER_DEADLINE_GRACE for every wave of jobs queued ahead -
+    for a worker stuck where the alarm cannot interrupt it (or on platforms
+    without SIGALRM); it then terminates the pool, and calls that were sharing
+    it are retried once on a fresh pool.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, timeout: float = 30.0,
+                 max_pages: Optional[int] = 50, max_chars: Optional[int] = 500_000):
+        """
+        Initialize the engine (worker processes start on first use)
+
+        Args:
+            max_workers: Worker processes (defaults to CPU count, at most 4)
+            timeout: Per-document deadline in seconds
+            max_pages: Default PDF page limit
+            max_chars: Default character limit per document
+        """
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.timeout = timeout
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.timeouts = 0
+        self.recycles = 0
+        self.documents = 0
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context(_START_METHOD)
+                )
+            return self._pool
+
+    def _recycle(self, pool: ProcessPoolExecutor):
+        """Kill a pool whose worker is stuck so the next call gets a fresh one"""
+        with self._lock:
+            if self._pool is not pool:
+                return
+            self._pool = None
+            self.recycles += 1
+        for process in list((getattr(pool, '_processes', None) or {}).values()):
+            try:
+                process.terminate()
+            except Exception:
+                pass
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    @contextmanager
+    def _queued(self, timeout: float):
+        """
+        Track a submitted job and yield the parent's backstop timeout for it
+
+        Every max_workers jobs already in flight add one more worker deadline of queueing.
+        """
+        with self._lock:
+            ahead = self._in_flight
+            self._in_flight += 1
+        try:
+            yield (timeout + WORKER_DEADLINE_GRACE) * (1 + ahead // self.max_workers)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _finish(self, result: ExtractionResult) -> ExtractionResult:
+        if result.timed_out:
+            self.timeouts += 1
+        return result
+
+    def _args(self, source: Source, file_type: str, max_pages, max_chars, pdf_backend):
+        return (
+            source,
+            file_type,
+            self.max_pages if max_pages is None else max_pages,
+            self.max_chars if max_chars is None else max_chars,
+            pdf_backend
+        )
+
+    def extract(self, source: Source, file_type: str, max_pages: Optional[int] = None,
+                max_chars: Optional[int] = None, pdf_backend: str = "pypdf2",
+                timeout: Optional[float] = None) -> ExtractionResult:
+        """
+        Extract text, blocking the calling thread (not the worker) until done
+
+        Args:
+            source: File path or file bytes
+            file_type: 'pdf', 'docx'/'doc' or 'txt'
+            max_pages: PDF page limit (engine default when None)
+            max_chars: Character limit (engine default when None)
+            pdf_backend: "pypdf2" or "pdfplumber"
+            timeout: Deadline in seconds from when a worker starts the job (engine default when None)
+        """
+        self.documents += 1
+        timeout = timeout or self.timeout
+        args = self._args(source, file_type, max_pages, max_chars, pdf_backend)
+        for attempt in range(2):
+            pool = self._get_pool()
+            with self._queued(timeout) as backstop:
+                try:
+                    return self._finish(pool.submit(_extract_with_deadline, timeout, *args).result(timeout=backstop))
+                except FutureTimeoutError:
+                    self.timeouts += 1
+                    self._recycle(pool)
+                    return ExtractionResult(error=f"Extraction timed out after {timeout:g}s", timed_out=True)
+                except BrokenProcessPool:
+                    # A hung worker elsewhere took this pool down with it
+                    self._recycle(pool)
+        return ExtractionResult(error="Extraction worker crashed")
+
+    async def extract_async(self, source: Source, file_type: str, max_pages: Optional[int] = None,
+                            max_chars: Optional[int] = None, pdf_backend: str = "pypdf2",
+                            timeout: Optional[float] = None) -> ExtractionResult:
+        """Awaitable variant of extract()"""
+        self.documents += 1
+        timeout = timeout or self.timeout
+        args = self._args(source, file_type, max_pages, max_chars, pdf_backend)
+        loop = asyncio.get_running_loop()
+        for attempt in range(2):
+            pool = self._get_pool()
+            with self._queued(timeout) as backstop:
+                try:
+                    return self._finish(await asyncio.wait_for(
+                        loop.run_in_executor(pool, _extract_with_deadline, timeout, *args),
+                        timeout=backstop
+                    ))
+                except asyncio.TimeoutError:
+                    self.timeouts += 1
+                    self._recycle(pool)
+                    return ExtractionResult(error=f"Extraction timed out after {timeout:g}s", timed_out=True)
+                except BrokenProcessPool:
+                    self._recycle(pool)
+        return ExtractionResult(error="Extraction worker crashed")
+
+    def stats(self):
+        return {
+            "max_workers": self.max_workers,
+            "timeout": self.timeout,
+            "documents": self.documents,
+            "in_flight": self._in_flight,
+            "timeouts": self.timeouts,
+            "recycles": self.recycles
+        }
+
+    def shutdown(self):
+        """Stop worker processes"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+_engine: Optional[DocumentExtractionEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_extraction_engine() -> DocumentExtractionEngine:
+    """
+    Return the process-wide engine, configured from DOC_EXTRACTION_* environment variables
+    """
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = DocumentExtractionEngine(
+                max_workers=int(os.getenv('DOC_EXTRACTION_WORKERS', '0')) or None,
+                timeout=float(os.getenv('DOC_EXTRACTION_TIMEOUT', '30')),
+                max_pages=int(os.getenv('DOC_EXTRACTION_MAX_PAGES', '50')),
+                max_chars=int(os.getenv('DOC_EXTRACTION_MAX_CHARS', '500000'))
+            )
+        return _engine
@@ -0,0 +1,229 @@
+"""
+Shared Embedding Engine for X-ceed Python Services
+Process-wide sentence-transformers model with request batching and a vector cache
+"""
+
+import asyncio
+import hashlib
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+try:
+    from langchain_core.embeddings import Embeddings as _EmbeddingsBase
+except ImportError:
+    try:
+        from langchain.embeddings.base import Embeddings as _EmbeddingsBase
+    except ImportError:
+        _EmbeddingsBase = object
+
+DEFAULT_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+@dataclass
+class _BatchItem:
+    texts: List[str]
+    future: Future
+
+
+class EmbeddingEngine(_EmbeddingsBase):
+    """
+    Loads an embedding model once and serves embed calls from any thread.
+
+    Calls that arrive within max_wait_ms of each other are merged into a single
+    forward pass of up to max_batch_size texts, and vectors for texts seen
+    before are served from an LRU cache. Implements the LangChain Embeddings
+    interface, so it can be passed anywhere HuggingFaceEmbeddings was used.
+    """
+
+    def __init__(self, model_name: str = DEFAULT_MODEL_NAME, device: str = "cpu",
+                 max_batch_size: int = 64, max_wait_ms: float = 5.0, cache_size: int = 10000):
+        """
+        Initialize the engine (the model itself is loaded on first use)
+
+        Args:
+            model_name: sentence-transformers model name
+            device: Torch device
+            max_batch_size: Largest number of texts encoded in one forward pass
+            max_wait_ms: How long the batcher waits for more requests before encoding
+            cache_size: Number of vectors kept in the LRU cache
+        """
+        self.model_name = model_name
+        self.device = device
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.cache_size = cache_size
+
+        self._model = None
+        self._model_lock = threading.Lock()
+        self._cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._queue: "queue.Queue[_BatchItem]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.batches = 0
+        self.texts_encoded = 0
+
+    @property
+    def model(self):
+        """The underlying SentenceTransformer, loaded once"""
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    from sentence_transformers import SentenceTransformer
+                    self._model = SentenceTransformer(self.model_name, device=self.device)
+        return self._model
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            with self._worker_lock:
+                if self._worker is None or not self._worker.is_alive():
+                    self._worker = threading.Thread(
+                        target=self._run_batcher, name="embedding-batcher", daemon=True
+                    )
+                    self._worker.start()
+
+    def _run_batcher(self):
+        """Collect queued requests into batches and encode them"""
+        while True:
+            pending = [self._queue.get()]
+            count = len(pending[0].texts)
+            deadline = time.monotonic() + self.max_wait
+
+            while count < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                pending.append(item)
+                count += len(item.texts)
+
+            # Concurrent callers often embed the same text (e.g. one job description), encode it once
+            positions: Dict[str, int] = {}
+            for item in pending:
+                for text in item.texts:
+                    positions.setdefault(text, len(positions))
+            texts = list(positions)
+            try:
+                vectors = self.model.encode(
+                    texts,
+                    batch_size=self.max_batch_size,
+                    convert_to_numpy=True,
+                    show_progress_bar=False
+                ).astype(np.float32)
+                self.batches += 1
+                self.texts_encoded += len(texts)
+
+                for item in pending:
+                    item.future.set_result(vectors[[positions[text] for text in item.texts]])
+            except Exception as e:
+                for item in pending:
+                    item.future.set_exception(e)
+
+    @staticmethod
+    def _cache_key(text: str) -> str:
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts, using cached vectors where possible
+
+        Returns:
+            float32 array of shape (len(texts), dim)
+        """
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        keys = [self._cache_key(text) for text in texts]
+        vectors: List[Optional[np.ndarray]] = [None] * len(texts)
+        missing: Dict[str, List[int]] = {}
+
+        with self._cache_lock:
+            for i, key in enumerate(keys):
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+                    vectors[i] = cached
+                    self.cache_hits += 1
+                else:
+                    missing.setdefault(key, []).append(i)
+                    self.cache_misses += 1
+
+        if missing:
+            unique_texts = [texts[indices[0]] for indices in missing.values()]
+            future: Future = Future()
+            self._ensure_worker()
+            self._queue.put(_BatchItem(unique_texts, future))
+            encoded = future.result()
+
+            with self._cache_lock:
+                for (key, indices), vector in zip(missing.items(), encoded):
+                    for i in indices:
+                        vectors[i] = vector
+                    self._cache[key] = vector
+                    self._cache.move_to_end(key)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        return np.vstack(vectors)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """LangChain Embeddings interface"""
+        return self.encode(list(texts)).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        """LangChain Embeddings interface"""
+        return self.encode([text])[0].tolist()
+
+    async def aembed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Async variant that keeps the event loop free while waiting for the batcher"""
+        return await asyncio.to_thread(self.embed_documents, texts)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        """Async variant that keeps the event loop free while waiting for the batcher"""
+        return await asyncio.to_thread(self.embed_query, text)
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache and batching counters"""
+        return {
+            "model": self.model_name,
+            "loaded": self._model is not None,
+            "cache_entries": len(self._cache),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "batches": self.batches,
+            "texts_encoded": self.texts_encoded,
+            "avg_batch_size": round(self.texts_encoded / self.batches, 1) if self.batches else 0.0
+        }
+
+
+_engines: Dict[str, EmbeddingEngine] = {}
+_engines_lock = threading.Lock()
+
+
+def get_embedding_engine(model_name: str = DEFAULT_MODEL_NAME, **kwargs) -> EmbeddingEngine:
+    """
+    Return the process-wide engine for a model, creating it on first call
+
+    Args:
+        model_name: sentence-transformers model name
+        **kwargs: EmbeddingEngine options, only used when the engine is created
+    """
+    with _engines_lock:
+        engine = _engines.get(model_name)
+        if engine is None:
+            engine = EmbeddingEngine(model_name=model_name, **kwargs)
+            _engines[model_name] = engine
+        return engine
@@ -10,6 +10,7 @@ from typing import Optional, Dict, Any
 import os
 import tempfile
 from resume_analyzer_core import ResumeAnalyzerCore, DocumentProcessor
+from rag_session_manager import RAGSessionManager
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -27,8 +28,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Global analyzer instance (in production, you'd want session management)
-analyzer = ResumeAnalyzerCore()
+# Shared LLM client and embedding model; every session gets its own index and chat memory
+base_analyzer = ResumeAnalyzerCore()
+session_manager = RAGSessionManager(
+    analyzer_factory=base_analyzer.new_session,
+    max_sessions=int(os.getenv("RAG_MAX_SESSIONS", "200")),
+    ttl_seconds=int(os.getenv("RAG_SESSION_TTL", "3600")),
+    max_index_bytes=int(os.getenv("RAG_MAX_INDEX_MB", "256")) * 1024 * 1024
+)
+
+DEFAULT_SESSION_ID = "default"
 
 # Pydantic models
 class AnalysisRequest(BaseModel):
@@ -36,6 +45,7 @@ class AnalysisRequest(BaseModel):
     job_description: str
     job_title: str
     job_requirements: Optional[list] = []
+    session_id: Optional[str] = DEFAULT_SESSION_ID
 
 class ChatRequest(BaseModel):
     question: str
@@ -61,17 +71,21 @@ async def analyze_resume(request: AnalysisRequest):
     Analyze resume against job description
     """
     try:
+        session = session_manager.get_or_create(request.session_id or DEFAULT_SESSION_ID)
+        
         # Process documents
-        success = analyzer.process_documents(
+        success = await session.run(
+            session.analyzer.process_documents,
             request.resume_text, 
             request.job_description
         )
         
         if not success:
             raise HTTPException(status_code=400, detail="Failed to process documents")
+        session_manager.enforce_limits(keep=session.session_id)
         
         # Get comprehensive analysis
-        analysis_result = analyzer.get_comprehensive_analysis()
+        analysis_result = await session.run(session.analyzer.get_comprehensive_analysis)
         
         if not analysis_result.get('success'):
             raise HTTPException(status_code=500, detail=analysis_result.get('error', 'Analysis failed'))
@@ -87,6 +101,7 @@ async def analyze_resume(request: AnalysisRequest):
                 },
                 "metadata": {
                     "analyzedAt": analysis_result.get('timestamp'),
+                    "sessionId": session.session_id,
                     "jobTitle": request.job_title,
                     "model": "llama-3.1-8b-instant",
                     "ragEnabled": True
@@ -105,10 +120,11 @@ async def chat_with_resume(request: ChatRequest):
     Chat about the resume and job description
     """
     try:
-        if not analyzer.is_ready():
+        session = session_manager.get(request.session_id or DEFAULT_SESSION_ID)
+        if session is None or not session.analyzer.is_ready():
             raise HTTPException(status_code=400, detail="No documents processed. Please analyze first.")
         
-        response = analyzer.ask_question(request.question)
+        response = await session.run(session.analyzer.ask_question, request.question)
         
         if not response.get('success'):
             raise HTTPException(status_code=500, detail=response.get('error', 'Chat failed'))
@@ -128,19 +144,20 @@ async def chat_with_resume(request: ChatRequest):
         raise HTTPException(status_code=500, detail=f"Chat failed: {str(e)}")
 
 @app.get("/quick-analysis/{analysis_type}")
-async def quick_analysis(analysis_type: str):
+async def quick_analysis(analysis_type: str, session_id: str = DEFAULT_SESSION_ID):
     """
     Get quick analysis results
     """
     try:
-        if not analyzer.is_ready():
+        session = session_manager.get(session_id)
+        if session is None or not session.analyzer.is_ready():
             raise HTTPException(status_code=400, detail="No documents processed. Please analyze first.")
         
         valid_types = ["match", "skills", "improvements"]
         if analysis_type not in valid_types:
             raise HTTPException(status_code=400, detail=f"Invalid analysis type. Use one of: {valid_types}")
         
-        response = analyzer.get_quick_analysis(analysis_type)
+        response = await session.run(session.analyzer.get_quick_analysis, analysis_type)
         
         if response.get('error'):
             raise HTTPException(status_code=500, detail=response['error'])
@@ -160,12 +177,13 @@ async def quick_analysis(analysis_type: str):
         raise HTTPException(status_code=500, detail=f"Quick analysis failed: {str(e)}")
 
 @app.get("/chat-history")
-async def get_chat_history():
+async def get_chat_history(session_id: str = DEFAULT_SESSION_ID):
     """
     Get chat history
     """
     try:
-        history = analyzer.get_chat_history()
+        session = session_manager.get(session_id)
+        history = session.analyzer.get_chat_history() if session else []
         return AnalysisResponse(
             success=True,
             data={"history": history}
@@ -174,12 +192,15 @@ async def get_chat_history():
         raise HTTPException(status_code=500, detail=f"Failed to get chat history: {str(e)}")
 
 @app.post("/clear-session")
-async def clear_session():
+async def clear_session(session_id: Optional[str] = None):
     """
-    Clear the current analysis session
+    Clear one analysis session, or every session when no id is given
     """
     try:
-        analyzer.clear_session()
+        if session_id:
+            session_manager.delete(session_id)
+        else:
+            session_manager.clear()
         return AnalysisResponse(
             success=True,
             data={"message": "Session cleared successfully"}
@@ -188,14 +209,17 @@ async def clear_session():
         raise HTTPException(status_code=500, detail=f"Failed to clear session: {str(e)}")
 
 @app.get("/status")
-async def get_status():
+async def get_status(session_id: str = DEFAULT_SESSION_ID):
     """
     Get analyzer status
     """
+    session = session_manager.get(session_id)
+    analyzer = session.analyzer if session else None
     return {
-        "ready": analyzer.is_ready(),
-        "has_documents": analyzer.vectorstore is not None,
-        "chat_history_length": len(analyzer.get_chat_history())
+        "ready": analyzer is not None and analyzer.is_ready(),
+        "has_documents": analyzer is not None and analyzer.vectorstore is not None,
+        "chat_history_length": len(analyzer.get_chat_history()) if analyzer else 0,
+        "sessions": session_manager.stats()
     }
 
 if __name__ == "__main__":
@@ -5,12 +5,17 @@ Specifically for the resume matching analysis chatbot using Google Gemini AI
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Optional, Dict, Any, List
 import os
 import json
+import time
+import asyncio
 from dotenv import load_dotenv
 import google.generativeai as genai
+from sse_utils import SSE_HEADERS, format_sse
+from single_flight import SingleFlight, flight_key
 
 # Load environment variables
 import os
@@ -51,6 +56,9 @@ print(f"Gemini API Key configured: {bool(GEMINI_API_KEY)}")
 genai.configure(api_key=GEMINI_API_KEY)
 model = genai.GenerativeModel('gemini-1.5-flash')  # Updated model name
 
+# Identical questions already in flight share one Gemini call
+chat_flights = SingleFlight("gemini-chat")
+
 # Global session storage (in production, use proper session management)
 session_data = {}
 
@@ -66,23 +74,20 @@ class ChatResponse(BaseModel):
     response: Optional[str] = None
     error: Optional[str] = None
 
-def call_gemini_api(prompt: str, conversation_history: List[Dict] = None) -> str:
-    """Make a call to Gemini API for chat responses"""
-    try:
-        print(f"[DEBUG] Calling Gemini API with prompt length: {len(prompt)}")
-        
-        # Build conversation context
-        context_parts = []
-        
-        # Add conversation history if available
-        if conversation_history:
-            for msg in conversation_history[-5:]:  # Last 5 messages for context
-                role = "User" if msg.get('role') == 'user' else "Assistant"
-                content = msg.get('content', '')
-                context_parts.append(f"{role}: {content}")
-        
-        # Create the full prompt with context
-        full_prompt = f"""You are an AI assistant specialized in resume analysis and career guidance. You help job seekers understand how well their resume matches job requirements and provide actionable advice.
+def build_full_prompt(prompt: str, conversation_history: List[Dict] = None) -> str:
+    """Wrap a question with the assistant instructions and recent conversation history"""
+    # Build conversation context
+    context_parts = []
+    
+    # Add conversation history if available
+    if conversation_history:
+        for msg in conversation_history[-5:]:  # Last 5 messages for context
+            role = "User" if msg.get('role') == 'user' else "Assistant"
+            content = msg.get('content', '')
+            context_parts.append(f"{role}: {content}")
+    
+    # Create the full prompt with context
+    return f"""You are an AI assistant specialized in resume analysis and career guidance. You help job seekers understand how well their resume matches job requirements and provide actionable advice.
 
 {"Previous conversation:" + chr(10) + chr(10).join(context_parts) + chr(10) + chr(10) if context_parts else ""}
 
@@ -90,6 +95,12 @@ Current question: {prompt}
 
 Please provide a helpful, detailed response focused on resume analysis, job matching, and career advice. Be specific and actionable in your recommendations."""
 
+def call_gemini_api(prompt: str, conversation_history: List[Dict] = None) -> str:
+    """Make a call to Gemini API for chat responses"""
+    try:
+        print(f"[DEBUG] Calling Gemini API with prompt length: {len(prompt)}")
+        
+        full_prompt = build_full_prompt(prompt, conversation_history)
         print(f"[DEBUG] Full prompt length: {len(full_prompt)}")
         
         # Generate response using Gemini
@@ -125,89 +136,100 @@ async def root():
         "service": "X-ceed Resume Analysis Chat API (Gemini)",
         "status": "running",
         "gemini_configured": bool(GEMINI_API_KEY),
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "single_flight": chat_flights.stats()
     }
 
-@app.post("/chat", response_model=ChatResponse)
-async def chat_with_resume_analyzer(request: ChatRequest):
-    """Chat endpoint for resume analysis discussions"""
-    try:
-        print(f"[DEBUG] Received chat request:")
-        print(f"   - Question: '{request.question[:100]}...'")
-        print(f"   - Session ID: {request.session_id}")
-        print(f"   - Has context: {bool(request.context)}")
-        print(f"   - History length: {len(request.conversation_history) if request.conversation_history else 0}")
-
-        # Store session context if provided
-        if request.context and request.session_id:
-            session_data[request.session_id] = request.context
-            print(f"[DEBUG] Stored context for session {request.session_id}")
-
-        # Get session context
-        session_context = session_data.get(request.session_id, {})
+def build_enhanced_question(request: ChatRequest) -> str:
+    """Store any provided session context and fold it into the user's question"""
+    print(f"[DEBUG] Received chat request:")
+    print(f"   - Question: '{request.question[:100]}...'")
+    print(f"   - Session ID: {request.session_id}")
+    print(f"   - Has context: {bool(request.context)}")
+    print(f"   - History length: {len(request.conversation_history) if request.conversation_history else 0}")
+
+    # Store session context if provided
+    if request.context and request.session_id:
+        session_data[request.session_id] = request.context
+        print(f"[DEBUG] Stored context for session {request.session_id}")
+
+    # Get session context
+    session_context = session_data.get(request.session_id, {})
+    
+    # Build comprehensive context for resume analysis
+    enhanced_question = request.question
+    context_info = request.context or session_context
+    
+    if context_info:
+        print(f"[DEBUG] Context available - Job: {context_info.get('jobTitle', 'N/A')}")
+        print(f"[DEBUG] Has resume text: {bool(context_info.get('resumeText'))}")
+        print(f"[DEBUG] Has job description: {bool(context_info.get('jobDescription'))}")
         
-        # Build comprehensive context for resume analysis
-        enhanced_question = request.question
-        context_info = request.context or session_context
+        # Build comprehensive analysis context
+        context_parts = []
         
-        if context_info:
-            print(f"[DEBUG] Context available - Job: {context_info.get('jobTitle', 'N/A')}")
-            print(f"[DEBUG] Has resume text: {bool(context_info.get('resumeText'))}")
-            print(f"[DEBUG] Has job description: {bool(context_info.get('jobDescription'))}")
+        # Add job information
+        if context_info.get('jobTitle'):
+            context_parts.append(f"JOB TITLE: {context_info['jobTitle']}")
             
-            # Build comprehensive analysis context
-            context_parts = []
+        if context_info.get('jobDescription'):
+            job_desc = context_info['jobDescription']
+            # Truncate if too long but keep essential info
+            if len(job_desc) > 1000:
+                job_desc = job_desc[:1000] + "... [truncated]"
+            context_parts.append(f"JOB DESCRIPTION: {job_desc}")
             
-            # Add job information
-            if context_info.get('jobTitle'):
-                context_parts.append(f"JOB TITLE: {context_info['jobTitle']}")
-                
-            if context_info.get('jobDescription'):
-                job_desc = context_info['jobDescription']
-                # Truncate if too long but keep essential info
-                if len(job_desc) > 1000:
-                    job_desc = job_desc[:1000] + "... [truncated]"
-                context_parts.append(f"JOB DESCRIPTION: {job_desc}")
-                
-            if context_info.get('jobRequirements') and len(context_info['jobRequirements']) > 0:
-                requirements = ', '.join(context_info['jobRequirements'][:10])  # Limit to first 10
-                context_parts.append(f"JOB REQUIREMENTS: {requirements}")
+        if context_info.get('jobRequirements') and len(context_info['jobRequirements']) > 0:
+            requirements = ', '.join(context_info['jobRequirements'][:10])  # Limit to first 10
+            context_parts.append(f"JOB REQUIREMENTS: {requirements}")
+        
+        # Add resume information
+        if context_info.get('resumeText'):
+            resume_text = context_info['resumeText']
+            # Truncate if too long but keep essential info
+            if len(resume_text) > 2000:
+                resume_text = resume_text[:2000] + "... [truncated]"
+            context_parts.append(f"CANDIDATE'S RESUME CONTENT: {resume_text}")
+        elif context_info.get('resumePath'):
+            context_parts.append(f"RESUME PATH: {context_info['resumePath']}")
+        
+        # Add previous analysis if available
+        if context_info.get('analysisResult'):
+            analysis = context_info['analysisResult']
+            if len(analysis) > 800:
+                analysis = analysis[:800] + "... [truncated]"
+            context_parts.append(f"PREVIOUS ANALYSIS: {analysis}")
             
-            # Add resume information
-            if context_info.get('resumeText'):
-                resume_text = context_info['resumeText']
-                # Truncate if too long but keep essential info
-                if len(resume_text) > 2000:
-                    resume_text = resume_text[:2000] + "... [truncated]"
-                context_parts.append(f"CANDIDATE'S RESUME CONTENT: {resume_text}")
-            elif context_info.get('resumePath'):
-                context_parts.append(f"RESUME PATH: {context_info['resumePath']}")
+        if context_info.get('structuredAnalysis'):
+            struct_analysis = context_info['structuredAnalysis']
+            if isinstance(struct_analysis, dict):
+                # Extract key metrics
+                if struct_analysis.get('overallMatch'):
+                    match_info = struct_analysis['overallMatch']
+                    context_parts.append(f"MATCH SCORE: {match_info.get('score', 'N/A')}% - {match_info.get('level', 'N/A')}")
             
-            # Add previous analysis if available
-            if context_info.get('analysisResult'):
-                analysis = context_info['analysisResult']
-                if len(analysis) > 800:
-                    analysis = analysis[:800] + "... [truncated]"
-                context_parts.append(f"PREVIOUS ANALYSIS: {analysis}")
-                
-            if context_info.get('structuredAnalysis'):
-                struct_analysis = context_info['structuredAnalysis']
-                if isinstance(struct_analysis, dict):
-                    # Extract key metrics
-                    if struct_analysis.get('overallMatch'):
-                        match_info = struct_analysis['overallMatch']
-                        context_parts.append(f"MATCH SCORE: {match_info.get('score', 'N/A')}% - {match_info.get('level', 'N/A')}")
-                
-            if context_parts:
-                enhanced_question = f"""RESUME ANALYSIS CONTEXT:
+        if context_parts:
+            enhanced_question = f"""RESUME ANALYSIS CONTEXT:
 {chr(10).join(context_parts)}
 
 USER QUESTION: {request.question}
 
 Please provide a detailed, helpful response based on the resume and job information provided above. Focus on specific, actionable advice for improving the resume-job match."""
 
-        # Generate response using Gemini
-        response_text = call_gemini_api(enhanced_question, request.conversation_history)
+    return enhanced_question
+
+@app.post("/chat", response_model=ChatResponse)
+async def chat_with_resume_analyzer(request: ChatRequest):
+    """Chat endpoint for resume analysis discussions"""
+    try:
+        enhanced_question = build_enhanced_question(request)
+
+        # Generate response using Gemini (off the event loop, so concurrent duplicates can coalesce)
+        key = flight_key(enhanced_question, (request.conversation_history or [])[-5:])
+        response_text = await chat_flights.do(
+            key,
+            lambda: asyncio.to_thread(call_gemini_api, enhanced_question, request.conversation_history)
+        )
         
         print(f"[DEBUG] Generated response length: {len(response_text)} characters")
         
@@ -223,6 +245,41 @@ Please provide a detailed, helpful response based on the resume and job informat
             error=f"Failed to generate response: {str(e)}"
         )
 
+@app.post("/chat/stream")
+async def chat_with_resume_analyzer_stream(request: ChatRequest):
+    """
+    Stream a chat answer as server-sent events.
+    Emits one frame per Gemini chunk, then a 'done' frame with the same fields as /chat.
+    """
+    full_prompt = build_full_prompt(build_enhanced_question(request), request.conversation_history)
+
+    async def event_stream():
+        started = time.perf_counter()
+        parts = []
+        try:
+            response = await model.generate_content_async(full_prompt, stream=True)
+            async for chunk in response:
+                try:
+                    text = chunk.text
+                except ValueError:
+                    # Chunk without text parts (e.g. safety metadata only)
+                    continue
+                if text:
+                    parts.append(text)
+                    yield format_sse({"token": text})
+
+            response_text = "".join(parts) or "I apologize, but I'm unable to generate a response at the moment. Please try rephrasing your question or try again later."
+            yield format_sse({
+                "success": True,
+                "response": response_text,
+                "elapsed": round(time.perf_counter() - started, 3)
+            }, event="done")
+        except Exception as e:
+            print(f"❌ Streaming chat error: {type(e).__name__}: {str(e)}")
+            yield format_sse({"success": False, "error": f"Failed to generate response: {str(e)}"}, event="error")
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
 @app.post("/analyze")
 async def analyze_resume(request: dict):
     """Analysis endpoint - delegates to existing analysis logic or provides basic analysis"""
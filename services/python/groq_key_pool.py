@@ -0,0 +1,248 @@
+"""
+Groq API Key Pool for X-ceed Python Services
+Rate-limit aware scheduling of requests across multiple Groq API keys
+"""
+
+import asyncio
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+
+class KeyPoolExhausted(Exception):
+    """Raised when every key is cooling down for longer than the caller will wait"""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"All API keys rate limited. Retry in {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+@dataclass
+class KeyLease:
+    """A key handed out for one request"""
+    key: str
+    index: int
+    reserved_tokens: int
+
+
+@dataclass
+class _KeyState:
+    key: str
+    index: int
+    limit_requests: Optional[int] = None
+    limit_tokens: Optional[int] = None
+    remaining_requests: Optional[int] = None
+    remaining_tokens: Optional[int] = None
+    requests_reset_at: float = 0.0
+    tokens_reset_at: float = 0.0
+    cooldown_until: float = 0.0
+    in_flight: int = 0
+    reserved_tokens: int = 0
+    last_used: float = 0.0
+    total_requests: int = 0
+    total_rate_limited: int = 0
+    total_errors: int = 0
+    tokens_used: int = 0
+
+
+_DURATION_PART = re.compile(r'(\d+(?:\.\d+)?)(ms|h|m|s)')
+
+
+def parse_reset_duration(value: Optional[str]) -> Optional[float]:
+    """
+    Parse Groq reset headers such as '7.66s', '2m59.56s' or '120ms' into seconds
+    """
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+
+    units = {'h': 3600.0, 'm': 60.0, 's': 1.0, 'ms': 0.001}
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * units[unit] for amount, unit in parts)
+
+
+def _parse_int(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+class GroqKeyPool:
+    """
+    Schedules requests across API keys using the rate-limit budgets the
+    provider reports back.
+
+    Each key tracks its remaining request/token budget (from the
+    x-ratelimit-* response headers), tokens reserved by in-flight requests and
+    any retry-after cooldown from a 429. acquire() hands out the key with the
+    most headroom, so traffic spreads across keys instead of hammering one
+    until it fails.
+    """
+
+    def __init__(self, api_keys: List[str], max_wait: float = 10.0):
+        """
+        Initialize the pool
+
+        Args:
+            api_keys: Groq API keys
+            max_wait: Longest time acquire() waits for a cooling-down key before giving up
+        """
+        self.max_wait = max_wait
+        self._keys = [_KeyState(key=key, index=i) for i, key in enumerate(api_keys)]
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _headroom(self, state: _KeyState, now: float) -> float:
+        """Fraction of budget left on a key, after in-flight reservations"""
+        ratios = [1.0]
+
+        if state.limit_requests and now < state.requests_reset_at and state.remaining_requests is not None:
+            remaining = state.remaining_requests - state.in_flight
+            ratios.append(remaining / state.limit_requests)
+
+        if state.limit_tokens:
+            remaining_tokens = state.limit_tokens
+            if now < state.tokens_reset_at and state.remaining_tokens is not None:
+                remaining_tokens = state.remaining_tokens
+            ratios.append((remaining_tokens - state.reserved_tokens) / state.limit_tokens)
+
+        return min(ratios)
+
+    def _select(self, now: float) -> Optional[_KeyState]:
+        available = [s for s in self._keys if s.cooldown_until <= now]
+        if not available:
+            return None
+        # Most headroom first, then fewest in-flight, then least recently used
+        return max(
+            available,
+            key=lambda s: (self._headroom(s, now), -s.in_flight, -s.last_used)
+        )
+
+    async def acquire(self, estimated_tokens: int = 0) -> KeyLease:
+        """
+        Reserve the healthiest key for a request
+
+        Args:
+            estimated_tokens: Expected prompt + completion tokens for the request
+
+        Returns:
+            KeyLease to pass back to release() / mark_rate_limited()
+
+        Raises:
+            KeyPoolExhausted: Every key is cooling down longer than max_wait
+        """
+        if not self._keys:
+            raise KeyPoolExhausted(0.0)
+
+        deadline = time.monotonic() + self.max_wait
+        while True:
+            now = time.monotonic()
+            with self._lock:
+                state = self._select(now)
+                if state is not None:
+                    state.in_flight += 1
+                    state.reserved_tokens += estimated_tokens
+                    state.last_used = now
+                    state.total_requests += 1
+                    return KeyLease(key=state.key, index=state.index, reserved_tokens=estimated_tokens)
+                wait = min(s.cooldown_until for s in self._keys) - now
+
+            if now + wait > deadline:
+                raise KeyPoolExhausted(wait)
+            await asyncio.sleep(wait)
+
+    def _finish(self, lease: KeyLease) -> _KeyState:
+        state = self._keys[lease.index]
+        state.in_flight = max(0, state.in_flight - 1)
+        state.reserved_tokens = max(0, state.reserved_tokens - lease.reserved_tokens)
+        return state
+
+    def _apply_headers(self, state: _KeyState, headers: Optional[Dict[str, str]], now: float):
+        if not headers:
+            return
+        limit_requests = _parse_int(headers.get('x-ratelimit-limit-requests'))
+        limit_tokens = _parse_int(headers.get('x-ratelimit-limit-tokens'))
+        remaining_requests = _parse_int(headers.get('x-ratelimit-remaining-requests'))
+        remaining_tokens = _parse_int(headers.get('x-ratelimit-remaining-tokens'))
+        reset_requests = parse_reset_duration(headers.get('x-ratelimit-reset-requests'))
+        reset_tokens = parse_reset_duration(headers.get('x-ratelimit-reset-tokens'))
+
+        if limit_requests is not None:
+            state.limit_requests = limit_requests
+        if limit_tokens is not None:
+            state.limit_tokens = limit_tokens
+        if remaining_requests is not None:
+            state.remaining_requests = remaining_requests
+            state.requests_reset_at = now + (reset_requests or 60.0)
+        if remaining_tokens is not None:
+            state.remaining_tokens = remaining_tokens
+            state.tokens_reset_at = now + (reset_tokens or 60.0)
+
+    def release(self, lease: KeyLease, headers: Optional[Dict[str, str]] = None,
+                usage: Optional[Dict[str, Any]] = None, failed: bool = False):
+        """
+        Return a key after a request completes
+
+        Args:
+            lease: Lease from acquire()
+            headers: Lower-cased response headers, used to refresh the key's budget
+            usage: Provider usage block (total_tokens is recorded)
+            failed: The request failed for a reason other than rate limiting
+        """
+        now = time.monotonic()
+        with self._lock:
+            state = self._finish(lease)
+            self._apply_headers(state, headers, now)
+            if usage:
+                state.tokens_used += int(usage.get('total_tokens', 0) or 0)
+            if failed:
+                state.total_errors += 1
+
+    def mark_rate_limited(self, lease: KeyLease, retry_after: Optional[float] = None,
+                          headers: Optional[Dict[str, str]] = None):
+        """
+        Put a key into cooldown after a 429
+
+        Args:
+            lease: Lease from acquire()
+            retry_after: Seconds from the retry-after header
+            headers: Lower-cased response headers
+        """
+        now = time.monotonic()
+        with self._lock:
+            state = self._finish(lease)
+            self._apply_headers(state, headers, now)
+            state.total_rate_limited += 1
+            if retry_after is None:
+                retry_after = parse_reset_duration((headers or {}).get('x-ratelimit-reset-tokens')) or 5.0
+            state.cooldown_until = max(state.cooldown_until, now + retry_after)
+
+    def metrics(self) -> List[Dict[str, Any]]:
+        """Per-key utilisation, safe to expose (keys are masked)"""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                {
+                    "key": f"#{s.index + 1} (...{s.key[-4:]})",
+                    "headroom": round(max(0.0, self._headroom(s, now)), 3),
+                    "remaining_requests": s.remaining_requests,
+                    "remaining_tokens": s.remaining_tokens,
+                    "in_flight": s.in_flight,
+                    "cooldown_seconds": round(max(0.0, s.cooldown_until - now), 1),
+                    "total_requests": s.total_requests,
+                    "rate_limited": s.total_rate_limited,
+                    "errors": s.total_errors,
+                    "tokens_used": s.tokens_used
+                }
+                for s in self._keys
+            ]
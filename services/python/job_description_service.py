@@ -1,14 +1,17 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException, Form
+from fastapi import FastAPI, File, UploadFile, HTTPException, Form, Request
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from pymongo import MongoClient
-import pdfplumber
-import requests
+import asyncio
 import os
+import tempfile
 from datetime import datetime
+from typing import Tuple
 from dotenv import load_dotenv
-import google.generativeai as genai
-import traceback
+from multipart.multipart import MultipartParser, parse_options_header
+from document_extraction import get_extraction_engine
+from llm_client import LLMClientError
+from llm_gateway import LLMGateway, providers_from_env
 
 # Load environment variables from .env.local and .env files
 load_dotenv('../../.env.local')  # Load from root directory
@@ -61,6 +64,33 @@ OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY", "")
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
 MISTRAL_MODEL = "mistralai/mistral-7b-instruct:free"
 
+# Interview questions go through the LLM gateway: the fastest healthy provider answers, and a
+# backup provider is raced once the current one runs past its usual (p95) latency
+LLM_REQUEST_TIMEOUT = float(os.getenv("LLM_REQUEST_TIMEOUT", "20"))
+llm_gateway = LLMGateway(
+    providers_from_env(
+        os.getenv("QUESTION_LLM_PROVIDERS", "openrouter,gemini").split(","),
+        models={"openrouter": MISTRAL_MODEL},
+        timeout=LLM_REQUEST_TIMEOUT,
+        title="X-Ceed Mock Interview"
+    ),
+    timeout=LLM_REQUEST_TIMEOUT,
+    hedge=os.getenv("LLM_HEDGE_REQUESTS", "true").lower() != "false",
+    hedge_delay=float(os.getenv("LLM_HEDGE_DELAY", "2.0"))
+)
+
+@app.on_event("shutdown")
+async def close_llm_gateway():
+    """Release pooled provider connections"""
+    await llm_gateway.aclose()
+
+# Upload limits for /parse-job-description
+JD_MAX_UPLOAD_BYTES = int(os.getenv("JD_MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+JD_MAX_PAGES = int(os.getenv("JD_MAX_PAGES", "20"))
+JD_MAX_CHARS = int(os.getenv("JD_MAX_CHARS", "100000"))
+# Room for the multipart boundaries and part headers around the file itself
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
 # Debug endpoint to check environment variables
 @app.get("/debug/env")
 async def debug_env():
@@ -78,23 +108,123 @@ async def debug_env():
 async def test_endpoint():
     return {"status": "working", "message": "Test endpoint is responding"}
 
+async def spool_upload(request: Request, field: str, max_bytes: int) -> Tuple[str, str, str]:
+    """
+    Stream one file field of a multipart request straight to a temp file.
+    
+    The request is rejected with 413 up front when its Content-Length is too
+    large, and otherwise as soon as the body read so far passes the limit, so
+    an oversized upload is never buffered in full.
+    
+    Returns:
+        (path, filename, content_type) of the spooled file
+    """
+    max_body = max_bytes + MULTIPART_OVERHEAD_BYTES
+    too_large = HTTPException(status_code=413, detail=f"File too large (limit {max_bytes} bytes)")
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > max_body:
+        raise too_large
+    
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    boundary = params.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise HTTPException(status_code=400, detail="Expected a multipart/form-data upload")
+    
+    spool = tempfile.NamedTemporaryFile(prefix="jd_upload_", suffix=".bin", delete=False)
+    part = {"headers": {}, "field": b"", "value": b"", "target": False}
+    found = {"filename": "", "content_type": None, "size": 0}
+    
+    def on_part_begin():
+        part.update(headers={}, field=b"", value=b"", target=False)
+    
+    def on_header_field(data, start, end):
+        part["field"] += data[start:end]
+    
+    def on_header_value(data, start, end):
+        part["value"] += data[start:end]
+    
+    def on_header_end():
+        part["headers"][part["field"].lower()] = part["value"]
+        part["field"] = part["value"] = b""
+    
+    def on_headers_finished():
+        _, disposition = parse_options_header(part["headers"].get(b"content-disposition", b""))
+        if disposition.get(b"name", b"").decode("latin-1") == field and found["content_type"] is None:
+            part["target"] = True
+            found["filename"] = disposition.get(b"filename", b"").decode("utf-8", "replace")
+            found["content_type"] = parse_options_header(part["headers"].get(b"content-type", b""))[0].decode("latin-1")
+    
+    def on_part_data(data, start, end):
+        if part["target"]:
+            found["size"] += end - start
+            if found["size"] > max_bytes:
+                raise too_large
+            spool.write(data[start:end])
+    
+    parser = MultipartParser(boundary, {
+        "on_part_begin": on_part_begin,
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": on_part_data
+    })
+    
+    try:
+        received = 0
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > max_body:
+                raise too_large
+            parser.write(chunk)
+        parser.finalize()
+        if found["content_type"] is None:
+            raise HTTPException(status_code=400, detail=f"Missing file field '{field}'")
+        spool.close()
+    except BaseException:
+        spool.close()
+        os.unlink(spool.name)
+        raise
+    return spool.name, found["filename"], found["content_type"]
+
 # 1. File parsing endpoint
 @app.post("/parse-job-description")
-async def parse_job_description(file: UploadFile = File(...)):
-    if file.content_type == "application/pdf":
-        try:
-            file.file.seek(0)
-            with pdfplumber.open(file.file) as pdf:
-                text = "\n".join(page.extract_text() or "" for page in pdf.pages)
-        except Exception as e:
-            raise HTTPException(status_code=400, detail=f"PDF parsing failed: {e}")
-    elif file.content_type == "text/plain":
-        text = (await file.read()).decode("utf-8")
-    else:
-        raise HTTPException(status_code=400, detail="Unsupported file type")
+async def parse_job_description(request: Request):
+    # The multipart body is streamed to disk by hand (rather than File(...)) so the size limit
+    # applies while reading; parsing then runs in the extraction pool off the event loop
+    spool_path, filename, content_type = await spool_upload(request, "file", JD_MAX_UPLOAD_BYTES)
+    try:
+        if content_type == "application/pdf":
+            file_type = "pdf"
+        elif content_type == "text/plain":
+            file_type = "txt"
+        else:
+            raise HTTPException(status_code=400, detail="Unsupported file type")
+        
+        result = await get_extraction_engine().extract_async(
+            spool_path,
+            file_type,
+            max_pages=JD_MAX_PAGES,
+            max_chars=JD_MAX_CHARS,
+            pdf_backend="pdfplumber"
+        )
+    finally:
+        os.unlink(spool_path)
+    
+    if not result.ok:
+        label = "PDF parsing" if file_type == "pdf" else "Text decoding"
+        raise HTTPException(status_code=400, detail=f"{label} failed: {result.error}")
+    text = result.text("\n")
     if not text.strip():
         raise HTTPException(status_code=400, detail="No text extracted from file")
-    return {"success": True, "text": text, "filename": file.filename}
+    return {
+        "success": True,
+        "text": text,
+        "filename": filename,
+        "truncated": result.truncated,
+        "pages_read": result.pages_read,
+        "total_pages": result.total_pages
+    }
 
 # 2. Generate interview question
 class QuestionRequest(BaseModel):
@@ -123,61 +253,23 @@ Instructions:
 Generate the question:
 """
     
-    # Try OpenRouter first
-    if OPENROUTER_API_KEY:
-        print("[INFO] Trying OpenRouter API...")
-        try:
-            response = requests.post(
-                "https://openrouter.ai/api/v1/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {OPENROUTER_API_KEY}",
-                    "Content-Type": "application/json",
-                    "HTTP-Referer": "http://localhost:3002",
-                    "X-Title": "X-Ceed Mock Interview",
-                },
-                json={
-                    "model": "mistralai/mistral-7b-instruct:free",
-                    "messages": [
-                        {"role": "system", "content": "You are an expert interviewer."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    "max_tokens": 200,
-                    "temperature": 0.7
-                }
-            )
-            
-            print(f"[INFO] OpenRouter response status: {response.status_code}")
-            if response.status_code == 200:
-                data = response.json()
-                if "choices" in data and len(data["choices"]) > 0:
-                    question = data["choices"][0]["message"]["content"].strip()
-                    print(f"[SUCCESS] OpenRouter generated question: {question}")
-                    return {"question": question}
-                else:
-                    print(f"[WARN] OpenRouter unexpected response format: {data}")
-            else:
-                print(f"[ERROR] OpenRouter API Error: {response.status_code} - {response.text}")
-        except Exception as e:
-            print(f"[ERROR] OpenRouter API Exception: {str(e)}")
-            print(f"[ERROR] OpenRouter Exception traceback: {traceback.format_exc()}")
-    
-    # Try Gemini as backup
-    if GEMINI_API_KEY:
-        print("[INFO] Trying Gemini API...")
+    messages = [
+        {"role": "system", "content": "You are an expert interviewer."},
+        {"role": "user", "content": prompt}
+    ]
+    
+    if llm_gateway:
+        print(f"[INFO] Requesting question via LLM gateway (order: {', '.join(p.name for p in llm_gateway.ranked_providers())})")
         try:
-            genai.configure(api_key=GEMINI_API_KEY)
-            model = genai.GenerativeModel('gemini-1.5-flash')
-            
-            response = model.generate_content(prompt)
-            if response.text:
-                question = response.text.strip()
-                print(f"[SUCCESS] Gemini generated question: {question}")
+            result = await llm_gateway.complete(messages, temperature=0.7, max_tokens=200)
+            question = result.content.strip()
+            if question:
+                print(f"[SUCCESS] {result.provider} generated question in {result.elapsed:.2f}s"
+                      f"{' (hedged)' if result.hedged else ''}: {question}")
                 return {"question": question}
-            else:
-                print("[WARN] Gemini returned empty response")
-        except Exception as e:
-            print(f"[ERROR] Gemini API Exception: {str(e)}")
-            print(f"[ERROR] Gemini Exception traceback: {traceback.format_exc()}")
+            print(f"[WARN] {result.provider} returned an empty question")
+        except LLMClientError as e:
+            print(f"[ERROR] LLM gateway failed: {str(e)} {getattr(e, 'errors', '')}")
     
     # Fallback to predefined question
     print("[INFO] Using fallback question")
@@ -193,6 +285,7 @@ class AnalysisRequest(BaseModel):
 
 @app.post("/analyze-answers")
 async def analyze_answers(req: AnalysisRequest):
+    transcript = "\n".join(f"Q: {q}\nA: {a}" for q, a in zip(req.questions, req.answers))
     prompt = f"""
 You are an expert interview coach. Analyze the following mock interview and provide detailed feedback.
 
@@ -200,7 +293,7 @@ Job Description:
 {req.job_description}
 
 Questions and Answers:
-{chr(10).join([f'Q: {q}\nA: {a}' for q, a in zip(req.questions, req.answers)])}
+{transcript}
 
 Please provide a JSON with:
 - score (overall, communication, technical, confidence)
@@ -208,24 +301,22 @@ Please provide a JSON with:
 - improvements
 - recommendations
 """
-    response = requests.post(
-        "https://openrouter.ai/api/v1/chat/completions",
-        headers={
-            "Authorization": f"Bearer {OPENROUTER_API_KEY}",
-            "Content-Type": "application/json",
-        },
-        json={
-            "model": MISTRAL_MODEL,
-            "messages": [
-                {"role": "system", "content": "You are an expert interview analyst."},
-                {"role": "user", "content": prompt}
-            ],
-            "max_tokens": 1000,
-            "temperature": 0.3
-        }
-    )
-    data = response.json()
-    analysis = data["choices"][0]["message"]["content"].strip()
+    if not llm_gateway:
+        raise HTTPException(status_code=503, detail="No LLM provider configured")
+    
+    messages = [
+        {"role": "system", "content": "You are an expert interview analyst."},
+        {"role": "user", "content": prompt}
+    ]
+    try:
+        result = await llm_gateway.complete(messages, temperature=0.3, max_tokens=1000)
+    except LLMClientError as e:
+        print(f"[ERROR] LLM gateway failed: {str(e)} {getattr(e, 'errors', '')}")
+        raise HTTPException(status_code=502, detail="Interview analysis failed, please try again")
+    analysis = result.content.strip()
+    print(f"[SUCCESS] {result.provider} analyzed answers in {result.elapsed:.2f}s"
+          f"{' (hedged)' if result.hedged else ''}")
+    
     # Store in MongoDB
     doc = {
         "userId": req.user_id,
@@ -235,13 +326,17 @@ Please provide a JSON with:
         "analysis": analysis,
         "createdAt": datetime.utcnow()
     }
-    collection.insert_one(doc)
+    await asyncio.to_thread(collection.insert_one, doc)
     return {"analysis": analysis, "success": True}
 
 # Health check endpoint
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "service": "Job Description & Mock Interview Service"}
+    return {
+        "status": "healthy",
+        "service": "Job Description & Mock Interview Service",
+        "llm_gateway": llm_gateway.stats()
+    }
 
 @app.get("/")
 async def root():
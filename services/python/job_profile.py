@@ -0,0 +1,169 @@
+"""
+Job Profile Cache for X-ceed Python Services
+Job requirements, prompt prefix and JD embedding compiled once per job version and reused across candidates
+"""
+
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, FrozenSet, Optional, Pattern, Tuple
+
+import numpy as np
+
+_YEARS_RANGE = re.compile(r'(\d+)\s*(?:-|–|to)\s*(\d+)\s*\+?\s*(?:years?|yrs?)', re.IGNORECASE)
+_YEARS_MIN = re.compile(r'(\d+)\s*\+?\s*(?:years?|yrs?)', re.IGNORECASE)
+_RESUME_YEARS = re.compile(r'(\d+)\s*\+?\s*(?:years?|yrs?)\s*(?:of\s+)?(?:\w+\s+)?(?:experience|exp)\b', re.IGNORECASE)
+
+
+def job_content_hash(description: str, requirements: Dict[str, Any]) -> str:
+    """
+    Hash of everything a job profile is compiled from
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    payload = {"description": description or "", "requirements": requirements}
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def parse_experience_bounds(*texts: str) -> Tuple[Optional[int], Optional[int]]:
+    """
+    Read a years-of-experience range such as "3-5 years" or "5+ years"
+
+    Args:
+        texts: Candidates in order of preference (e.g. the experience level, then the description)
+
+    Returns:
+        (min_years, max_years); max_years is None for open ranges, both None if nothing is found
+    """
+    for text in texts:
+        if not text:
+            continue
+        found = _YEARS_RANGE.search(text)
+        if found:
+            low, high = sorted((int(found.group(1)), int(found.group(2))))
+            return low, high
+        found = _YEARS_MIN.search(text)
+        if found:
+            return int(found.group(1)), None
+    return None, None
+
+
+def parse_resume_years(text: str) -> Optional[int]:
+    """
+    Read the years of experience a resume claims, e.g. "6 years of experience"
+
+    Returns:
+        The largest figure stated, or None if the resume states none
+    """
+    years = [int(found) for found in _RESUME_YEARS.findall(text or '')]
+    return max(years) if years else None
+
+
+def skill_pattern(skill: str) -> Pattern:
+    """
+    Whole-word pattern for a skill. "+" and "#" count as word characters, so
+    "java" does not match "javascript" and "c" does not match "c++" or "c#".
+    """
+    return re.compile(r'(?<![\w+#])' + re.escape(skill) + r'(?![\w+#])', re.IGNORECASE)
+
+
+@dataclass
+class JobProfile:
+    """Everything about a job that stays the same for every candidate scored against it"""
+    job_id: Optional[str]
+    content_hash: str
+    description: str
+    requirements: Dict[str, Any]
+    skills: FrozenSet[str]
+    min_years: Optional[int]
+    max_years: Optional[int]
+    prompt_prefix: str
+    resume_query: str
+    job_text: Any = None
+    _embedding: Optional[np.ndarray] = field(default=None, repr=False)
+    _embedding_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def embedding(self, embeddings) -> Optional[np.ndarray]:
+        """
+        Unit-normalised embedding of the job description, computed on first use
+
+        Args:
+            embeddings: Object with embed_query(text) -> vector
+        """
+        with self._embedding_lock:
+            if self._embedding is None and self.description.strip():
+                vector = np.asarray(embeddings.embed_query(self.description), dtype=np.float32)
+                self._embedding = vector / max(float(np.linalg.norm(vector)), 1e-12)
+            return self._embedding
+
+
+class JobProfileCache:
+    """
+    Compiled job profiles keyed by job id and content hash.
+
+    Only the latest version of each job id is kept: editing a job replaces
+    its profile on the next lookup. Jobs without an id are keyed by content
+    alone. The least recently used profiles are evicted beyond max_entries.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Profiles kept in memory
+        """
+        self.max_entries = max_entries
+        self._profiles: "OrderedDict[str, JobProfile]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, job_id: Optional[str], description: str, requirements: Dict[str, Any],
+            build: Callable[[Optional[str], str, str, Dict[str, Any]], JobProfile]) -> JobProfile:
+        """
+        Return the profile for this job version, building it on first use
+
+        Args:
+            job_id: Job identifier, or None
+            description: Job description text
+            requirements: Prepared job requirements
+            build: Called as build(job_id, content_hash, description, requirements) on a miss
+        """
+        content_hash = job_content_hash(description, requirements)
+        slot = f"id:{job_id}" if job_id else f"hash:{content_hash}"
+        with self._lock:
+            profile = self._profiles.get(slot)
+            if profile is not None and profile.content_hash == content_hash:
+                self._profiles.move_to_end(slot)
+                self.hits += 1
+                return profile
+            self.misses += 1
+
+        profile = build(job_id, content_hash, description, requirements)
+        with self._lock:
+            self._profiles[slot] = profile
+            self._profiles.move_to_end(slot)
+            while len(self._profiles) > self.max_entries:
+                self._profiles.popitem(last=False)
+        return profile
+
+    def __len__(self) -> int:
+        return len(self._profiles)
+
+    def clear(self):
+        with self._lock:
+            self._profiles.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "profiles": len(self._profiles),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses
+        }
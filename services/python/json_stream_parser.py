@@ -0,0 +1,322 @@
+"""
+Streaming JSON Parser for X-ceed Python Services
+Incremental, repairing parser for JSON objects produced by LLMs
+"""
+
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
+
+_STRING_SPECIAL = re.compile(r'["\\]')
+_TRAILING_COMMA = re.compile(r',\s*$')
+
+SchemaType = Union[Type, Tuple[Type, ...]]
+
+
+def strip_trailing_commas(text: str) -> str:
+    """Remove commas directly before a closing bracket, ignoring string contents"""
+    out: List[str] = []
+    in_string = False
+    escape = False
+    for ch in text:
+        if in_string:
+            out.append(ch)
+            if escape:
+                escape = False
+            elif ch == '\\':
+                escape = True
+            elif ch == '"':
+                in_string = False
+            continue
+        if ch in '}]':
+            while out and out[-1].isspace():
+                out.pop()
+            if out and out[-1] == ',':
+                out.pop()
+        elif ch == '"':
+            in_string = True
+        out.append(ch)
+    return ''.join(out)
+
+
+def _loads(raw: str) -> Any:
+    """json.loads that accepts raw newlines in strings and trailing commas"""
+    try:
+        return json.loads(raw, strict=False)
+    except json.JSONDecodeError:
+        return json.loads(strip_trailing_commas(raw), strict=False)
+
+
+def _closers(stack: str) -> str:
+    return ''.join('}' if ch == '{' else ']' for ch in reversed(stack))
+
+
+class StreamingJSONParser:
+    """
+    Parses a JSON document from LLM output as it arrives.
+
+    Text before the first opening bracket (prose, a ```json fence) and after
+    the root closes is ignored. Each top-level member of the root object is
+    decoded as soon as its value closes, so callers can act on e.g.
+    "overallMatch" while later sections are still generating. close()
+    returns the whole document, repairing output that was cut off: an open
+    string is closed, an incomplete trailing member is dropped and open
+    brackets are closed. Trailing commas and raw newlines inside strings are
+    accepted.
+    """
+
+    def __init__(self, schema: Optional[Dict[str, SchemaType]] = None, expect: str = '{'):
+        """
+        Initialize the parser
+
+        Args:
+            schema: Expected top-level keys mapped to their type(s); members whose
+                value has the wrong type are reported in `invalid` instead of emitted
+            expect: Root bracket, '{' for an object or '[' for an array
+        """
+        self.schema = schema or {}
+        self.expect = expect
+        self.sections: Dict[str, Any] = {}
+        self.invalid: Dict[str, str] = {}
+        self.done = False
+        self.repaired = False
+
+        self._text = ""
+        self._pos = 0
+        self._start: Optional[int] = None
+        self._end: Optional[int] = None
+        self._stack: List[str] = []
+        self._states: List[str] = []
+        self._in_string = False
+        self._string_start = 0
+        self._string_is_key = False
+        self._scalar_start: Optional[int] = None
+        self._member_key: Optional[str] = None
+        self._member_start: Optional[int] = None
+        self._safe_end: Optional[int] = None
+        self._safe_stack = ""
+        self._emitted: List[Tuple[str, Any]] = []
+
+    @property
+    def missing_keys(self) -> List[str]:
+        """Schema keys that have not been emitted"""
+        return [key for key in self.schema if key not in self.sections]
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """
+        Add streamed text
+
+        Returns:
+            (key, value) for each top-level member completed by this chunk
+        """
+        if self.done or not chunk:
+            return []
+        self._text += chunk
+        self._emitted = []
+        self._scan()
+        return self._emitted
+
+    def close(self) -> Optional[Any]:
+        """
+        Finish parsing
+
+        Returns:
+            The decoded (and if necessary repaired) document, or None if the
+            text contained no usable JSON
+        """
+        if self._start is None:
+            return None
+        if self.done:
+            try:
+                return _loads(self._text[self._start:self._end])
+            except json.JSONDecodeError:
+                return None
+
+        self.repaired = True
+        self._emitted = []
+        attempts = []
+        if self._in_string and not self._string_is_key:
+            # Keep the partial string value rather than dropping the whole member
+            partial = self._text[self._start:]
+            backslashes = len(partial) - len(partial.rstrip('\\'))
+            if backslashes % 2:
+                partial = partial[:-1]
+            attempts.append(partial + '"' + _closers(''.join(self._stack)))
+        if self._safe_end is not None:
+            head = _TRAILING_COMMA.sub('', self._text[self._start:self._safe_end].rstrip())
+            attempts.append(head + _closers(self._safe_stack))
+
+        for candidate in attempts:
+            try:
+                value = _loads(candidate)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(value, dict):
+                for key, member in value.items():
+                    if key not in self.sections and key not in self.invalid:
+                        self._accept(key, member)
+            return value
+        return None
+
+    def _scan(self):
+        text = self._text
+        size = len(text)
+        i = self._pos
+        while i < size and not self.done:
+            if self._in_string:
+                found = _STRING_SPECIAL.search(text, i)
+                if found is None:
+                    i = size
+                    break
+                i = found.start()
+                if text[i] == '\\':
+                    if i + 1 >= size:
+                        # Escape split across chunks: rescan it with the next chunk
+                        break
+                    i += 2
+                    continue
+                self._in_string = False
+                self._string_done(i + 1)
+                i += 1
+                continue
+
+            ch = text[i]
+            if self._start is None:
+                if ch == self.expect:
+                    self._start = i
+                    self._open(ch, i)
+                i += 1
+                continue
+
+            if self._scalar_start is not None and (ch.isspace() or ch in ',]}'):
+                self._value_done(i)
+
+            if ch.isspace():
+                pass
+            elif ch == '"':
+                self._in_string = True
+                self._string_start = i
+                self._string_is_key = bool(self._stack) and self._stack[-1] == '{' and self._states[-1] == 'key'
+                if not self._string_is_key:
+                    self._value_start(i)
+            elif ch in '{[':
+                self._value_start(i)
+                self._open(ch, i)
+            elif ch in '}]':
+                self._stack.pop()
+                self._states.pop()
+                if not self._stack:
+                    self.done = True
+                    self._end = i + 1
+                else:
+                    self._value_done(i + 1)
+            elif ch == ':':
+                if self._states:
+                    self._states[-1] = 'value'
+            elif ch == ',':
+                if self._states:
+                    self._states[-1] = 'key' if self._stack[-1] == '{' else 'value'
+            elif self._scalar_start is None:
+                self._value_start(i)
+                self._scalar_start = i
+            i += 1
+        self._pos = i
+
+    def _open(self, ch: str, i: int):
+        self._stack.append(ch)
+        self._states.append('key' if ch == '{' else 'value')
+        self._safe_end = i + 1
+        self._safe_stack = ''.join(self._stack)
+
+    def _value_start(self, i: int):
+        if len(self._stack) == 1 and self._stack[0] == '{' and self._member_key is not None:
+            self._member_start = i
+
+    def _string_done(self, end: int):
+        if self._string_is_key:
+            if len(self._stack) == 1:
+                try:
+                    self._member_key = _loads(self._text[self._string_start:end])
+                except json.JSONDecodeError:
+                    self._member_key = None
+            self._states[-1] = 'colon'
+        else:
+            self._value_done(end)
+
+    def _value_done(self, end: int):
+        self._scalar_start = None
+        if self._states:
+            self._states[-1] = 'comma'
+        self._safe_end = end
+        self._safe_stack = ''.join(self._stack)
+
+        if len(self._stack) == 1 and self._member_key is not None and self._member_start is not None:
+            key, raw = self._member_key, self._text[self._member_start:end]
+            self._member_key = None
+            self._member_start = None
+            try:
+                self._accept(key, _loads(raw))
+            except json.JSONDecodeError as e:
+                self.invalid[key] = f"Invalid JSON: {e.msg}"
+
+    def _accept(self, key: str, value: Any):
+        expected = self.schema.get(key)
+        if expected is not None and not isinstance(value, expected):
+            self.invalid[key] = f"Expected {getattr(expected, '__name__', expected)}, got {type(value).__name__}"
+            return
+        self.sections[key] = value
+        self._emitted.append((key, value))
+
+
+def parse_llm_json(text: str, default: Any = None, expect: str = '{') -> Any:
+    """
+    Decode the JSON document in an LLM completion (fences, prose and truncation tolerated)
+
+    Args:
+        text: Completion text
+        default: Returned when no JSON can be recovered
+        expect: Root bracket, '{' or '['
+    """
+    return parse_llm_json_with_repair(text, default, expect)[0]
+
+
+def parse_llm_json_with_repair(text: str, default: Any = None, expect: str = '{') -> Tuple[Any, bool]:
+    """
+    parse_llm_json that also reports whether truncated output had to be repaired
+
+    Returns:
+        (value, repaired)
+    """
+    parser = StreamingJSONParser(expect=expect)
+    parser.feed(text or "")
+    value = parser.close()
+    return (default if value is None else value), parser.repaired
+
+
+def missing_keys(value: Any, required: Tuple[str, ...]) -> List[str]:
+    """
+    Required keys absent from a parsed object
+
+    Returns:
+        The missing keys; all of them when value is not a dict
+    """
+    if not isinstance(value, dict):
+        return list(required)
+    return [key for key in required if key not in value]
+
+
+def complete_items(items: Any, required: Tuple[str, ...] = ()) -> List[Dict[str, Any]]:
+    """
+    Objects in a parsed list, without a cut-off trailing item
+
+    Repairing truncated output can leave the last item of a list with only its
+    first few keys; pass the keys such an item would lack to drop it. Earlier
+    items are complete and kept as they are. Anything that is not an object is
+    always dropped.
+    """
+    if not isinstance(items, list):
+        return []
+    objects = [item for item in items if isinstance(item, dict)]
+    if objects and missing_keys(objects[-1], required):
+        objects.pop()
+    return objects
@@ -0,0 +1,302 @@
+"""
+Async LLM Client for X-ceed Python Services
+Pooled, non-blocking client for OpenAI-compatible chat completion APIs (Groq, OpenRouter)
+"""
+
+import asyncio
+import json
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import httpx
+
+
+class LLMClientError(Exception):
+    """Raised when a chat completion request fails"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None,
+                 headers: Optional[Dict[str, str]] = None, body: str = ""):
+        super().__init__(message)
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.body = body
+
+
+class LLMRateLimitError(LLMClientError):
+    """Raised when the provider answers with HTTP 429"""
+
+    @property
+    def retry_after(self) -> Optional[float]:
+        value = self.headers.get("retry-after")
+        try:
+            return float(value) if value is not None else None
+        except ValueError:
+            return None
+
+
+class LLMTimeoutError(LLMClientError):
+    """Raised when a request exceeds its deadline"""
+
+
+@dataclass
+class LLMResponse:
+    """Parsed chat completion response"""
+    content: str
+    status_code: int
+    model: str
+    elapsed: float
+    headers: Dict[str, str] = field(default_factory=dict)
+    usage: Dict[str, Any] = field(default_factory=dict)
+
+
+class LLMStream:
+    """
+    Server-sent event stream of a chat completion.
+
+    Iterating yields content deltas as they arrive; the accumulated text and
+    any usage block reported in the final chunk are available afterwards.
+    """
+
+    def __init__(self, response: httpx.Response, started: float):
+        self.status_code = response.status_code
+        self.headers = {k.lower(): v for k, v in response.headers.items()}
+        self.usage: Dict[str, Any] = {}
+        self.first_token_latency: Optional[float] = None
+        self._response = response
+        self._started = started
+        self._parts: List[str] = []
+
+    @property
+    def content(self) -> str:
+        return "".join(self._parts)
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        async for line in self._response.aiter_lines():
+            if not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if data == "[DONE]":
+                break
+            try:
+                chunk = json.loads(data)
+            except json.JSONDecodeError:
+                continue
+
+            usage = chunk.get("usage") or chunk.get("x_groq", {}).get("usage")
+            if usage:
+                self.usage = usage
+
+            for choice in chunk.get("choices", []):
+                delta = choice.get("delta", {}).get("content")
+                if delta:
+                    if self.first_token_latency is None:
+                        self.first_token_latency = time.perf_counter() - self._started
+                    self._parts.append(delta)
+                    yield delta
+
+
+class AsyncLLMClient:
+    """
+    Shared async client for an OpenAI-compatible chat completions endpoint.
+
+    One instance should be created per provider and reused for the lifetime of
+    the process so that TCP/TLS connections are kept alive between requests.
+    Concurrency is bounded by a semaphore and every request has a deadline that
+    covers both the wait for a slot and the HTTP round trip.
+    """
+
+    def __init__(self, api_url: str, max_concurrency: int = 32, max_connections: int = 64,
+                 max_keepalive_connections: int = 32, timeout: float = 30.0,
+                 connect_timeout: float = 5.0, default_headers: Optional[Dict[str, str]] = None):
+        """
+        Initialize the client
+
+        Args:
+            api_url: Full URL of the chat completions endpoint
+            max_concurrency: Maximum number of in-flight requests
+            max_connections: Connection pool size
+            max_keepalive_connections: Idle connections kept open for reuse
+            timeout: Default per-request deadline in seconds
+            connect_timeout: TCP/TLS connect timeout in seconds
+            default_headers: Headers sent with every request
+        """
+        self.api_url = api_url
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections
+        )
+        self._timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self._default_headers = default_headers or {}
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._in_flight = 0
+        self._total_requests = 0
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Create the underlying connection pool on first use"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                limits=self._limits,
+                timeout=self._timeout,
+                headers=self._default_headers
+            )
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    async def chat_completion(self, api_key: str, messages: List[Dict[str, str]], model: str,
+                              temperature: float = 0.1, max_tokens: int = 4000,
+                              deadline: Optional[float] = None,
+                              extra_headers: Optional[Dict[str, str]] = None) -> LLMResponse:
+        """
+        Send a chat completion request
+
+        Args:
+            api_key: Bearer token for the provider
+            messages: Chat messages in OpenAI format
+            model: Model name
+            temperature: Sampling temperature
+            max_tokens: Maximum completion tokens
+            deadline: Seconds before the request is abandoned (defaults to client timeout)
+            extra_headers: Additional request headers
+
+        Returns:
+            LLMResponse with the first choice's content
+
+        Raises:
+            LLMRateLimitError: Provider returned HTTP 429
+            LLMTimeoutError: Deadline exceeded
+            LLMClientError: Any other failure
+        """
+        payload = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens
+        }
+        headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+            **(extra_headers or {})
+        }
+
+        try:
+            return await asyncio.wait_for(
+                self._send(payload, headers, model),
+                timeout=deadline or self.timeout
+            )
+        except asyncio.TimeoutError:
+            raise LLMTimeoutError(f"Request to {self.api_url} exceeded deadline")
+
+    async def _send(self, payload: Dict[str, Any], headers: Dict[str, str], model: str) -> LLMResponse:
+        """Acquire a concurrency slot and perform the HTTP request"""
+        client = self._get_client()
+        async with self._semaphore:
+            self._in_flight += 1
+            self._total_requests += 1
+            started = time.perf_counter()
+            try:
+                response = await client.post(self.api_url, json=payload, headers=headers)
+            except httpx.TimeoutException as e:
+                raise LLMTimeoutError(f"Request timed out: {e}")
+            except httpx.HTTPError as e:
+                raise LLMClientError(f"Request failed: {e}")
+            finally:
+                self._in_flight -= 1
+            elapsed = time.perf_counter() - started
+
+        response_headers = {k.lower(): v for k, v in response.headers.items()}
+
+        if response.status_code == 429:
+            raise LLMRateLimitError("Rate limit exceeded", status_code=429,
+                                    headers=response_headers, body=response.text)
+        if response.status_code != 200:
+            raise LLMClientError(f"HTTP {response.status_code}", status_code=response.status_code,
+                                 headers=response_headers, body=response.text)
+
+        try:
+            result = response.json()
+            content = result["choices"][0]["message"]["content"]
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            raise LLMClientError(f"Invalid response format: {e!r}", status_code=response.status_code,
+                                 headers=response_headers, body=response.text)
+
+        return LLMResponse(
+            content=content,
+            status_code=response.status_code,
+            model=result.get("model", model),
+            elapsed=elapsed,
+            headers=response_headers,
+            usage=result.get("usage") or {}
+        )
+
+    @asynccontextmanager
+    async def stream_chat_completion(self, api_key: str, messages: List[Dict[str, str]], model: str,
+                                     temperature: float = 0.1, max_tokens: int = 4000,
+                                     extra_headers: Optional[Dict[str, str]] = None):
+        """
+        Open a streaming chat completion
+
+        Usage:
+            async with client.stream_chat_completion(key, messages, model) as stream:
+                async for delta in stream:
+                    ...
+
+        Raises:
+            LLMRateLimitError: Provider returned HTTP 429 (raised before any delta)
+            LLMTimeoutError: Connect or read timeout
+            LLMClientError: Any other failure
+        """
+        payload = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "stream": True
+        }
+        headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+            **(extra_headers or {})
+        }
+
+        client = self._get_client()
+        async with self._semaphore:
+            self._in_flight += 1
+            self._total_requests += 1
+            started = time.perf_counter()
+            try:
+                async with client.stream("POST", self.api_url, json=payload, headers=headers) as response:
+                    if response.status_code != 200:
+                        body = (await response.aread()).decode("utf-8", errors="replace")
+                        response_headers = {k.lower(): v for k, v in response.headers.items()}
+                        if response.status_code == 429:
+                            raise LLMRateLimitError("Rate limit exceeded", status_code=429,
+                                                    headers=response_headers, body=body)
+                        raise LLMClientError(f"HTTP {response.status_code}", status_code=response.status_code,
+                                             headers=response_headers, body=body)
+                    yield LLMStream(response, started)
+            except httpx.TimeoutException as e:
+                raise LLMTimeoutError(f"Stream timed out: {e}")
+            except httpx.HTTPError as e:
+                raise LLMClientError(f"Stream failed: {e}")
+            finally:
+                self._in_flight -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Current pool utilisation"""
+        return {
+            "in_flight": self._in_flight,
+            "max_concurrency": self.max_concurrency,
+            "total_requests": self._total_requests
+        }
+
+    async def aclose(self):
+        """Close pooled connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
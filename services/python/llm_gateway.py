@@ -0,0 +1,499 @@
+"""
+LLM Gateway for X-ceed Python Services
+Provider-agnostic chat completions with latency-based routing, circuit breakers and hedged requests
+"""
+
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from llm_client import AsyncLLMClient, LLMClientError, LLMTimeoutError
+
+GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
+OPENROUTER_API_URL = "https://openrouter.ai/api/v1/chat/completions"
+
+
+class LLMGatewayError(LLMClientError):
+    """Raised when no provider could answer a request"""
+
+    def __init__(self, message: str, errors: Optional[Dict[str, str]] = None):
+        super().__init__(message)
+        self.errors = errors or {}
+
+
+@dataclass
+class GatewayResponse:
+    """Completion returned by the gateway"""
+    content: str
+    provider: str
+    elapsed: float
+    hedged: bool = False
+    attempts: int = 1
+
+
+class LLMProvider:
+    """A chat completion backend; subclasses implement complete()"""
+
+    name = "provider"
+
+    async def complete(self, messages: List[Dict[str, str]], temperature: float, max_tokens: int) -> str:
+        raise NotImplementedError
+
+    async def aclose(self):
+        pass
+
+
+class OpenAICompatibleProvider(LLMProvider):
+    """Groq, OpenRouter or any other OpenAI-compatible endpoint, over a pooled AsyncLLMClient"""
+
+    def __init__(self, name: str, client: AsyncLLMClient, api_key: str, model: str,
+                 extra_headers: Optional[Dict[str, str]] = None):
+        """
+        Initialize the provider
+
+        Args:
+            name: Provider name used in routing stats
+            client: Shared client for the provider's endpoint
+            api_key: Bearer token
+            model: Model name
+            extra_headers: Additional request headers
+        """
+        self.name = name
+        self.client = client
+        self.api_key = api_key
+        self.model = model
+        self.extra_headers = extra_headers
+
+    async def complete(self, messages: List[Dict[str, str]], temperature: float, max_tokens: int) -> str:
+        response = await self.client.chat_completion(
+            self.api_key, messages, model=self.model, temperature=temperature,
+            max_tokens=max_tokens, extra_headers=self.extra_headers
+        )
+        return response.content
+
+    async def aclose(self):
+        await self.client.aclose()
+
+
+class GeminiProvider(LLMProvider):
+    """Google Gemini through google.generativeai (imported on first use)"""
+
+    def __init__(self, api_key: str, model: str = "gemini-1.5-flash", name: str = "gemini"):
+        """
+        Initialize the provider
+
+        Args:
+            api_key: Gemini API key
+            model: Gemini model name
+            name: Provider name used in routing stats
+        """
+        self.name = name
+        self.api_key = api_key
+        self.model_name = model
+        self._model = None
+
+    def _get_model(self):
+        if self._model is None:
+            import google.generativeai as genai
+            genai.configure(api_key=self.api_key)
+            self._model = genai.GenerativeModel(self.model_name)
+        return self._model
+
+    async def complete(self, messages: List[Dict[str, str]], temperature: float, max_tokens: int) -> str:
+        # Gemini takes a single prompt: system and user turns are joined in order
+        prompt = "\n\n".join(m.get("content", "") for m in messages if m.get("content"))
+        try:
+            response = await self._get_model().generate_content_async(
+                prompt,
+                generation_config={"temperature": temperature, "max_output_tokens": max_tokens}
+            )
+            text = response.text
+        except Exception as e:
+            raise LLMClientError(f"Gemini request failed: {e}")
+        if not text:
+            raise LLMClientError("Gemini returned an empty response")
+        return text
+
+
+class FakeProvider(LLMProvider):
+    """In-process provider with a fixed reply, latency and failure mode, for tests and local runs"""
+
+    def __init__(self, name: str = "fake", response: str = "fake response", latency: float = 0.0,
+                 error: Optional[str] = None):
+        """
+        Initialize the provider
+
+        Args:
+            name: Provider name used in routing stats
+            response: Text returned by every call
+            latency: Seconds each call takes
+            error: When set, every call fails with this message after the latency
+        """
+        self.name = name
+        self.response = response
+        self.latency = latency
+        self.error = error
+        self.calls = 0
+
+    async def complete(self, messages: List[Dict[str, str]], temperature: float, max_tokens: int) -> str:
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.error:
+            raise LLMClientError(self.error)
+        return self.response
+
+
+def groq_provider(api_key: str, model: str = "llama-3.1-8b-instant", timeout: float = 30.0) -> OpenAICompatibleProvider:
+    return OpenAICompatibleProvider("groq", AsyncLLMClient(GROQ_API_URL, timeout=timeout), api_key, model)
+
+
+def openrouter_provider(api_key: str, model: str = "mistralai/mistral-7b-instruct:free", timeout: float = 30.0,
+                        referer: str = "http://localhost:3002", title: str = "X-Ceed") -> OpenAICompatibleProvider:
+    return OpenAICompatibleProvider(
+        "openrouter",
+        AsyncLLMClient(OPENROUTER_API_URL, timeout=timeout),
+        api_key,
+        model,
+        extra_headers={"HTTP-Referer": referer, "X-Title": title}
+    )
+
+
+def providers_from_env(names: List[str], models: Optional[Dict[str, str]] = None,
+                       timeout: float = 30.0, title: str = "X-Ceed") -> List[LLMProvider]:
+    """
+    Build providers by name ("groq", "gemini", "openrouter"), skipping those without an API key
+
+    Args:
+        names: Provider names in order of preference
+        models: Optional model name per provider
+        timeout: Per-request timeout for HTTP providers
+        title: X-Title header sent to OpenRouter
+    """
+    models = models or {}
+    providers: List[LLMProvider] = []
+    for name in names:
+        name = name.strip().lower()
+        if name == "groq" and os.getenv("GROQ_API_KEY"):
+            providers.append(groq_provider(os.getenv("GROQ_API_KEY"), models.get("groq", "llama-3.1-8b-instant"), timeout))
+        elif name == "gemini" and os.getenv("GEMINI_API_KEY"):
+            providers.append(GeminiProvider(os.getenv("GEMINI_API_KEY"), models.get("gemini", "gemini-1.5-flash")))
+        elif name == "openrouter" and os.getenv("OPENROUTER_API_KEY"):
+            providers.append(openrouter_provider(
+                os.getenv("OPENROUTER_API_KEY"),
+                models.get("openrouter", "mistralai/mistral-7b-instruct:free"),
+                timeout,
+                title=title
+            ))
+        elif name == "fake":
+            providers.append(FakeProvider())
+    return providers
+
+
+class ProviderHealth:
+    """
+    Rolling latency/error window and circuit breaker for one provider.
+
+    The breaker opens after failure_threshold consecutive failures. While
+    open the provider is skipped; after reset_timeout one trial request is
+    let through (half-open) and its outcome closes or re-opens the breaker.
+
+    Attempts cancelled because another provider answered first are kept
+    apart: their latency is only a lower bound, so they inform routing but
+    never the p95 used for hedging or the error rate.
+    """
+
+    def __init__(self, window: int = 100, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._samples: Deque[Tuple[str, float]] = deque(maxlen=window)
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self.requests = 0
+        self.failures = 0
+        self.cancelled = 0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now (reserves the half-open trial)"""
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record(self, ok: bool, latency: float):
+        self.requests += 1
+        self._samples.append(("ok" if ok else "error", latency))
+        self._trial_in_flight = False
+        if ok:
+            self.consecutive_failures = 0
+            self.opened_at = None
+        else:
+            self.failures += 1
+            self.consecutive_failures += 1
+            if self.opened_at is not None or self.consecutive_failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+    def release(self):
+        """Give back a half-open trial whose request was cancelled before finishing"""
+        self._trial_in_flight = False
+
+    def record_outrun(self, latency: float):
+        """
+        Record an attempt cancelled because another provider answered first
+        after latency seconds (a lower bound on this provider's latency)
+        """
+        self.cancelled += 1
+        self._samples.append(("cancelled", latency))
+        self._trial_in_flight = False
+
+    def latency_percentile(self, q: float, include_cancelled: bool = False) -> Optional[float]:
+        """
+        Latency percentile (0-100) over successful requests in the window
+
+        Args:
+            include_cancelled: Also count outrun attempts at their lower-bound latency (for routing)
+        """
+        kinds = ("ok", "cancelled") if include_cancelled else ("ok",)
+        latencies = sorted(latency for kind, latency in self._samples if kind in kinds)
+        if not latencies:
+            return None
+        return latencies[min(len(latencies) - 1, max(0, math.ceil(q / 100 * len(latencies)) - 1))]
+
+    @property
+    def error_rate(self) -> float:
+        finished = [kind for kind, _ in self._samples if kind != "cancelled"]
+        if not finished:
+            return 0.0
+        return finished.count("error") / len(finished)
+
+    @property
+    def sample_count(self) -> int:
+        return len(self._samples)
+
+    def stats(self) -> Dict[str, Any]:
+        p50 = self.latency_percentile(50)
+        p95 = self.latency_percentile(95)
+        return {
+            "state": self.state,
+            "requests": self.requests,
+            "failures": self.failures,
+            "cancelled": self.cancelled,
+            "error_rate": round(self.error_rate, 3),
+            "p50_seconds": round(p50, 3) if p50 is not None else None,
+            "p95_seconds": round(p95, 3) if p95 is not None else None
+        }
+
+
+class LLMGateway:
+    """
+    Sends each request to the fastest healthy provider.
+
+    Providers are ranked by recent median latency, penalised by error rate;
+    until a provider has enough samples its configured position is used.
+    Providers whose circuit breaker is open are skipped. A failed attempt
+    immediately fails over to the next provider, and with hedging enabled a
+    backup request is also fired once the current attempt has run longer
+    than its provider's p95 latency. The first successful answer wins and
+    the remaining attempts are cancelled, so tail latency is bounded by the
+    fastest healthy provider rather than by a chain of timeouts.
+    """
+
+    def __init__(self, providers: List[LLMProvider], timeout: float = 30.0, hedge: bool = True,
+                 hedge_delay: float = 2.0, min_hedge_delay: float = 0.05, min_samples: int = 5,
+                 failure_threshold: int = 5, reset_timeout: float = 30.0, window: int = 100):
+        """
+        Initialize the gateway
+
+        Args:
+            providers: Providers in order of preference
+            timeout: Overall deadline for a request, across every attempt
+            hedge: Fire a backup request when an attempt is slower than its provider's p95
+            hedge_delay: Hedge delay used until a provider has min_samples successful requests
+            min_hedge_delay: Lower bound on the hedge delay
+            min_samples: Samples needed before measured latency is trusted for routing and hedging
+            failure_threshold: Consecutive failures that open a provider's circuit breaker
+            reset_timeout: Seconds an open breaker waits before a trial request
+            window: Requests kept in each provider's rolling window
+        """
+        self.providers = list(providers)
+        self.timeout = timeout
+        self.hedge = hedge
+        self.hedge_delay = hedge_delay
+        self.min_hedge_delay = min_hedge_delay
+        self.min_samples = min_samples
+        self.health: Dict[str, ProviderHealth] = {
+            p.name: ProviderHealth(window, failure_threshold, reset_timeout) for p in self.providers
+        }
+        self.requests = 0
+        self.hedged_requests = 0
+
+    def __bool__(self) -> bool:
+        return bool(self.providers)
+
+    def ranked_providers(self) -> List[LLMProvider]:
+        """Providers in the order they will be tried, fastest healthy first"""
+        def cost(item):
+            position, provider = item
+            health = self.health[provider.name]
+            p50 = health.latency_percentile(50, include_cancelled=True)
+            if health.sample_count < self.min_samples:
+                return (0, position)
+            if p50 is None:
+                # Nothing but failures in the window
+                return (2, position)
+            # A provider that fails half the time costs about twice its latency
+            return (1, p50 / max(1e-3, 1 - health.error_rate))
+
+        # Providers without enough samples go first in configured order, so they get measured
+        return [provider for _, provider in sorted(enumerate(self.providers), key=cost)]
+
+    def _hedge_after(self, provider: LLMProvider) -> float:
+        health = self.health[provider.name]
+        p95 = health.latency_percentile(95)
+        if health.sample_count < self.min_samples or p95 is None:
+            return self.hedge_delay
+        return max(self.min_hedge_delay, p95)
+
+    async def _attempt(self, provider: LLMProvider, messages: List[Dict[str, str]],
+                       temperature: float, max_tokens: int) -> str:
+        health = self.health[provider.name]
+        started = time.perf_counter()
+        try:
+            content = await provider.complete(messages, temperature, max_tokens)
+        except asyncio.CancelledError:
+            health.release()
+            raise
+        except Exception:
+            health.record(False, time.perf_counter() - started)
+            raise
+        health.record(True, time.perf_counter() - started)
+        return content
+
+    async def complete(self, messages: List[Dict[str, str]], temperature: float = 0.7, max_tokens: int = 1000,
+                       timeout: Optional[float] = None, hedge: Optional[bool] = None) -> GatewayResponse:
+        """
+        Get a chat completion from the first provider that answers
+
+        Args:
+            messages: Chat messages in OpenAI format
+            temperature: Sampling temperature
+            max_tokens: Maximum completion tokens
+            timeout: Overall deadline (defaults to the gateway timeout)
+            hedge: Override the gateway's hedging setting for this request
+
+        Returns:
+            GatewayResponse with the content and the provider that produced it
+
+        Raises:
+            LLMTimeoutError: The deadline passed before any provider answered
+            LLMGatewayError: Every available provider failed
+        """
+        hedge = self.hedge if hedge is None else hedge
+        deadline = time.perf_counter() + (timeout or self.timeout)
+        self.requests += 1
+
+        queue = deque(self.ranked_providers())
+        running: Dict[asyncio.Task, LLMProvider] = {}
+        launched_at: Dict[asyncio.Task, float] = {}
+        errors: Dict[str, str] = {}
+        attempts = 0
+        hedged = False
+        timed_out = False
+        started = time.perf_counter()
+
+        def launch() -> bool:
+            nonlocal attempts
+            while queue:
+                provider = queue.popleft()
+                if not self.health[provider.name].allow():
+                    errors.setdefault(provider.name, "circuit open")
+                    continue
+                task = asyncio.ensure_future(self._attempt(provider, messages, temperature, max_tokens))
+                running[task] = provider
+                launched_at[task] = time.perf_counter()
+                attempts += 1
+                return True
+            return False
+
+        try:
+            launch()
+            while running:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    timed_out = True
+                    break
+                wait = remaining
+                if hedge and queue:
+                    newest = list(running.values())[-1]
+                    wait = min(remaining, self._hedge_after(newest))
+
+                done, _ = await asyncio.wait(running, timeout=wait, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # Current attempts are slower than usual: race a backup provider
+                    if hedge and launch():
+                        hedged = True
+                    continue
+
+                for task in done:
+                    provider = running.pop(task)
+                    if task.exception() is None:
+                        if hedged:
+                            self.hedged_requests += 1
+                        return GatewayResponse(
+                            content=task.result(),
+                            provider=provider.name,
+                            elapsed=time.perf_counter() - started,
+                            hedged=hedged,
+                            attempts=attempts
+                        )
+                    errors[provider.name] = str(task.exception()) or type(task.exception()).__name__
+                    print(f"[WARN] LLM provider {provider.name} failed: {errors[provider.name]}")
+
+                if not running:
+                    launch()
+        finally:
+            for task, provider in running.items():
+                elapsed = time.perf_counter() - launched_at[task]
+                if timed_out:
+                    # A provider that never answers must still trip its breaker
+                    self.health[provider.name].record(False, elapsed)
+                else:
+                    self.health[provider.name].record_outrun(elapsed)
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        if hedged:
+            self.hedged_requests += 1
+        if timed_out:
+            raise LLMTimeoutError(f"No provider answered within {timeout or self.timeout:.1f}s")
+        raise LLMGatewayError("All LLM providers failed" if errors else "No LLM providers available", errors)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "hedged_requests": self.hedged_requests,
+            "routing_order": [p.name for p in self.ranked_providers()],
+            "providers": {name: health.stats() for name, health in self.health.items()}
+        }
+
+    async def aclose(self):
+        """Close every provider's pooled connections"""
+        for provider in self.providers:
+            await provider.aclose()
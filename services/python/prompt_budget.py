@@ -0,0 +1,268 @@
+"""
+Prompt Budget for X-ceed Python Services
+Token estimation and relevance-ranked trimming of resume/job text before LLM calls
+"""
+
+import math
+import os
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set
+
+# Roughly four characters per token for English text with Llama/Gemini tokenizers
+CHARS_PER_TOKEN = 4
+
+_WORD = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+# Lines repeated this often are page headers/footers rather than content
+REPEATED_LINE_MIN = 3
+_BOILERPLATE = [
+    re.compile(r"^page\s+\d+(\s*(of|/)\s*\d+)?$"),
+    re.compile(r"^\d+\s*(of|/)\s*\d+$"),
+    re.compile(r"^-\s*\d+\s*-$"),
+    re.compile(r"^references?\s+(are\s+)?available\s+(up)?on\s+request\.?$"),
+    re.compile(r"^curriculum\s+vitae$"),
+]
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it", "of",
+    "on", "or", "our", "the", "to", "we", "will", "with", "you", "your", "this", "that",
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of text"""
+    return math.ceil(len(text or "") / CHARS_PER_TOKEN)
+
+
+def collapse_whitespace(text: str) -> str:
+    """Collapse runs of spaces within lines and runs of blank lines"""
+    lines: List[str] = []
+    for raw in (text or "").splitlines():
+        line = " ".join(raw.split())
+        if line or (lines and lines[-1]):
+            lines.append(line)
+    return "\n".join(lines).strip()
+
+
+def remove_boilerplate(text: str) -> str:
+    """
+    Drop page headers/footers (lines repeated REPEATED_LINE_MIN or more times,
+    after their first occurrence), page numbers such as "Page 2", "2 of 5" or
+    "- 2 -", and similar filler. Lines that merely repeat once or twice - a
+    job title held twice, a shared bullet - are content and are kept.
+    """
+    lines = collapse_whitespace(text).splitlines()
+    counts: Dict[str, int] = {}
+    for line in lines:
+        if line:
+            counts[line.lower()] = counts.get(line.lower(), 0) + 1
+
+    seen: Set[str] = set()
+    kept: List[str] = []
+    for line in lines:
+        if not line:
+            if kept and kept[-1]:
+                kept.append("")
+            continue
+        key = line.lower()
+        if any(pattern.match(key) for pattern in _BOILERPLATE):
+            continue
+        if key in seen and counts[key] >= REPEATED_LINE_MIN:
+            continue
+        seen.add(key)
+        kept.append(line)
+    return "\n".join(kept).strip()
+
+
+def split_sections(text: str, max_section_tokens: Optional[int] = None) -> List[str]:
+    """
+    Split text into blank-line separated sections
+
+    Args:
+        text: Text to split
+        max_section_tokens: Longer sections (e.g. PDF text with no blank lines)
+            are split again into runs of whole lines of about this size
+    """
+    sections = []
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if max_section_tokens is None or estimate_tokens(paragraph) <= max_section_tokens:
+            sections.append(paragraph)
+            continue
+        current: List[str] = []
+        size = 0
+        for line in paragraph.splitlines():
+            line_tokens = estimate_tokens(line) + 1
+            if current and size + line_tokens > max_section_tokens:
+                sections.append("\n".join(current))
+                current, size = [], 0
+            current.append(line)
+            size += line_tokens
+        if current:
+            sections.append("\n".join(current))
+    return sections
+
+
+def _terms(text: str) -> List[str]:
+    return [w.strip(".") for w in _WORD.findall(text.lower()) if w.strip(".") not in _STOPWORDS]
+
+
+def _truncate_to_tokens(text: str, max_tokens: int) -> str:
+    limit = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    cut = text.rfind(" ", 0, limit)
+    return text[:cut if cut > 0 else limit].rstrip()
+
+
+@dataclass
+class BudgetedText:
+    """Text fitted to a token budget"""
+    text: str
+    original_tokens: int
+    tokens: int
+    sections_kept: int
+    sections_total: int
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.original_tokens - self.tokens
+
+    def report(self) -> Dict[str, int]:
+        return {
+            "original_tokens": self.original_tokens,
+            "tokens": self.tokens,
+            "tokens_saved": self.tokens_saved,
+            "sections_kept": self.sections_kept,
+            "sections_total": self.sections_total
+        }
+
+
+def fit_to_budget(text: str, max_tokens: int, query: str = "") -> BudgetedText:
+    """
+    Fit text to a token budget, keeping the sections most relevant to a query
+
+    Text that fits once whitespace is collapsed is returned as is; otherwise
+    boilerplate is removed first. If the text is still over budget, sections
+    are ranked by how many query terms they contain (normalised by length)
+    and kept best-first until the budget is spent; the first section
+    (usually name, contact and summary) is always kept. Kept sections stay
+    in their original order.
+
+    Args:
+        text: Resume or job description text
+        max_tokens: Token budget for this text (0 or less disables trimming)
+        query: Text the sections are ranked against (e.g. the job description)
+    """
+    original_tokens = estimate_tokens(text)
+    cleaned = collapse_whitespace(text)
+    if max_tokens > 0 and estimate_tokens(cleaned) > max_tokens:
+        cleaned = remove_boilerplate(cleaned)
+
+    if max_tokens <= 0 or estimate_tokens(cleaned) <= max_tokens:
+        sections = len(split_sections(cleaned))
+        return BudgetedText(cleaned, original_tokens, estimate_tokens(cleaned), sections, sections)
+
+    sections = split_sections(cleaned, max_section_tokens=max(50, max_tokens // 8))
+
+    query_terms = set(_terms(query))
+
+    def relevance(section: str) -> float:
+        terms = _terms(section)
+        hits = sum(1 for term in terms if term in query_terms)
+        return hits / math.sqrt(len(terms) + 1)
+
+    order = [0] + sorted(range(1, len(sections)), key=lambda i: (-relevance(sections[i]), i))
+    separator_tokens = estimate_tokens("\n\n")
+    remaining = max_tokens
+    kept: Dict[int, str] = {}
+    for index in order:
+        cost = estimate_tokens(sections[index]) + separator_tokens
+        if cost <= remaining:
+            kept[index] = sections[index]
+            remaining -= cost
+        elif index == 0 or not kept:
+            # Never return nothing: keep as much of the leading section as fits
+            kept[index] = _truncate_to_tokens(sections[index], remaining)
+            remaining = 0
+        if remaining <= separator_tokens:
+            break
+
+    result = "\n\n".join(kept[i] for i in sorted(kept))
+    return BudgetedText(result, original_tokens, estimate_tokens(result), len(kept), len(sections))
+
+
+class PromptBudget:
+    """Token budgets for the resume and job description parts of an analysis prompt"""
+
+    def __init__(self, resume_tokens: Optional[int] = None, job_tokens: Optional[int] = None):
+        """
+        Initialize the budget (defaults from RESUME_PROMPT_TOKENS / JOB_PROMPT_TOKENS)
+
+        Args:
+            resume_tokens: Budget for the resume text
+            job_tokens: Budget for the job description
+        """
+        self.resume_tokens = resume_tokens if resume_tokens is not None else int(os.getenv("RESUME_PROMPT_TOKENS", "2500"))
+        self.job_tokens = job_tokens if job_tokens is not None else int(os.getenv("JOB_PROMPT_TOKENS", "1200"))
+        self.requests = 0
+        self.tokens_saved = 0
+
+    @property
+    def version(self) -> str:
+        """Identifies the trimming settings (include it in cache keys)"""
+        return f"budget-v2-{self.resume_tokens}-{self.job_tokens}"
+
+    def fit(self, resume_text: str, job_description: str, job_context: Iterable[str] = ()) -> Dict[str, BudgetedText]:
+        """
+        Fit a resume and job description to their budgets
+
+        Args:
+            resume_text: Resume text, ranked against the job description and context
+            job_description: Job description text, ranked against the job context
+            job_context: Title, requirements or skills that describe the role
+
+        Returns:
+            {"resume": BudgetedText, "job": BudgetedText}
+        """
+        context = " ".join(str(item) for item in job_context if item)
+        resume = fit_to_budget(resume_text, self.resume_tokens, query=f"{job_description} {context}")
+        job = fit_to_budget(job_description, self.job_tokens, query=context or resume_text)
+        self.requests += 1
+        self.tokens_saved += resume.tokens_saved + job.tokens_saved
+        return {"resume": resume, "job": job}
+
+    def fit_job(self, job_description: str, job_context: Iterable[str] = ()) -> BudgetedText:
+        """
+        Fit a job description to its budget on its own, so the result can be
+        reused for every resume analyzed against the job (see fit_resume)
+
+        Args:
+            job_description: Job description text
+            job_context: Title, requirements or skills the sections are ranked against
+        """
+        context = " ".join(str(item) for item in job_context if item)
+        return fit_to_budget(job_description, self.job_tokens, query=context)
+
+    def fit_resume(self, resume_text: str, query: str, job: Optional[BudgetedText] = None) -> BudgetedText:
+        """
+        Fit a resume to its budget for a job whose description was fitted with fit_job
+
+        Args:
+            resume_text: Resume text
+            query: Text the resume sections are ranked against (job description and context)
+            job: The fitted job description, counted in the savings stats
+        """
+        resume = fit_to_budget(resume_text, self.resume_tokens, query=query)
+        self.requests += 1
+        self.tokens_saved += resume.tokens_saved + (job.tokens_saved if job else 0)
+        return resume
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "resume_tokens": self.resume_tokens,
+            "job_tokens": self.job_tokens,
+            "requests": self.requests,
+            "tokens_saved": self.tokens_saved
+        }
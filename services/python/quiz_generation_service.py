@@ -16,10 +16,18 @@ import re
 
 # Load environment variables
 from dotenv import load_dotenv
+from json_stream_parser import complete_items, parse_llm_json, parse_llm_json_with_repair
 load_dotenv(dotenv_path="../../.env.local")
 
 app = FastAPI(title="Video Quiz Generation Service", version="2.0.0")
 
+# Keys the last question must carry when truncated output was repaired. "explanation"
+# follows the answer in every prompt, so a question cut off inside its answer is dropped;
+# otherwise every question is kept and missing fields get the defaults below
+MCQ_KEYS = ('question', 'options', 'correct_answer', 'explanation')
+SUBJECTIVE_KEYS = ('question', 'sample_answer', 'explanation')
+CODING_KEYS = ('question', 'sample_solution', 'explanation')
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -268,19 +276,13 @@ Generate exactly {num_questions} questions now:"""
             content = response.text.strip()
             print(f"📥 Received response ({len(content)} chars)")
             
-            # Clean and parse JSON
-            content = content.replace('```json', '').replace('```', '').strip()
-            
-            # Extract JSON from response
-            json_start = content.find('{')
-            json_end = content.rfind('}') + 1
+            # Extract the JSON object (fences, surrounding prose and truncated output are handled)
+            questions_data, repaired = parse_llm_json_with_repair(content)
             
-            if json_start != -1 and json_end > json_start:
-                json_content = content[json_start:json_end]
-                questions_data = json.loads(json_content)
+            if isinstance(questions_data, dict):
                 
                 questions = []
-                for q_data in questions_data.get('questions', []):
+                for q_data in complete_items(questions_data.get('questions'), MCQ_KEYS if repaired else ()):
                     if len(questions) >= num_questions:
                         break
                     
@@ -538,11 +540,9 @@ class QuizGenerator:
             content = response.generations[0].text.strip()
             
             # Try to extract JSON from the response
-            if '{' in content and '}' in content:
-                start = content.find('{')
-                end = content.rfind('}') + 1
-                json_content = content[start:end]
-                return json.loads(json_content)
+            analysis = parse_llm_json(content)
+            if isinstance(analysis, dict) and analysis.get('key_concepts'):
+                return analysis
             else:
                 # If no valid JSON found, create basic structure
                 raise ValueError("No valid JSON in response")
@@ -724,35 +724,14 @@ Generate exactly {num_questions} questions that test knowledge of the specific c
                 content = response.generations[0].text.strip()
                 print(f"🔍 Raw Cohere response length: {len(content)} characters")
                 
-                # More aggressive JSON extraction
-                content = content.replace('```json', '').replace('```', '').replace('`', '').strip()
-                
-                # Remove any leading/trailing text that's not JSON
-                lines = content.split('\n')
-                json_lines = []
-                in_json = False
-                brace_count = 0
-                
-                for line in lines:
-                    if '{' in line and not in_json:
-                        in_json = True
-                        json_lines.append(line)
-                        brace_count += line.count('{') - line.count('}')
-                    elif in_json:
-                        json_lines.append(line)
-                        brace_count += line.count('{') - line.count('}')
-                        if brace_count <= 0:
-                            break
-                
-                json_content = '\n'.join(json_lines)
-                print(f"🔍 Cleaned JSON length: {len(json_content)} characters")
-                
-                # Parse the JSON
-                questions_data = json.loads(json_content)
+                # Extract the JSON object (fences, surrounding prose and truncated output are handled)
+                questions_data, repaired = parse_llm_json_with_repair(content)
+                if not isinstance(questions_data, dict):
+                    raise ValueError("No valid JSON in response")
                 questions = []
                 
                 # Validate that questions are content-specific, not general knowledge
-                for q_data in questions_data.get('questions', []):
+                for q_data in complete_items(questions_data.get('questions'), MCQ_KEYS if repaired else ()):
                     if len(questions) >= num_questions:
                         break
                     
@@ -1194,16 +1173,12 @@ Generate exactly {num_questions} questions that test knowledge of the specific c
             
             content = response.generations[0].text.strip()
             
-            if '{' in content and '}' in content:
-                start = content.find('{')
-                end = content.rfind('}') + 1
-                json_content = content[start:end]
-                questions_data = json.loads(json_content)
-            else:
+            questions_data, repaired = parse_llm_json_with_repair(content)
+            if not isinstance(questions_data, dict):
                 raise ValueError("No valid JSON in response")
             
             questions = []
-            for q_data in questions_data.get('questions', []):
+            for q_data in complete_items(questions_data.get('questions'), SUBJECTIVE_KEYS if repaired else ()):
                 question = QuizQuestion(
                     id=str(uuid.uuid4()),
                     type='subjective',
@@ -1256,16 +1231,12 @@ Generate exactly {num_questions} questions that test knowledge of the specific c
             
             content = response.generations[0].text.strip()
             
-            if '{' in content and '}' in content:
-                start = content.find('{')
-                end = content.rfind('}') + 1
-                json_content = content[start:end]
-                questions_data = json.loads(json_content)
-            else:
+            questions_data, repaired = parse_llm_json_with_repair(content)
+            if not isinstance(questions_data, dict):
                 raise ValueError("No valid JSON in response")
             
             questions = []
-            for q_data in questions_data.get('questions', []):
+            for q_data in complete_items(questions_data.get('questions'), CODING_KEYS if repaired else ()):
                 question = QuizQuestion(
                     id=str(uuid.uuid4()),
                     type='coding',
@@ -17,6 +17,7 @@ from datetime import datetime
 
 # Load environment variables
 from dotenv import load_dotenv
+from json_stream_parser import complete_items, parse_llm_json_with_repair
 import os
 
 # Try multiple paths for the .env.local file
@@ -37,6 +38,11 @@ else:
 
 app = FastAPI(title="Optimized Video Quiz Generation Service", version="2.0.0")
 
+# Keys the last question must carry when truncated output was repaired. "explanation"
+# follows the answer in every prompt, so a question cut off inside its answer is dropped;
+# otherwise every question is kept and missing fields get the defaults below
+MCQ_KEYS = ('question', 'options', 'correct_answer', 'explanation')
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -283,19 +289,13 @@ Create questions in JSON format:
                 content = response.text.strip()
                 print(f"📥 Received response ({len(content)} chars)")
                 
-                # Clean and parse JSON
-                content = content.replace('```json', '').replace('```', '').strip()
-                
-                # Extract JSON from response
-                json_start = content.find('{')
-                json_end = content.rfind('}') + 1
+                # Extract the JSON object (fences, surrounding prose and truncated output are handled)
+                questions_data, repaired = parse_llm_json_with_repair(content)
                 
-                if json_start != -1 and json_end > json_start:
-                    json_content = content[json_start:json_end]
-                    questions_data = json.loads(json_content)
+                if isinstance(questions_data, dict):
                     
                     questions = []
-                    for q_data in questions_data.get('questions', []):
+                    for q_data in complete_items(questions_data.get('questions'), MCQ_KEYS if repaired else ()):
                         if len(questions) >= num_questions:
                             break
                         
@@ -0,0 +1,172 @@
+"""
+RAG Session Manager for X-ceed Python Services
+Per-session ResumeAnalyzerCore instances with LRU eviction, TTL and a vector memory cap
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+
+class RAGSession:
+    """One candidate's analyzer plus the lock that serialises work on it"""
+
+    def __init__(self, session_id: str, analyzer: Any):
+        self.session_id = session_id
+        self.analyzer = analyzer
+        self.lock = threading.Lock()
+        self.created_at = time.time()
+        self.last_used = self.created_at
+
+    def _call_locked(self, func: Callable, *args, **kwargs):
+        with self.lock:
+            return func(*args, **kwargs)
+
+    async def run(self, func: Callable, *args, **kwargs):
+        """
+        Run a blocking analyzer method in a worker thread, one call per session at a time
+
+        Conversation memory is not safe to mutate concurrently, so calls for the
+        same session queue up while different sessions run in parallel.
+        """
+        return await asyncio.to_thread(self._call_locked, func, *args, **kwargs)
+
+    @property
+    def index_bytes(self) -> int:
+        vectorstore = getattr(self.analyzer, "vectorstore", None)
+        return getattr(vectorstore, "nbytes", 0) if vectorstore is not None else 0
+
+
+class RAGSessionManager:
+    """
+    Keeps a ResumeAnalyzerCore per session id.
+
+    Analyzers are created by a factory that shares the heavy objects (LLM
+    client, embedding model) so a session only owns its vector index and chat
+    memory. Sessions idle longer than ttl_seconds are dropped, and the least
+    recently used sessions are evicted when either max_sessions or the total
+    vector memory cap is exceeded.
+    """
+
+    def __init__(self, analyzer_factory: Callable[[], Any], max_sessions: int = 200,
+                 ttl_seconds: int = 3600, max_index_bytes: int = 256 * 1024 * 1024):
+        """
+        Initialize the manager
+
+        Args:
+            analyzer_factory: Returns a new analyzer for a session
+            max_sessions: Sessions kept before LRU eviction
+            ttl_seconds: Idle time after which a session expires
+            max_index_bytes: Cap on the combined size of all session vector indexes
+        """
+        self.analyzer_factory = analyzer_factory
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.max_index_bytes = max_index_bytes
+        self._sessions: "OrderedDict[str, RAGSession]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.created = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, session_id: str) -> Optional[RAGSession]:
+        """Return an existing session, or None if missing/expired"""
+        now = time.time()
+        with self._lock:
+            self._expire_locked(now)
+            session = self._sessions.get(session_id)
+            if session is not None:
+                session.last_used = now
+                self._sessions.move_to_end(session_id)
+            return session
+
+    def get_or_create(self, session_id: str) -> RAGSession:
+        """Return the session for an id, creating a fresh analyzer if needed"""
+        session = self.get(session_id)
+        if session is not None:
+            return session
+
+        analyzer = self.analyzer_factory()
+        with self._lock:
+            # Another request may have created it while the factory ran
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = RAGSession(session_id, analyzer)
+                self._sessions[session_id] = session
+                self.created += 1
+            session.last_used = time.time()
+            self._sessions.move_to_end(session_id)
+            self._evict_locked(keep=session_id)
+        return session
+
+    def enforce_limits(self, keep: Optional[str] = None):
+        """Re-check the memory cap, e.g. after a session built a new index"""
+        with self._lock:
+            self._evict_locked(keep=keep)
+
+    def _expire_locked(self, now: float):
+        expired = [sid for sid, s in self._sessions.items() if now - s.last_used > self.ttl_seconds]
+        for sid in expired:
+            self._close(self._sessions.pop(sid))
+            self.expirations += 1
+
+    def _evict_locked(self, keep: Optional[str] = None):
+        self._expire_locked(time.time())
+        total_bytes = sum(s.index_bytes for s in self._sessions.values())
+
+        for sid in list(self._sessions):
+            if len(self._sessions) <= self.max_sessions and total_bytes <= self.max_index_bytes:
+                break
+            if sid == keep:
+                continue
+            session = self._sessions.pop(sid)
+            total_bytes -= session.index_bytes
+            self._close(session)
+            self.evictions += 1
+
+    @staticmethod
+    def _close(session: RAGSession):
+        """Free a session's index unless a request is still using it (GC cleans up then)"""
+        if session.lock.acquire(blocking=False):
+            try:
+                session.analyzer.close()
+            finally:
+                session.lock.release()
+
+    def delete(self, session_id: str) -> bool:
+        """Remove a single session"""
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+        if session is None:
+            return False
+        self._close(session)
+        return True
+
+    def clear(self):
+        """Remove every session"""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            self._close(session)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def stats(self) -> Dict[str, Any]:
+        """Session counts and memory usage"""
+        with self._lock:
+            index_bytes = sum(s.index_bytes for s in self._sessions.values())
+            active = len(self._sessions)
+        return {
+            "active_sessions": active,
+            "max_sessions": self.max_sessions,
+            "ttl_seconds": self.ttl_seconds,
+            "index_bytes": index_bytes,
+            "max_index_bytes": self.max_index_bytes,
+            "created": self.created,
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
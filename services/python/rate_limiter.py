@@ -0,0 +1,89 @@
+"""
+Provider Rate Limiter for X-ceed Python Services
+Token-bucket request pacing shared by every caller of an LLM provider
+"""
+
+import asyncio
+import threading
+import time
+from typing import Dict, Optional
+
+
+class RateLimiter:
+    """
+    Token bucket that paces requests to rate_per_minute with bursts up to burst.
+
+    Reservations are made under a thread lock and waited out with
+    asyncio.sleep, so one limiter can be shared across threads and event loops.
+    """
+
+    def __init__(self, rate_per_minute: float, burst: Optional[int] = None):
+        """
+        Initialize the limiter
+
+        Args:
+            rate_per_minute: Sustained request rate
+            burst: Requests allowed back to back after an idle period (defaults to 1/6 of the rate)
+        """
+        self.rate = rate_per_minute / 60.0
+        self.burst = burst or max(1, int(rate_per_minute // 6))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.total_requests = 0
+        self.total_wait = 0.0
+
+    def _reserve(self) -> float:
+        """Take a token and return how long the caller must wait for it"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            self.total_requests += 1
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.total_wait += delay
+            return delay
+
+    async def acquire(self):
+        """Wait until a request may be sent"""
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def acquire_sync(self):
+        """Blocking variant for synchronous callers"""
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "rate_per_minute": round(self.rate * 60, 1),
+            "burst": self.burst,
+            "total_requests": self.total_requests,
+            "total_wait_seconds": round(self.total_wait, 2)
+        }
+
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: str, rate_per_minute: float, burst: Optional[int] = None) -> RateLimiter:
+    """
+    Return the process-wide limiter for a provider, creating it on first call
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(provider)
+        if limiter is None:
+            limiter = RateLimiter(rate_per_minute, burst)
+            _limiters[provider] = limiter
+        return limiter
@@ -7,16 +7,27 @@ import os
 from dotenv import load_dotenv
 from langchain_groq import ChatGroq
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-try:
-    from langchain_huggingface import HuggingFaceEmbeddings
-except ImportError:
-    from langchain_community.embeddings import HuggingFaceEmbeddings
-from langchain_community.vectorstores import Chroma
 from langchain.chains import ConversationalRetrievalChain
 from langchain.memory import ConversationBufferMemory
 from langchain.schema import Document
-import tempfile
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.retrievers import BaseRetriever
 from typing import List, Dict, Optional, Any
+from embedding_engine import get_embedding_engine
+from vector_index import VectorIndex
+from document_extraction import get_extraction_engine
+
+
+class VectorIndexRetriever(BaseRetriever):
+    """LangChain retriever over a VectorIndex"""
+
+    index: Any
+    k: int = 3
+
+    def _get_relevant_documents(self, query: str, *,
+                                run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        return self.index.similarity_search(query, k=self.k)
+
 
 class ResumeAnalyzerCore:
     """
@@ -24,31 +35,31 @@ class ResumeAnalyzerCore:
     Handles document processing, vector storage, and AI conversations.
     """
     
-    def __init__(self, groq_api_key: str = None):
+    def __init__(self, groq_api_key: str = None, llm: Any = None, embeddings: Any = None):
         """
         Initialize the core analyzer
         
         Args:
             groq_api_key: Groq API key (if not provided, will load from environment)
+            llm: Existing chat model to share instead of creating one
+            embeddings: Existing embeddings to share instead of the process-wide engine
         """
         # Load environment variables
         load_dotenv()
         
         self.groq_api_key = groq_api_key or os.getenv("GROQ_API_KEY")
-        if not self.groq_api_key:
+        if llm is None and not self.groq_api_key:
             raise ValueError("Please provide Groq API key or set GROQ_API_KEY environment variable")
         
         # Initialize the LLM
-        self.llm = ChatGroq(
+        self.llm = llm or ChatGroq(
             temperature=0.1,
             groq_api_key=self.groq_api_key,
             model_name="llama-3.1-8b-instant"
         )
         
-        # Initialize embeddings
-        self.embeddings = HuggingFaceEmbeddings(
-            model_name="sentence-transformers/all-MiniLM-L6-v2"
-        )
+        # Shared embeddings: the model is loaded once per process and reused by every instance
+        self.embeddings = embeddings or get_embedding_engine("sentence-transformers/all-MiniLM-L6-v2")
         
         # Text splitter
         self.text_splitter = RecursiveCharacterTextSplitter(
@@ -57,10 +68,17 @@ class ResumeAnalyzerCore:
             length_function=len
         )
         
+        # Optional directory for memory-mapped vectors (kept in memory when unset)
+        self.vector_mmap_dir = os.getenv("RAG_VECTOR_MMAP_DIR")
+        
         self.vectorstore = None
         self.conversation_chain = None
         self.chat_history = []
         
+    def new_session(self) -> "ResumeAnalyzerCore":
+        """Create an empty analyzer that shares this one's LLM client and embeddings"""
+        return ResumeAnalyzerCore(groq_api_key=self.groq_api_key, llm=self.llm, embeddings=self.embeddings)
+        
     def process_documents(self, resume_text: str, job_description_text: str) -> bool:
         """
         Process resume and job description texts to create vector store
@@ -92,13 +110,10 @@ class ResumeAnalyzerCore:
                     ))
             
             if documents:
-                # Create a temporary directory for ChromaDB
-                persist_directory = tempfile.mkdtemp()
-                self.vectorstore = Chroma.from_documents(
-                    documents=documents, 
-                    embedding=self.embeddings,
-                    persist_directory=persist_directory
-                )
+                # Replace any previous index for this analyzer
+                self.close()
+                self.vectorstore = VectorIndex(self.embeddings, mmap_dir=self.vector_mmap_dir)
+                self.vectorstore.add_documents(documents)
                 
                 # Create conversation chain
                 self._create_conversation_chain()
@@ -120,7 +135,7 @@ class ResumeAnalyzerCore:
             
             self.conversation_chain = ConversationalRetrievalChain.from_llm(
                 llm=self.llm,
-                retriever=self.vectorstore.as_retriever(search_kwargs={"k": 3}),
+                retriever=VectorIndexRetriever(index=self.vectorstore, k=3),
                 memory=memory,
                 return_source_documents=True,
                 verbose=False
@@ -258,10 +273,16 @@ class ResumeAnalyzerCore:
     
     def clear_session(self):
         """Clear the current session"""
-        self.vectorstore = None
+        self.close()
         self.conversation_chain = None
         self.chat_history = []
     
+    def close(self):
+        """Release the vector index and any file backing it"""
+        if self.vectorstore is not None:
+            self.vectorstore.close()
+            self.vectorstore = None
+    
     def is_ready(self) -> bool:
         """Check if the analyzer is ready to answer questions"""
         return self.conversation_chain is not None
@@ -274,30 +295,18 @@ class DocumentProcessor:
     @staticmethod
     def extract_text_from_pdf(pdf_file_bytes: bytes) -> str:
         """Extract text from PDF bytes"""
-        try:
-            import PyPDF2
-            import io
-            pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_file_bytes))
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text()
-            return text
-        except Exception as e:
-            return f"Error reading PDF: {str(e)}"
+        result = get_extraction_engine().extract(pdf_file_bytes, 'pdf')
+        if not result.ok:
+            return f"Error reading PDF: {result.error}"
+        return result.text("")
     
     @staticmethod
     def extract_text_from_docx(docx_file_bytes: bytes) -> str:
         """Extract text from DOCX bytes"""
-        try:
-            from docx import Document
-            import io
-            doc = Document(io.BytesIO(docx_file_bytes))
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text
-        except Exception as e:
-            return f"Error reading DOCX: {str(e)}"
+        result = get_extraction_engine().extract(docx_file_bytes, 'docx')
+        if not result.ok:
+            return f"Error reading DOCX: {result.error}"
+        return "".join(part + "\n" for part in result.parts)
     
     @staticmethod
     def extract_text_from_txt(txt_file_bytes: bytes) -> str:
@@ -0,0 +1,182 @@
+"""
+Session Store for X-ceed Python Services
+Bounded, TTL-expiring per-session storage with lock-free reads and optional SQLite backing
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, NamedTuple, Optional
+
+
+class _Entry(NamedTuple):
+    data: Mapping[str, Any]
+    expires_at: float
+    cached_at: float
+
+
+class SessionStore:
+    """
+    Per-session key/value store.
+
+    Sessions live in an in-process dict of immutable snapshots, so get() never
+    takes a lock: it is a single dict lookup of an entry that is replaced, not
+    mutated, on write. Writes are serialised, expire after ttl_seconds and
+    evict the least recently used session once max_sessions is reached.
+
+    When backend_path is set, every write also goes to a SQLite file that
+    plays the role of a local Redis: sessions evicted from memory can be
+    reloaded, and several uvicorn workers pointing at the same file see each
+    other's sessions. Memory copies are then only trusted for
+    local_cache_seconds before being re-read from the file.
+    """
+
+    def __init__(self, max_sessions: int = 1000, ttl_seconds: int = 3600,
+                 backend_path: Optional[str] = None, local_cache_seconds: float = 2.0):
+        """
+        Initialize the store
+
+        Args:
+            max_sessions: Sessions kept in memory before LRU eviction
+            ttl_seconds: Lifetime of a session after its last write
+            backend_path: Optional SQLite file for spill-over and cross-worker sharing
+            local_cache_seconds: How long a memory copy is trusted when a backend is shared
+        """
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.local_cache_seconds = local_cache_seconds
+        self._entries: Dict[str, _Entry] = {}
+        self._last_access: Dict[str, float] = {}
+        self._write_lock = threading.Lock()
+        self.evictions = 0
+
+        self._conn = None
+        self._db_lock = threading.Lock()
+        if backend_path:
+            os.makedirs(os.path.dirname(os.path.abspath(backend_path)), exist_ok=True)
+            self._conn = sqlite3.connect(backend_path, check_same_thread=False, timeout=10)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS sessions (
+                    session_id TEXT PRIMARY KEY,
+                    data TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+            self._conn.commit()
+
+    def get(self, session_id: str) -> Optional[Mapping[str, Any]]:
+        """
+        Return a read-only view of a session, or None if missing/expired
+        """
+        now = time.time()
+        entry = self._entries.get(session_id)
+
+        if entry is not None and entry.expires_at > now:
+            if self._conn is None or now - entry.cached_at < self.local_cache_seconds:
+                self._last_access[session_id] = now
+                return entry.data
+
+        if self._conn is None:
+            return None
+
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT data, expires_at FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        if row is None or row[1] <= now:
+            return None
+
+        data = MappingProxyType(json.loads(row[0]))
+        with self._write_lock:
+            self._store_locally(session_id, _Entry(data, row[1], now), now)
+        return data
+
+    def set(self, session_id: str, data: Dict[str, Any]):
+        """Replace a session's data and refresh its TTL"""
+        now = time.time()
+        expires_at = now + self.ttl_seconds
+        snapshot = MappingProxyType(dict(data))
+
+        with self._write_lock:
+            self._store_locally(session_id, _Entry(snapshot, expires_at, now), now)
+
+        if self._conn is not None:
+            with self._db_lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO sessions (session_id, data, expires_at) VALUES (?, ?, ?)",
+                    (session_id, json.dumps(dict(data)), expires_at)
+                )
+                self._conn.execute("DELETE FROM sessions WHERE expires_at <= ?", (now,))
+                self._conn.commit()
+
+    def _store_locally(self, session_id: str, entry: _Entry, now: float):
+        """Insert into memory, evicting expired then least recently used sessions (write lock held)"""
+        entries = dict(self._entries)
+        entries[session_id] = entry
+
+        expired = [sid for sid, e in entries.items() if e.expires_at <= now]
+        for sid in expired:
+            del entries[sid]
+
+        overflow = len(entries) - self.max_sessions
+        if overflow > 0:
+            candidates = sorted(
+                (sid for sid in entries if sid != session_id),
+                key=lambda sid: self._last_access.get(sid, entries[sid].cached_at)
+            )
+            for sid in candidates[:overflow]:
+                del entries[sid]
+            self.evictions += overflow
+
+        # Swap in the new dict in one assignment so concurrent readers never see a partial update
+        self._entries = entries
+        self._last_access = {sid: self._last_access.get(sid, now) for sid in entries}
+        self._last_access[session_id] = now
+
+    def delete(self, session_id: str):
+        """Remove a single session"""
+        with self._write_lock:
+            entries = dict(self._entries)
+            entries.pop(session_id, None)
+            self._entries = entries
+        if self._conn is not None:
+            with self._db_lock:
+                self._conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+                self._conn.commit()
+
+    def clear(self):
+        """Remove every session"""
+        with self._write_lock:
+            self._entries = {}
+            self._last_access = {}
+        if self._conn is not None:
+            with self._db_lock:
+                self._conn.execute("DELETE FROM sessions")
+                self._conn.commit()
+
+    def __len__(self) -> int:
+        now = time.time()
+        return sum(1 for e in self._entries.values() if e.expires_at > now)
+
+    def __contains__(self, session_id: str) -> bool:
+        return self.get(session_id) is not None
+
+    def stats(self) -> Dict[str, Any]:
+        """Store size and configuration"""
+        stats = {
+            "memory_sessions": len(self),
+            "max_sessions": self.max_sessions,
+            "ttl_seconds": self.ttl_seconds,
+            "evictions": self.evictions,
+            "shared_backend": self._conn is not None
+        }
+        if self._conn is not None:
+            with self._db_lock:
+                stats["backend_sessions"] = self._conn.execute(
+                    "SELECT COUNT(*) FROM sessions WHERE expires_at > ?", (time.time(),)
+                ).fetchone()[0]
+        return stats
@@ -5,12 +5,22 @@ Uses direct Groq API calls instead of complex LangChain setup
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Optional, Dict, Any
 import os
-import requests
 import json
+import time
+import asyncio
 from dotenv import load_dotenv
+from llm_client import AsyncLLMClient, LLMClientError, LLMRateLimitError, LLMTimeoutError
+from groq_key_pool import GroqKeyPool, KeyPoolExhausted
+from analysis_cache import AnalysisCache
+from session_store import SessionStore
+from sse_utils import SSE_HEADERS, format_sse
+from prompt_budget import PromptBudget
+from json_stream_parser import StreamingJSONParser
+from single_flight import SingleFlight, flight_key
 
 # Load environment variables
 import os
@@ -35,9 +45,11 @@ single_key = os.getenv('GROQ_API_KEY')
 if single_key:
     GROQ_API_KEYS.append(single_key)
 
-GROQ_API_KEYS = [key for key in GROQ_API_KEYS if key]  # Remove None values
+GROQ_API_KEYS = list(dict.fromkeys(key for key in GROQ_API_KEYS if key))  # Remove None values and duplicates
 print(f"Available API keys: {len(GROQ_API_KEYS)} (loaded from environment only)")
-current_key_index = 0
+
+# Rate-limit aware scheduler that spreads requests across all keys
+groq_key_pool = GroqKeyPool(GROQ_API_KEYS, max_wait=float(os.getenv("GROQ_KEY_MAX_WAIT", "10")))
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -59,27 +71,54 @@ app.add_middleware(
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
 
-def get_next_groq_key():
-    """Get the next available API key (with rotation)"""
-    global current_key_index
-    if not GROQ_API_KEYS:
-        raise HTTPException(status_code=500, detail="No GROQ API keys configured")
-    
-    key = GROQ_API_KEYS[current_key_index]
-    current_key_index = (current_key_index + 1) % len(GROQ_API_KEYS)
-    return key
-
-def rotate_to_next_key():
-    """Force rotation to next key when rate limited"""
-    global current_key_index
-    if len(GROQ_API_KEYS) > 1:
-        current_key_index = (current_key_index + 1) % len(GROQ_API_KEYS)
-        print(f"[INFO] Rotated to API key #{current_key_index + 1}")
-        return True
-    return False
-
-# Global session storage (in production, use proper session management)
-session_data = {}
+# Shared pooled client so Groq calls don't block the event loop
+groq_client = AsyncLLMClient(
+    GROQ_API_URL,
+    max_concurrency=int(os.getenv("GROQ_MAX_CONCURRENCY", "32")),
+    timeout=float(os.getenv("GROQ_REQUEST_TIMEOUT", "30"))
+)
+
+# Model and prompt version are part of the cache key; bump the version whenever the analysis prompt changes
+ANALYSIS_MODEL = "llama-3.1-8b-instant"
+# Resume/JD token budgets for the analysis prompt (RESUME_PROMPT_TOKENS / JOB_PROMPT_TOKENS)
+prompt_budget = PromptBudget()
+ANALYSIS_PROMPT_VERSION = f"structured-v2-{prompt_budget.version}"
+
+# Top-level sections of the structured analysis, in the order the prompt asks for them
+ANALYSIS_SCHEMA = {
+    "overallMatch": dict,
+    "skillsAnalysis": dict,
+    "experienceAnalysis": dict,
+    "keyStrengths": list,
+    "detailedGapAnalysis": dict,
+    "improvementSuggestions": list,
+    "competitiveAdvantages": list,
+    "interviewPreparation": dict,
+    "marketPositioning": dict
+}
+
+# Persistent cache so repeat analyses of the same resume/job cost zero tokens
+analysis_cache = AnalysisCache(
+    db_path=os.getenv("ANALYSIS_CACHE_PATH"),
+    ttl_seconds=int(os.getenv("ANALYSIS_CACHE_TTL", str(7 * 24 * 3600))),
+    max_entries=int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", "5000"))
+)
+
+# Duplicate requests that arrive while an identical Groq call is in flight share its result
+groq_flights = SingleFlight("groq")
+
+@app.on_event("shutdown")
+async def close_groq_client():
+    """Release pooled Groq connections"""
+    await groq_client.aclose()
+
+# Per-session storage keyed by the caller's session_id. Set SESSION_STORE_PATH to share
+# sessions between uvicorn workers through a local SQLite file.
+session_store = SessionStore(
+    max_sessions=int(os.getenv("SESSION_MAX_SESSIONS", "1000")),
+    ttl_seconds=int(os.getenv("SESSION_TTL", "3600")),
+    backend_path=os.getenv("SESSION_STORE_PATH")
+)
 
 # Pydantic models
 class AnalysisRequest(BaseModel):
@@ -87,6 +126,8 @@ class AnalysisRequest(BaseModel):
     job_description: str
     job_title: str
     job_requirements: Optional[list] = []
+    session_id: Optional[str] = "default"
+    use_cache: Optional[bool] = True
 
 class ChatRequest(BaseModel):
     question: str
@@ -99,74 +140,137 @@ class AnalysisResponse(BaseModel):
     data: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
 
-def call_groq_api(messages, model="llama-3.1-8b-instant", temperature=0.1, max_retries=2):
-    """Make a direct call to Groq API with key rotation on rate limits"""
+async def call_groq_api(messages, model="llama-3.1-8b-instant", temperature=0.1, max_retries=3, max_tokens=4000):
+    """Make a non-blocking call to Groq API, scheduling across keys by rate-limit headroom"""
     if not GROQ_API_KEYS:
         raise HTTPException(status_code=500, detail="GROQ_API_KEY not configured")
     
+    # Rough token estimate (~4 chars per token) used to reserve key budget
+    estimated_tokens = sum(len(str(m.get("content", ""))) for m in messages) // 4 + max_tokens
+    
     for attempt in range(max_retries):
-        current_key = get_next_groq_key()
-        headers = {
-            "Authorization": f"Bearer {current_key}",
-            "Content-Type": "application/json"
-        }
-        
-        payload = {
-            "model": model,
-            "messages": messages,
-            "temperature": temperature,
-            "max_tokens": 4000
-        }
+        try:
+            lease = await groq_key_pool.acquire(estimated_tokens)
+        except KeyPoolExhausted as e:
+            print(f"[ERROR] All API keys rate limited: {e}")
+            raise HTTPException(status_code=429, detail="All API keys rate limited. Please try again later.")
         
-        print(f"[DEBUG] Attempt {attempt + 1}/{max_retries} - Using API key #{current_key_index}")
+        print(f"[DEBUG] Attempt {attempt + 1}/{max_retries} - Using API key #{lease.index + 1}")
         print(f"[DEBUG] Calling Groq API with model: {model}")
         print(f"[DEBUG] Messages count: {len(messages)}")
         print(f"[DEBUG] Message preview: {str(messages[0])[:200]}...")
-        
+        released = False
         try:
-            response = requests.post(GROQ_API_URL, headers=headers, json=payload, timeout=30)
-            print(f"[DEBUG] Groq response status: {response.status_code}")
-            
-            if response.status_code == 200:
-                result = response.json()
-                if "choices" not in result or not result["choices"]:
-                    print(f"[ERROR] Invalid Groq response format: {result}")
-                    raise HTTPException(status_code=500, detail="Invalid response format from Groq API")
-                return result["choices"][0]["message"]["content"]
+            response = await groq_client.chat_completion(
+                lease.key,
+                messages,
+                model=model,
+                temperature=temperature,
+                max_tokens=max_tokens
+            )
+            groq_key_pool.release(lease, headers=response.headers, usage=response.usage)
+            released = True
+            print(f"[DEBUG] Groq response status: {response.status_code} ({response.elapsed:.2f}s)")
+            return response.content
             
-            elif response.status_code == 429:
-                print(f"[WARNING] Rate limit hit with key #{current_key_index}")
-                print(f"[ERROR] Groq API error response: {response.text}")
-                
-                if attempt < max_retries - 1 and rotate_to_next_key():
-                    print(f"[INFO] Retrying with next API key...")
-                    continue
-                else:
-                    print(f"[ERROR] All API keys rate limited or no more keys available")
-                    raise HTTPException(status_code=429, detail="All API keys rate limited. Please try again later.")
+        except LLMRateLimitError as e:
+            groq_key_pool.mark_rate_limited(lease, retry_after=e.retry_after, headers=e.headers)
+            released = True
+            print(f"[WARNING] Rate limit hit with key #{lease.index + 1}, cooling down")
+            print(f"[ERROR] Groq API error response: {e.body}")
+            continue
             
-            else:
-                print(f"[ERROR] Groq API error response: {response.text}")
-                response.raise_for_status()
-                
-        except requests.exceptions.Timeout:
+        except LLMTimeoutError:
+            groq_key_pool.release(lease, failed=True)
+            released = True
             print(f"[ERROR] Groq API timeout on attempt {attempt + 1}")
             if attempt == max_retries - 1:
                 raise HTTPException(status_code=500, detail="Groq API timeout")
             continue
             
-        except requests.exceptions.RequestException as e:
+        except LLMClientError as e:
+            groq_key_pool.release(lease, headers=e.headers, failed=True)
+            released = True
             print(f"[ERROR] Groq API request failed: {str(e)}")
-            if hasattr(e, 'response') and e.response is not None:
-                print(f"[ERROR] Response status: {e.response.status_code}")
-                print(f"[ERROR] Response text: {e.response.text}")
+            if e.status_code is not None:
+                print(f"[ERROR] Response status: {e.status_code}")
+                print(f"[ERROR] Response text: {e.body}")
             
             if attempt == max_retries - 1:
                 raise HTTPException(status_code=500, detail=f"Groq API error: {str(e)}")
             continue
+            
+        finally:
+            # Cancellation and unexpected errors must not leak the lease
+            if not released:
+                groq_key_pool.release(lease)
+    
+    # If we get here, every attempt was rate limited or failed
+    print(f"[ERROR] All Groq API attempts failed or were rate limited")
+    raise HTTPException(status_code=429, detail="All API keys rate limited. Please try again later.")
+
+async def stream_groq_api(messages, model="llama-3.1-8b-instant", temperature=0.1, max_retries=3, max_tokens=4000):
+    """
+    Stream a Groq completion delta by delta.
+    Rate limits and errors before the first token are retried on another key; later failures are raised.
+    """
+    if not GROQ_API_KEYS:
+        raise HTTPException(status_code=500, detail="GROQ_API_KEY not configured")
+    
+    estimated_tokens = sum(len(str(m.get("content", ""))) for m in messages) // 4 + max_tokens
+    
+    for attempt in range(max_retries):
+        try:
+            lease = await groq_key_pool.acquire(estimated_tokens)
+        except KeyPoolExhausted as e:
+            print(f"[ERROR] All API keys rate limited: {e}")
+            raise HTTPException(status_code=429, detail="All API keys rate limited. Please try again later.")
+        
+        print(f"[DEBUG] Stream attempt {attempt + 1}/{max_retries} - Using API key #{lease.index + 1}")
+        released = False
+        yielded = False
+        try:
+            async with groq_client.stream_chat_completion(
+                lease.key,
+                messages,
+                model=model,
+                temperature=temperature,
+                max_tokens=max_tokens
+            ) as stream:
+                async for delta in stream:
+                    yielded = True
+                    yield delta
+            groq_key_pool.release(lease, headers=stream.headers, usage=stream.usage)
+            released = True
+            print(f"[DEBUG] Groq stream finished, first token after {stream.first_token_latency or 0:.2f}s")
+            return
+            
+        except LLMRateLimitError as e:
+            groq_key_pool.mark_rate_limited(lease, retry_after=e.retry_after, headers=e.headers)
+            released = True
+            print(f"[WARNING] Rate limit hit with key #{lease.index + 1}, cooling down")
+            if yielded:
+                raise HTTPException(status_code=429, detail="All API keys rate limited. Please try again later.")
+            continue
+            
+        except LLMClientError as e:
+            groq_key_pool.release(lease, headers=e.headers, failed=True)
+            released = True
+            print(f"[ERROR] Groq stream failed: {str(e)}")
+            if yielded or attempt == max_retries - 1:
+                raise HTTPException(status_code=500, detail=f"Groq API error: {str(e)}")
+            continue
+            
+        finally:
+            if not released:
+                groq_key_pool.release(lease)
     
-    # If we get here, all attempts failed
-    raise HTTPException(status_code=500, detail="All Groq API attempts failed")
+    raise HTTPException(status_code=429, detail="All API keys rate limited. Please try again later.")
+
+async def call_groq_api_coalesced(messages, **kwargs):
+    """call_groq_api, sharing one Groq call between identical concurrent requests"""
+    key = flight_key(messages, kwargs)
+    return await groq_flights.do(key, lambda: call_groq_api(messages, **kwargs))
 
 @app.get("/")
 async def root():
@@ -178,28 +282,43 @@ async def root():
         "version": "1.0.0"
     }
 
-@app.post("/analyze", response_model=AnalysisResponse)
-async def analyze_resume(request: AnalysisRequest):
-    """Analyze resume against job description"""
-    try:
-        # Debug: Print received data
-        print(f"[DEBUG] Received analysis request:")
-        print(f"   - Job Title: '{request.job_title}'")
-        print(f"   - Job Description Length: {len(request.job_description)} chars")
-        print(f"   - Job Description (first 200 chars): '{request.job_description[:200]}...'")
-        print(f"   - Job Requirements: {request.job_requirements}")
-        print(f"   - Resume Text Length: {len(request.resume_text)} chars")
-        print(f"   - Resume Text (first 100 chars): '{request.resume_text[:100]}...'")
-        
-        # Store session data
-        session_id = "default"
-        session_data[session_id] = {
-            "resume_text": request.resume_text,
-            "job_description": request.job_description,
-            "job_title": request.job_title,
-            "job_requirements": request.job_requirements
-        }        # Create enhanced structured analysis prompt that returns detailed JSON data
-        analysis_prompt = f"""
+def analysis_cache_key(request: AnalysisRequest) -> str:
+    """Cache key for a structured analysis of this resume/job pair"""
+    return AnalysisCache.make_key(
+        request.resume_text,
+        request.job_description,
+        request.job_title,
+        request.job_requirements,
+        ANALYSIS_MODEL,
+        ANALYSIS_PROMPT_VERSION
+    )
+
+def build_analysis_messages(request: AnalysisRequest):
+    """
+    Fit the resume and job description to the prompt budget and build the structured analysis prompt
+    
+    Returns:
+        (chat messages, prompt budget report)
+    """
+    # Trim boilerplate and the least relevant resume/JD sections to the token budget
+    budgeted = prompt_budget.fit(
+        request.resume_text,
+        request.job_description,
+        [request.job_title] + list(request.job_requirements)
+    )
+    resume_text = budgeted["resume"].text
+    job_description = budgeted["job"].text
+    budget_report = {
+        "resume": budgeted["resume"].report(),
+        "jobDescription": budgeted["job"].report(),
+        "tokensSaved": budgeted["resume"].tokens_saved + budgeted["job"].tokens_saved
+    }
+    print(f"[DEBUG] Prompt budget: saved {budget_report['tokensSaved']} tokens "
+          f"(resume {budgeted['resume'].original_tokens} -> {budgeted['resume'].tokens}, "
+          f"JD {budgeted['job'].original_tokens} -> {budgeted['job'].tokens})")
+    
+    # Create enhanced structured analysis prompt that returns detailed JSON data
+    analysis_prompt = f"""
 You are an expert HR professional and career advisor with 15+ years of experience in technical recruiting and resume analysis. Your task is to conduct a comprehensive, meticulous analysis of this resume against the job requirements.
 
 **ANALYSIS REQUIREMENTS:**
@@ -225,11 +344,11 @@ You are an expert HR professional and career advisor with 15+ years of experienc
 
 **JOB INFORMATION:**
 **Title:** {request.job_title}
-**Description:** {request.job_description}
+**Description:** {job_description}
 **Requirements:** {', '.join(request.job_requirements)}
 
 **RESUME CONTENT:**
-{request.resume_text}
+{resume_text}
 
 Provide a meticulous, comprehensive analysis in this exact JSON format:
 
@@ -373,18 +492,70 @@ Provide a meticulous, comprehensive analysis in this exact JSON format:
 Return ONLY the JSON object, no other text or formatting.
 """
 
-        messages = [
-            {"role": "system", "content": "You are an expert HR professional and career advisor specializing in resume analysis and job matching. You must respond with valid JSON only."},
-            {"role": "user", "content": analysis_prompt}
-        ]
+    messages = [
+        {"role": "system", "content": "You are an expert HR professional and career advisor specializing in resume analysis and job matching. You must respond with valid JSON only."},
+        {"role": "user", "content": analysis_prompt}
+    ]
+    return messages, budget_report
+
+@app.post("/analyze", response_model=AnalysisResponse)
+async def analyze_resume(request: AnalysisRequest):
+    """Analyze resume against job description"""
+    try:
+        # Debug: Print received data
+        print(f"[DEBUG] Received analysis request:")
+        print(f"   - Job Title: '{request.job_title}'")
+        print(f"   - Job Description Length: {len(request.job_description)} chars")
+        print(f"   - Job Description (first 200 chars): '{request.job_description[:200]}...'")
+        print(f"   - Job Requirements: {request.job_requirements}")
+        print(f"   - Resume Text Length: {len(request.resume_text)} chars")
+        print(f"   - Resume Text (first 100 chars): '{request.resume_text[:100]}...'")
+        
+        # Store session data
+        session_id = request.session_id or "default"
+        await asyncio.to_thread(session_store.set, session_id, {
+            "resume_text": request.resume_text,
+            "job_description": request.job_description,
+            "job_title": request.job_title,
+            "job_requirements": request.job_requirements
+        })
+        
+        cache_key = analysis_cache_key(request)
+        cached_analysis = await asyncio.to_thread(analysis_cache.get, cache_key) if request.use_cache else None
+        if cached_analysis is not None:
+            print(f"[DEBUG] Analysis cache hit: {cache_key[:12]}")
+            return AnalysisResponse(
+                success=True,
+                data={
+                    "analysis": {
+                        "structuredAnalysis": cached_analysis,
+                        "timestamp": "2025-06-15T18:00:00.000Z",
+                        "model": ANALYSIS_MODEL,
+                        "ragEnabled": True
+                    },
+                    "metadata": {
+                        "analyzedAt": "2025-06-15T18:00:00.000Z",
+                        "jobTitle": request.job_title,
+                        "model": ANALYSIS_MODEL,
+                        "ragEnabled": True,
+                        "cached": True
+                    }
+                }
+            )
+        
+        messages, budget_report = build_analysis_messages(request)
         
         # Get analysis from Groq
-        analysis_result = call_groq_api(messages)
+        analysis_result = await call_groq_api_coalesced(messages, model=ANALYSIS_MODEL)
         
-        # Try to parse the JSON response
-        try:
-            import json
-            structured_analysis = json.loads(analysis_result)
+        # Parse the JSON response (fences, stray prose and truncated output are repaired)
+        parser = StreamingJSONParser(schema=ANALYSIS_SCHEMA)
+        parser.feed(analysis_result)
+        structured_analysis = parser.close()
+        # Without the overall match the analysis cannot be rendered; fall back to the raw text
+        if isinstance(structured_analysis, dict) and "overallMatch" in parser.sections:
+            if not parser.repaired:
+                await asyncio.to_thread(analysis_cache.set, cache_key, structured_analysis)
             
             return AnalysisResponse(
                 success=True,
@@ -399,12 +570,15 @@ Return ONLY the JSON object, no other text or formatting.
                         "analyzedAt": "2025-06-15T18:00:00.000Z",
                         "jobTitle": request.job_title,
                         "model": "llama-3.1-8b-instant",
-                        "ragEnabled": True
+                        "ragEnabled": True,
+                        "promptBudget": budget_report,
+                        "jsonRepaired": parser.repaired,
+                        "missingSections": parser.missing_keys
                     }
                 }
             )
-        except json.JSONDecodeError:
-            # Fallback to original text format if JSON parsing fails
+        else:
+            # Fallback to original text format if no JSON could be recovered
             return AnalysisResponse(
                 success=True,
                 data={                    "analysis": {
@@ -417,7 +591,8 @@ Return ONLY the JSON object, no other text or formatting.
                         "analyzedAt": "2025-06-15T18:00:00.000Z",
                         "jobTitle": request.job_title,
                         "model": "llama-3.1-8b-instant",
-                        "ragEnabled": True
+                        "ragEnabled": True,
+                        "promptBudget": budget_report
                     }
                 }
             )
@@ -448,6 +623,112 @@ Return ONLY the JSON object, no other text or formatting.
             }
         )
 
+@app.post("/analyze/stream")
+async def analyze_resume_stream(request: AnalysisRequest):
+    """
+    Stream a structured analysis as server-sent events.
+    Emits a 'section' frame ({"key", "value"}) as soon as each top-level section of the
+    analysis JSON closes (overallMatch first), then a 'done' frame with the same fields as /analyze's data.
+    """
+    await asyncio.to_thread(session_store.set, request.session_id or "default", {
+        "resume_text": request.resume_text,
+        "job_description": request.job_description,
+        "job_title": request.job_title,
+        "job_requirements": request.job_requirements
+    })
+    cache_key = analysis_cache_key(request)
+    
+    async def event_stream():
+        started = time.perf_counter()
+        try:
+            cached_analysis = await asyncio.to_thread(analysis_cache.get, cache_key) if request.use_cache else None
+            if cached_analysis is not None:
+                for key, value in cached_analysis.items():
+                    yield format_sse({"key": key, "value": value}, event="section")
+                yield format_sse({
+                    "success": True,
+                    "analysis": {
+                        "structuredAnalysis": cached_analysis,
+                        "timestamp": "2025-06-15T18:00:00.000Z",
+                        "model": ANALYSIS_MODEL,
+                        "ragEnabled": True
+                    },
+                    "metadata": {
+                        "analyzedAt": "2025-06-15T18:00:00.000Z",
+                        "jobTitle": request.job_title,
+                        "model": ANALYSIS_MODEL,
+                        "ragEnabled": True,
+                        "cached": True
+                    },
+                    "elapsed": round(time.perf_counter() - started, 3)
+                }, event="done")
+                return
+            
+            messages, budget_report = build_analysis_messages(request)
+            parser = StreamingJSONParser(schema=ANALYSIS_SCHEMA)
+            parts = []
+            sent_keys = set()
+            async for delta in stream_groq_api(messages, model=ANALYSIS_MODEL):
+                parts.append(delta)
+                for key, value in parser.feed(delta):
+                    sent_keys.add(key)
+                    yield format_sse({"key": key, "value": value}, event="section")
+            
+            structured_analysis = parser.close()
+            if not isinstance(structured_analysis, dict):
+                yield format_sse({
+                    "success": True,
+                    "analysis": {
+                        "comprehensiveAnalysis": "".join(parts),
+                        "timestamp": "2025-06-15T18:00:00.000Z",
+                        "model": ANALYSIS_MODEL,
+                        "ragEnabled": True
+                    },
+                    "metadata": {
+                        "analyzedAt": "2025-06-15T18:00:00.000Z",
+                        "jobTitle": request.job_title,
+                        "model": ANALYSIS_MODEL,
+                        "ragEnabled": True,
+                        "promptBudget": budget_report
+                    },
+                    "elapsed": round(time.perf_counter() - started, 3)
+                }, event="done")
+                return
+            
+            # Sections only recovered by repairing a truncated response
+            for key, value in parser.sections.items():
+                if key not in sent_keys:
+                    yield format_sse({"key": key, "value": value, "repaired": True}, event="section")
+            if not parser.repaired:
+                await asyncio.to_thread(analysis_cache.set, cache_key, structured_analysis)
+            
+            yield format_sse({
+                "success": True,
+                "analysis": {
+                    "structuredAnalysis": structured_analysis,
+                    "timestamp": "2025-06-15T18:00:00.000Z",
+                    "model": ANALYSIS_MODEL,
+                    "ragEnabled": True
+                },
+                "metadata": {
+                    "analyzedAt": "2025-06-15T18:00:00.000Z",
+                    "jobTitle": request.job_title,
+                    "model": ANALYSIS_MODEL,
+                    "ragEnabled": True,
+                    "promptBudget": budget_report,
+                    "jsonRepaired": parser.repaired,
+                    "missingSections": parser.missing_keys,
+                    "invalidSections": parser.invalid
+                },
+                "elapsed": round(time.perf_counter() - started, 3)
+            }, event="done")
+        except HTTPException as e:
+            yield format_sse({"success": False, "error": e.detail, "status_code": e.status_code}, event="error")
+        except Exception as e:
+            yield format_sse({"success": False, "error": f"Analysis failed: {str(e)}"}, event="error")
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
 def create_fallback_analysis(job_title, job_requirements):
     """Create a detailed analysis when AI fails"""
     return {
@@ -601,67 +882,65 @@ def create_fallback_analysis(job_title, job_requirements):
         }
     }
 
-@app.post("/chat", response_model=AnalysisResponse)
-async def chat_with_resume(request: ChatRequest):
-    """Chat about the resume and job description"""
-    try:
-        print(f"💬 Received chat request:")
-        print(f"   - Question: '{request.question}'")
-        print(f"   - Session ID: '{request.session_id}'")
-        print(f"   - Context available: {request.context is not None}")
-        print(f"   - Conversation history length: {len(request.conversation_history) if request.conversation_history else 0}")
-        
-        if request.context:
-            print(f"   - Context job title: {request.context.get('jobTitle', 'N/A')}")
-            print(f"   - Context has job description: {bool(request.context.get('jobDescription'))}")
-            print(f"   - Context has analysis result: {bool(request.context.get('analysisResult'))}")
-        
-        session_id = request.session_id or "default"
-        
-        # Try to get session data, but don't fail if not found
-        session = session_data.get(session_id, {})
-        print(f"   - Session data available: {bool(session)}")
-        if session:
-            print(f"   - Session job title: {session.get('job_title', 'N/A')}")
-            print(f"   - Session has job description: {bool(session.get('job_description'))}")
-            print(f"   - Session has resume text: {bool(session.get('resume_text'))}")
-          # Build conversation context with better memory
-        conversation_context = ""
-        if request.conversation_history:
-            # Use last 6 messages for better context (3 exchanges)
-            recent_messages = request.conversation_history[-6:]
-            for i, msg in enumerate(recent_messages):
-                role = msg.get('role', 'user')
-                content = msg.get('content', '')
-                # Don't truncate the most recent messages as much
-                if i >= len(recent_messages) - 2:  # Last 2 messages
-                    content = content[:500] if len(content) > 500 else content
-                else:
-                    content = content[:200] if len(content) > 200 else content
-                conversation_context += f"**{role.capitalize()}:** {content}\n\n"
+def build_chat_messages(request: ChatRequest) -> list:
+    """Build the Groq conversation messages for a chat request (reads the session store; call off the event loop)"""
+    print(f"💬 Received chat request:")
+    print(f"   - Question: '{request.question}'")
+    print(f"   - Session ID: '{request.session_id}'")
+    print(f"   - Context available: {request.context is not None}")
+    print(f"   - Conversation history length: {len(request.conversation_history) if request.conversation_history else 0}")
+    
+    if request.context:
+        print(f"   - Context job title: {request.context.get('jobTitle', 'N/A')}")
+        print(f"   - Context has job description: {bool(request.context.get('jobDescription'))}")
+        print(f"   - Context has analysis result: {bool(request.context.get('analysisResult'))}")
+    
+    session_id = request.session_id or "default"
+    
+    # Try to get session data, but don't fail if not found
+    session = session_store.get(session_id) or {}
+    print(f"   - Session data available: {bool(session)}")
+    if session:
+        print(f"   - Session job title: {session.get('job_title', 'N/A')}")
+        print(f"   - Session has job description: {bool(session.get('job_description'))}")
+        print(f"   - Session has resume text: {bool(session.get('resume_text'))}")
+      # Build conversation context with better memory
+    conversation_context = ""
+    if request.conversation_history:
+        # Use last 6 messages for better context (3 exchanges)
+        recent_messages = request.conversation_history[-6:]
+        for i, msg in enumerate(recent_messages):
+            role = msg.get('role', 'user')
+            content = msg.get('content', '')
+            # Don't truncate the most recent messages as much
+            if i >= len(recent_messages) - 2:  # Last 2 messages
+                content = content[:500] if len(content) > 500 else content
+            else:
+                content = content[:200] if len(content) > 200 else content
+            conversation_context += f"**{role.capitalize()}:** {content}\n\n"
+    
+    # Build enhanced analysis context
+    analysis_context = ""
+    if request.context:
+        job_title = request.context.get('jobTitle', '')
+        job_description = request.context.get('jobDescription', '')
+        analysis_result = request.context.get('analysisResult', '')
         
-        # Build enhanced analysis context
-        analysis_context = ""
-        if request.context:
-            job_title = request.context.get('jobTitle', '')
-            job_description = request.context.get('jobDescription', '')
-            analysis_result = request.context.get('analysisResult', '')
-            
-            if job_title:
-                analysis_context += f"**Current Job Application:** {job_title}\n"
-            if job_description:
-                # Include more job description context
-                job_desc_excerpt = job_description[:400] if len(job_description) > 400 else job_description
-                analysis_context += f"**Job Description:** {job_desc_excerpt}...\n"
-            if analysis_result:
-                # Include more analysis context
-                analysis_excerpt = analysis_result[:500] if len(analysis_result) > 500 else analysis_result
-                analysis_context += f"**Previous Analysis Summary:** {analysis_excerpt}...\n"          # Create natural conversational prompt for Groq
-        # Build the conversation messages for Groq API
-        messages = [
-            {
-                "role": "system", 
-                "content": f"""You are a helpful and friendly AI career assistant. You have access to information about a job application and resume analysis.
+        if job_title:
+            analysis_context += f"**Current Job Application:** {job_title}\n"
+        if job_description:
+            # Include more job description context
+            job_desc_excerpt = job_description[:400] if len(job_description) > 400 else job_description
+            analysis_context += f"**Job Description:** {job_desc_excerpt}...\n"
+        if analysis_result:
+            # Include more analysis context
+            analysis_excerpt = analysis_result[:500] if len(analysis_result) > 500 else analysis_result
+            analysis_context += f"**Previous Analysis Summary:** {analysis_excerpt}...\n"          # Create natural conversational prompt for Groq
+    # Build the conversation messages for Groq API
+    messages = [
+        {
+            "role": "system", 
+            "content": f"""You are a helpful and friendly AI career assistant. You have access to information about a job application and resume analysis.
 
 CONTEXT INFORMATION:
 - Job Title: {session.get('job_title', request.context.get('jobTitle', 'Unknown') if request.context else 'Unknown')}
@@ -677,29 +956,37 @@ CONVERSATION STYLE:
 - Use the candidate's name if mentioned in the resume
 
 Remember: You're having a conversation, not giving a lecture. Let the user guide what they want to discuss."""
-            }
-        ]
-        
-        # Add recent conversation history for context
-        if request.conversation_history:
-            # Add the last few messages to maintain conversation flow
-            recent_messages = request.conversation_history[-6:]  # Last 6 messages for context
-            for msg in recent_messages:
-                role = msg.get('role', 'user')
-                content = msg.get('content', '')
-                if role in ['user', 'assistant'] and content:
-                    messages.append({
-                        "role": role,
-                        "content": content
-                    })
+        }
+    ]
+    
+    # Add recent conversation history for context
+    if request.conversation_history:
+        # Add the last few messages to maintain conversation flow
+        recent_messages = request.conversation_history[-6:]  # Last 6 messages for context
+        for msg in recent_messages:
+            role = msg.get('role', 'user')
+            content = msg.get('content', '')
+            if role in ['user', 'assistant'] and content:
+                messages.append({
+                    "role": role,
+                    "content": content
+                })
+    
+    # Add current user message
+    messages.append({
+        "role": "user",
+        "content": request.question
+    })
+    return messages
+
+@app.post("/chat", response_model=AnalysisResponse)
+async def chat_with_resume(request: ChatRequest):
+    """Chat about the resume and job description"""
+    try:
+        messages = await asyncio.to_thread(build_chat_messages, request)
         
-        # Add current user message
-        messages.append({
-            "role": "user",
-            "content": request.question
-        })        
         # Call Groq API for natural conversation
-        chat_response = call_groq_api(messages, temperature=0.7)  # Higher temperature for more natural responses
+        chat_response = await call_groq_api_coalesced(messages, temperature=0.7)  # Higher temperature for more natural responses
         
         return AnalysisResponse(
             success=True,
@@ -714,17 +1001,45 @@ Remember: You're having a conversation, not giving a lecture. Let the user guide
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Chat failed: {str(e)}")
 
+@app.post("/chat/stream")
+async def chat_with_resume_stream(request: ChatRequest):
+    """
+    Stream a chat answer as server-sent events.
+    Emits one frame per token, then a 'done' frame with the same fields as /chat's data.
+    """
+    messages = await asyncio.to_thread(build_chat_messages, request)
+    
+    async def event_stream():
+        started = time.perf_counter()
+        parts = []
+        try:
+            async for delta in stream_groq_api(messages, temperature=0.7):
+                parts.append(delta)
+                yield format_sse({"token": delta})
+            
+            yield format_sse({
+                "success": True,
+                "response": "".join(parts),
+                "sources": [],
+                "timestamp": "2025-06-15T18:00:00.000Z",
+                "elapsed": round(time.perf_counter() - started, 3)
+            }, event="done")
+        except HTTPException as e:
+            yield format_sse({"success": False, "error": e.detail, "status_code": e.status_code}, event="error")
+        except Exception as e:
+            yield format_sse({"success": False, "error": f"Chat failed: {str(e)}"}, event="error")
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
 @app.get("/quick-analysis/{analysis_type}")
-async def quick_analysis(analysis_type: str):
+async def quick_analysis(analysis_type: str, session_id: str = "default"):
     """Get quick analysis results"""
     try:
-        session_id = "default"
+        session = await asyncio.to_thread(session_store.get, session_id)
         
-        if session_id not in session_data:
+        if session is None:
             raise HTTPException(status_code=400, detail="No analysis session found. Please analyze first.")
         
-        session = session_data[session_id]
-        
         questions = {
             "match": "Provide a detailed analysis of how well my resume matches the job requirements. Give me a percentage match and explain the key alignments and gaps.",
             "skills": "What skills and qualifications mentioned in the job description are missing from my resume? Provide specific recommendations.",
@@ -753,7 +1068,7 @@ Provide a focused, actionable response.
         ]
         
         # Get response from Groq
-        analysis_result = call_groq_api(messages)
+        analysis_result = await call_groq_api_coalesced(messages)
         
         return AnalysisResponse(
             success=True,
@@ -774,15 +1089,24 @@ async def get_status():
     """Get service status"""
     return {
         "ready": bool(GROQ_API_KEY),
-        "active_sessions": len(session_data),
-        "groq_configured": bool(GROQ_API_KEY)
+        "active_sessions": len(session_store),
+        "groq_configured": bool(GROQ_API_KEY),
+        "groq_client": groq_client.stats(),
+        "groq_keys": groq_key_pool.metrics(),
+        "analysis_cache": analysis_cache.stats(),
+        "sessions": session_store.stats(),
+        "prompt_budget": prompt_budget.stats(),
+        "single_flight": groq_flights.stats()
     }
 
 @app.post("/clear-session")
-async def clear_session():
-    """Clear analysis session"""
+async def clear_session(session_id: Optional[str] = None):
+    """Clear one analysis session, or all sessions when no session_id is given"""
     try:
-        session_data.clear()
+        if session_id:
+            await asyncio.to_thread(session_store.delete, session_id)
+        else:
+            await asyncio.to_thread(session_store.clear)
         return AnalysisResponse(
             success=True,
             data={"message": "Session cleared successfully"}
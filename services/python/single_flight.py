@@ -0,0 +1,131 @@
+"""
+Single-Flight Request Coalescing for X-ceed Python Services
+Deduplicates identical in-flight LLM calls by content hash and shares one result with every caller
+"""
+
+import asyncio
+import hashlib
+import json
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+
+def flight_key(*parts: Any) -> str:
+    """
+    Build a content hash for a call from everything that determines its result
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    encoded = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time; callers that arrive while it is
+    in flight wait for that call instead of starting their own.
+
+    The result (or exception) is fanned out to every waiter and nothing is
+    kept once the call finishes - pair it with a cache for reuse over time.
+    A caller that is cancelled does not cancel the shared call while other
+    callers are still waiting on it.
+    """
+
+    def __init__(self, name: str = ""):
+        """
+        Initialize the group
+
+        Args:
+            name: Label reported in stats()
+        """
+        self.name = name
+        self._calls: Dict[str, Tuple[asyncio.Task, list]] = {}
+        self._sync_calls: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.shared = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await fn() once for all concurrent callers with the same key
+
+        Args:
+            key: Content hash of the call (see flight_key)
+            fn: Zero-argument callable returning the awaitable to run
+
+        Returns:
+            The shared result; the shared exception is raised in every caller
+        """
+        loop = asyncio.get_running_loop()
+        entry = self._calls.get(key)
+        if entry is None or entry[0].get_loop() is not loop:
+            task = loop.create_task(fn())
+            entry = (task, [0])
+            self._calls[key] = entry
+            task.add_done_callback(lambda _, key=key, entry=entry: self._forget(key, entry))
+            self.leaders += 1
+        else:
+            self.shared += 1
+
+        task, waiters = entry
+        waiters[0] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            # Abandon the call only when nobody is left waiting for it
+            if waiters[0] == 1 and not task.done():
+                self._forget(key, entry)
+                task.cancel()
+            raise
+        finally:
+            waiters[0] -= 1
+
+    def _forget(self, key: str, entry: Tuple[asyncio.Task, list]):
+        if self._calls.get(key) is entry:
+            del self._calls[key]
+
+    def do_sync(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        Blocking variant for callers on worker threads
+
+        Args:
+            key: Content hash of the call (see flight_key)
+            fn: Zero-argument callable run by the first caller
+
+        Returns:
+            The shared result; the shared exception is raised in every caller
+        """
+        with self._lock:
+            future = self._sync_calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._sync_calls[key] = future
+                self.leaders += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._sync_calls[key]
+        return future.result()
+
+    def __len__(self) -> int:
+        return len(self._calls) + len(self._sync_calls)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "in_flight": len(self),
+            "leaders": self.leaders,
+            "shared": self.shared
+        }
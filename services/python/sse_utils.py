@@ -0,0 +1,27 @@
+"""
+Server-Sent Events helpers for X-ceed Python Services
+"""
+
+import json
+from typing import Any, Optional
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no"
+}
+
+
+def format_sse(data: Any, event: Optional[str] = None) -> str:
+    """
+    Format one SSE frame
+
+    Args:
+        data: JSON-serialisable payload
+        event: Optional event name (clients default to 'message')
+
+    Returns:
+        Frame text terminated by a blank line
+    """
+    frame = f"event: {event}\n" if event else ""
+    return frame + f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
@@ -0,0 +1,133 @@
+import asyncio
+
+from llm_client import LLMTimeoutError
+from llm_gateway import FakeProvider, LLMGateway, LLMGatewayError
+
+MESSAGES = [{"role": "user", "content": "Ask me an interview question"}]
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+# Routing: measured providers are ranked by latency, fastest first
+def test_routes_to_fastest_provider():
+    slow = FakeProvider("slow", response="slow answer", latency=0.05)
+    fast = FakeProvider("fast", response="fast answer", latency=0.01)
+    gateway = LLMGateway([slow, fast], hedge=False, min_samples=2)
+
+    async def scenario():
+        # Warm both providers up so their latency is measured
+        for provider in (slow, fast):
+            for _ in range(2):
+                await gateway._attempt(provider, MESSAGES, 0.7, 100)
+        return await gateway.complete(MESSAGES)
+
+    result = run(scenario())
+    assert [p.name for p in gateway.ranked_providers()] == ["fast", "slow"]
+    assert result.provider == "fast"
+    assert result.content == "fast answer"
+
+
+# Failover: a failing provider hands the request to the next one
+def test_fails_over_to_next_provider():
+    broken = FakeProvider("broken", error="HTTP 500")
+    backup = FakeProvider("backup", response="backup answer")
+    gateway = LLMGateway([broken, backup], hedge=False)
+
+    result = run(gateway.complete(MESSAGES))
+    assert result.provider == "backup"
+    assert result.attempts == 2
+    assert gateway.health["broken"].failures == 1
+
+
+def test_raises_when_every_provider_fails():
+    gateway = LLMGateway([FakeProvider("a", error="down"), FakeProvider("b", error="down")], hedge=False)
+    try:
+        run(gateway.complete(MESSAGES))
+    except LLMGatewayError as e:
+        assert set(e.errors) == {"a", "b"}
+    else:
+        raise AssertionError("expected LLMGatewayError")
+
+
+# Circuit breaker: consecutive failures stop traffic until the reset timeout passes
+def test_breaker_opens_and_skips_provider():
+    broken = FakeProvider("broken", error="HTTP 503")
+    backup = FakeProvider("backup")
+    gateway = LLMGateway([broken, backup], hedge=False, failure_threshold=2, reset_timeout=60)
+
+    async def scenario():
+        for _ in range(4):
+            await gateway.complete(MESSAGES)
+
+    run(scenario())
+    assert gateway.health["broken"].state == "open"
+    assert broken.calls == 2
+    assert backup.calls == 4
+
+
+def test_breaker_half_open_trial_closes_on_success():
+    flaky = FakeProvider("flaky", error="HTTP 503")
+    gateway = LLMGateway([flaky], hedge=False, failure_threshold=1, reset_timeout=0.05)
+
+    async def scenario():
+        try:
+            await gateway.complete(MESSAGES)
+        except LLMGatewayError:
+            pass
+        assert gateway.health["flaky"].state == "open"
+        await asyncio.sleep(0.06)
+        flaky.error = None
+        return await gateway.complete(MESSAGES)
+
+    result = run(scenario())
+    assert result.provider == "flaky"
+    assert gateway.health["flaky"].state == "closed"
+
+
+# Hedging: a slow attempt is raced by a backup, and the loser does not skew p95
+def test_hedges_slow_provider():
+    stuck = FakeProvider("stuck", response="late", latency=1.0)
+    quick = FakeProvider("quick", response="hedged answer", latency=0.01)
+    gateway = LLMGateway([stuck, quick], hedge=True, hedge_delay=0.05)
+
+    result = run(gateway.complete(MESSAGES))
+    assert result.provider == "quick"
+    assert result.hedged
+    assert gateway.hedged_requests == 1
+
+    stuck_health = gateway.health["stuck"]
+    assert stuck_health.cancelled == 1
+    assert stuck_health.latency_percentile(95) is None
+    assert stuck_health.latency_percentile(50, include_cancelled=True) is not None
+    assert stuck_health.error_rate == 0.0
+
+
+def test_no_hedge_when_disabled():
+    slow = FakeProvider("slow", response="slow answer", latency=0.1)
+    other = FakeProvider("other")
+    gateway = LLMGateway([slow, other], hedge=False)
+
+    result = run(gateway.complete(MESSAGES))
+    assert result.provider == "slow"
+    assert other.calls == 0
+
+
+# Deadline: nobody answering in time is a timeout and counts against the provider
+def test_deadline_times_out():
+    gateway = LLMGateway([FakeProvider("hung", latency=1.0)], hedge=False)
+    try:
+        run(gateway.complete(MESSAGES, timeout=0.05))
+    except LLMTimeoutError:
+        pass
+    else:
+        raise AssertionError("expected LLMTimeoutError")
+    assert gateway.health["hung"].failures == 1
+
+
+if __name__ == "__main__":
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
@@ -0,0 +1,260 @@
+"""
+Extracted Text Cache for X-ceed Python Services
+Persistent store of text parsed from resume files, invalidated by file fingerprint
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
+
+
+def file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Hash a file in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExtractedTextCache:
+    """
+    SQLite cache of extracted document text keyed by absolute path.
+
+    Each entry records the file's size, mtime_ns and SHA-256. A lookup whose
+    size and mtime still match is a hit without reading the file. If they
+    differ, the file is re-hashed: an unchanged hash (e.g. a copy or touch)
+    is still a hit, otherwise the entry is stale and the file is parsed again.
+    Text is also found by hash alone, so the same resume uploaded under two
+    names is parsed once.
+
+    Access times only drive LRU eviction, so hits are recorded in memory and
+    written in one batch every touch_batch hits or touch_interval seconds
+    (and before any eviction) instead of committing on every lookup.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, max_entries: int = 20000,
+                 touch_batch: int = 256, touch_interval: float = 30.0):
+        """
+        Initialize the cache
+
+        Args:
+            db_path: SQLite file path (defaults to services/python/.cache/extracted_text.sqlite3)
+            max_entries: Entries kept before least recently used ones are evicted
+            touch_batch: Pending access-time updates that trigger a write
+            touch_interval: Seconds after which pending access-time updates are written
+        """
+        self.db_path = db_path or os.path.join(DEFAULT_CACHE_DIR, 'extracted_text.sqlite3')
+        self.max_entries = max_entries
+        self.touch_batch = touch_batch
+        self.touch_interval = touch_interval
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._pending_touches: Dict[str, float] = {}
+        self._last_touch_flush = time.monotonic()
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS extracted_text (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                sha256 TEXT NOT NULL,
+                text TEXT NOT NULL,
+                last_accessed REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_extracted_text_sha ON extracted_text(sha256)")
+        self._conn.commit()
+
+    @staticmethod
+    def _fingerprint(path: str) -> Tuple[int, int]:
+        st = os.stat(path)
+        return st.st_size, st.st_mtime_ns
+
+    def _rows(self, paths: List[str]) -> Dict[str, Tuple[int, int, str, str]]:
+        rows = {}
+        with self._lock:
+            # Stay well below SQLite's bound-parameter limit
+            for start in range(0, len(paths), 500):
+                batch = paths[start:start + 500]
+                placeholders = ",".join("?" * len(batch))
+                for path, size, mtime_ns, sha, text in self._conn.execute(
+                    f"SELECT path, size, mtime_ns, sha256, text FROM extracted_text WHERE path IN ({placeholders})",
+                    batch
+                ):
+                    rows[path] = (size, mtime_ns, sha, text)
+        return rows
+
+    def _validate(self, path: str, row: Optional[Tuple[int, int, str, str]]) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Check a stored row against the file on disk
+
+        Returns:
+            (cached text or None, sha256 if the file had to be hashed)
+        """
+        size, mtime_ns = self._fingerprint(path)
+        if row is not None and row[0] == size and row[1] == mtime_ns:
+            return row[3], None
+
+        sha = file_sha256(path)
+        if row is not None and row[2] == sha:
+            self._store(path, size, mtime_ns, sha, row[3])
+            return row[3], sha
+
+        with self._lock:
+            match = self._conn.execute(
+                "SELECT text FROM extracted_text WHERE sha256 = ? LIMIT 1", (sha,)
+            ).fetchone()
+        if match is not None:
+            self._store(path, size, mtime_ns, sha, match[0])
+            return match[0], sha
+        return None, sha
+
+    def _store(self, path: str, size: int, mtime_ns: int, sha: str, text: str):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO extracted_text (path, size, mtime_ns, sha256, text, last_accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (path, size, mtime_ns, sha, text, now)
+            )
+            self._pending_touches.pop(path, None)
+            self._flush_touches_locked()
+            overflow = self._conn.execute("SELECT COUNT(*) FROM extracted_text").fetchone()[0] - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM extracted_text WHERE path IN "
+                    "(SELECT path FROM extracted_text ORDER BY last_accessed ASC LIMIT ?)",
+                    (overflow,)
+                )
+            self._conn.commit()
+
+    def _touch(self, paths: List[str]):
+        if not paths:
+            return
+        now = time.time()
+        with self._lock:
+            for path in paths:
+                self._pending_touches[path] = now
+            if (len(self._pending_touches) >= self.touch_batch
+                    or time.monotonic() - self._last_touch_flush >= self.touch_interval):
+                self._flush_touches_locked()
+                self._conn.commit()
+
+    def _flush_touches_locked(self):
+        """Write pending access times; the caller holds the lock and commits"""
+        if self._pending_touches:
+            self._conn.executemany(
+                "UPDATE extracted_text SET last_accessed = ? WHERE path = ?",
+                [(accessed, path) for path, accessed in self._pending_touches.items()]
+            )
+            self._pending_touches.clear()
+        self._last_touch_flush = time.monotonic()
+
+    def flush(self):
+        """Write pending access times now"""
+        with self._lock:
+            self._flush_touches_locked()
+            self._conn.commit()
+
+    def get(self, path: str) -> Optional[str]:
+        """Return cached text for a file if it is still current"""
+        path = os.path.abspath(path)
+        text, _ = self._validate(path, self._rows([path]).get(path))
+        if text is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._touch([path])
+        return text
+
+    def get_or_extract(self, path: str, extractor: Callable[[str], str]) -> str:
+        """
+        Return cached text for a file, parsing and storing it on a miss
+
+        Args:
+            path: File path
+            extractor: Function that parses the file and returns its text
+        """
+        path = os.path.abspath(path)
+        text, sha = self._validate(path, self._rows([path]).get(path))
+        if text is not None:
+            self.hits += 1
+            self._touch([path])
+            return text
+
+        self.misses += 1
+        return self._extract(path, sha, extractor)
+
+    def _extract(self, path: str, sha: Optional[str], extractor: Callable[[str], str]) -> str:
+        """Parse a file that missed the cache and store its text"""
+        size, mtime_ns = self._fingerprint(path)
+        text = extractor(path)
+        # Empty output usually means the parser failed; retry next time instead of caching it
+        if text:
+            self._store(path, size, mtime_ns, sha or file_sha256(path), text)
+        return text
+
+    def prefetch(self, paths: Iterable[str], extractor: Optional[Callable[[str], str]] = None,
+                 max_workers: int = 4) -> Dict[str, str]:
+        """
+        Look up many files with one query and parse the misses in parallel
+
+        Args:
+            paths: File paths (missing files are skipped)
+            extractor: Parser for misses; when None only cached texts are returned
+            max_workers: Parallel parses for misses
+
+        Returns:
+            Mapping of absolute path to text for every file that is cached or was parsed
+        """
+        paths = list(dict.fromkeys(os.path.abspath(p) for p in paths if p and os.path.exists(p)))
+        rows = self._rows(paths)
+
+        texts: Dict[str, str] = {}
+        misses: List[Tuple[str, Optional[str]]] = []
+        for path in paths:
+            text, sha = self._validate(path, rows.get(path))
+            if text is None:
+                misses.append((path, sha))
+            else:
+                texts[path] = text
+        self.hits += len(texts)
+        self.misses += len(misses)
+        self._touch(list(texts))
+
+        if extractor is not None and misses:
+            # Misses were already looked up and hashed above; parse them without a second lookup
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                parsed = pool.map(lambda miss: self._extract(miss[0], miss[1], extractor), misses)
+                for (path, _), text in zip(misses, parsed):
+                    if text:
+                        texts[path] = text
+        return texts
+
+    def clear(self):
+        """Remove every entry"""
+        with self._lock:
+            self._pending_touches.clear()
+            self._conn.execute("DELETE FROM extracted_text")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM extracted_text").fetchone()[0]
+        return {
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses
+        }
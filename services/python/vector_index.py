@@ -0,0 +1,138 @@
+"""
+In-Memory Vector Index for X-ceed Python Services
+Brute-force NumPy top-k search over a small set of document chunks, optionally memmap-backed
+"""
+
+import os
+import tempfile
+import weakref
+from typing import Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def _remove_file(path: Optional[str]):
+    if path and os.path.exists(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class VectorIndex:
+    """
+    Cosine-similarity index for the few dozen chunks of one resume/JD pair.
+
+    Vectors are L2-normalised once at insert time, so a query is a single
+    matrix-vector product followed by argpartition. With mmap_dir set the
+    matrix lives in a memory-mapped file instead of the heap; the file is
+    removed by close(), or when the index is garbage collected.
+    """
+
+    def __init__(self, embeddings: Any, mmap_dir: Optional[str] = None):
+        """
+        Initialize an empty index
+
+        Args:
+            embeddings: Object with embed_documents()/embed_query() (LangChain Embeddings interface)
+            mmap_dir: Directory for a memory-mapped vector file (in-memory when None)
+        """
+        self.embeddings = embeddings
+        self.mmap_dir = mmap_dir
+        self.documents: List[Any] = []
+        self._vectors: Optional[np.ndarray] = None
+        self._mmap_path: Optional[str] = None
+        self._finalizer = None
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the vector matrix in bytes"""
+        return 0 if self._vectors is None else int(self._vectors.nbytes)
+
+    def add_documents(self, documents: Sequence[Any]):
+        """
+        Embed documents (objects with a page_content attribute) and add them to the index
+        """
+        if not documents:
+            return
+        vectors = np.asarray(
+            self.embeddings.embed_documents([doc.page_content for doc in documents]),
+            dtype=np.float32
+        )
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.maximum(norms, 1e-12)
+
+        if self._vectors is not None:
+            vectors = np.vstack([np.asarray(self._vectors), vectors])
+        self._store(vectors)
+        self.documents.extend(documents)
+
+    def _store(self, vectors: np.ndarray):
+        if not self.mmap_dir:
+            self._vectors = vectors
+            return
+
+        old_path = self._mmap_path
+        os.makedirs(self.mmap_dir, exist_ok=True)
+        fd, path = tempfile.mkstemp(prefix="vector_index_", suffix=".f32", dir=self.mmap_dir)
+        os.close(fd)
+        mapped = np.memmap(path, dtype=np.float32, mode="w+", shape=vectors.shape)
+        mapped[:] = vectors
+        mapped.flush()
+
+        self._vectors = mapped
+        self._mmap_path = path
+        if self._finalizer is not None:
+            self._finalizer.detach()
+        self._finalizer = weakref.finalize(self, _remove_file, path)
+        _remove_file(old_path)
+
+    def search_by_vector(self, query_vector: Sequence[float], k: int = 3) -> List[Tuple[Any, float]]:
+        """
+        Return the k most similar documents to a vector
+
+        Returns:
+            List of (document, cosine similarity) sorted by descending similarity
+        """
+        if self._vectors is None or not self.documents:
+            return []
+
+        query = np.asarray(query_vector, dtype=np.float32)
+        query = query / max(float(np.linalg.norm(query)), 1e-12)
+        scores = self._vectors @ query
+
+        k = min(k, len(self.documents))
+        if k < len(self.documents):
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(self.documents))
+        top = top[np.argsort(-scores[top])]
+        return [(self.documents[i], float(scores[i])) for i in top]
+
+    def similarity_search_with_score(self, query: str, k: int = 3) -> List[Tuple[Any, float]]:
+        """Embed a query and return the k most similar documents with scores"""
+        if not self.documents:
+            return []
+        return self.search_by_vector(self.embeddings.embed_query(query), k)
+
+    def similarity_search(self, query: str, k: int = 3) -> List[Any]:
+        """Embed a query and return the k most similar documents"""
+        return [doc for doc, _ in self.similarity_search_with_score(query, k)]
+
+    def close(self):
+        """Release vectors and delete any backing file"""
+        self._vectors = None
+        self.documents = []
+        if self._finalizer is not None:
+            self._finalizer()
+            self._finalizer = None
+        self._mmap_path = None
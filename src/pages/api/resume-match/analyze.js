@@ -102,7 +102,234 @@ export async function POST(request) {
   }
 }
 
+// Resident Python worker (`resume_analyzer.py --serve`): models load once and every
+// request reuses the process. Set RESUME_ANALYZER_RESIDENT=false to spawn per request.
+// The worker answers one request at a time, in order, so a request's timeout starts
+// when the worker reaches it rather than when it is queued. Requests wait at most
+// RESUME_ANALYZER_QUEUE_WAIT_MS to be started (including a worker restart), and at most
+// RESUME_ANALYZER_MAX_PENDING may wait at once; beyond either the OpenRouter path is used.
+const RESIDENT_REQUEST_TIMEOUT_MS = 30000;
+const RESIDENT_STARTUP_TIMEOUT_MS = parseInt(process.env.RESUME_ANALYZER_STARTUP_TIMEOUT_MS || '120000', 10);
+const RESIDENT_QUEUE_WAIT_MS = parseInt(process.env.RESUME_ANALYZER_QUEUE_WAIT_MS || '60000', 10);
+const RESIDENT_MAX_PENDING = parseInt(process.env.RESUME_ANALYZER_MAX_PENDING || '8', 10);
+const READY_PING_ID = 0;
+
+let residentWorker = null;
+
+function getResidentWorker() {
+  if (residentWorker && !residentWorker.exited) {
+    return residentWorker;
+  }
+
+  const pythonScript = path.join(process.cwd(), 'scripts', 'resume_analyzer.py');
+  if (!fs.existsSync(pythonScript)) {
+    throw new Error('Python analyzer script not found');
+  }
+
+  const child = spawn('python', [pythonScript, '--serve'], {
+    stdio: ['pipe', 'pipe', 'pipe'],
+    env: { ...process.env, PYTHONPATH: path.join(process.cwd(), 'scripts') }
+  });
+  const worker = { child, pending: new Map(), nextId: READY_PING_ID + 1, buffer: '', exited: false, ready: false };
+
+  // Model loading can be slow, but a worker that never comes up must not hold requests forever
+  worker.startupTimer = setTimeout(() => {
+    console.warn('⚠️ Resident Python worker did not become ready, restarting it');
+    const startupError = new Error('Python worker startup timeout');
+    startupError.unavailable = true;
+    stopWorker(worker, startupError);
+  }, RESIDENT_STARTUP_TIMEOUT_MS);
+
+  child.stdout.on('data', (data) => {
+    worker.buffer += data.toString();
+    let newline;
+    while ((newline = worker.buffer.indexOf('\n')) >= 0) {
+      const line = worker.buffer.slice(0, newline).trim();
+      worker.buffer = worker.buffer.slice(newline + 1);
+      if (!line) continue;
+
+      let message;
+      try {
+        message = JSON.parse(line);
+      } catch (parseError) {
+        console.error('Failed to parse Python worker output:', parseError);
+        continue;
+      }
+
+      // The ping sent at spawn is answered once the models have loaded
+      if (message.id === READY_PING_ID) {
+        clearTimeout(worker.startupTimer);
+        worker.ready = true;
+        startNextRequest(worker);
+        continue;
+      }
+
+      const entry = worker.pending.get(message.id);
+      if (!entry) continue;
+      worker.pending.delete(message.id);
+      clearTimeout(entry.timer);
+      delete message.id;
+
+      if (message.error) {
+        const analysisError = new Error(`Python analyzer failed: ${message.error}`);
+        analysisError.analysisFailed = true;
+        entry.reject(analysisError);
+      } else {
+        entry.resolve(message);
+      }
+      startNextRequest(worker);
+    }
+  });
+
+  child.stderr.on('data', (data) => {
+    console.log('🐍', data.toString().trim());
+  });
+
+  // EPIPE and similar write errors surface here once the worker has gone away
+  child.stdin.on('error', (error) => stopWorker(worker, error));
+  child.on('exit', (code) => failWorker(worker, new Error(`Python worker exited with code ${code}`)));
+  child.on('error', (error) => failWorker(worker, error));
+
+  residentWorker = worker;
+  sendToWorker(worker, { command: 'ping', id: READY_PING_ID });
+  return worker;
+}
+
+function sendToWorker(worker, message) {
+  worker.child.stdin.write(JSON.stringify(message) + '\n', (error) => {
+    if (error) {
+      stopWorker(worker, error);
+    }
+  });
+}
+
+function stopWorker(worker, error) {
+  try {
+    worker.child.kill();
+  } catch (killError) {
+    // Already gone
+  }
+  failWorker(worker, error);
+}
+
+function failWorker(worker, error) {
+  if (worker.exited) return;
+  worker.exited = true;
+  clearTimeout(worker.startupTimer);
+  if (residentWorker === worker) {
+    residentWorker = null;
+  }
+
+  const entries = [...worker.pending.values()];
+  worker.pending.clear();
+  for (const entry of entries) {
+    clearTimeout(entry.timer);
+    if (entry.started || entry.retried || error.unavailable) {
+      clearTimeout(entry.queueTimer);
+      entry.reject(error);
+    } else {
+      // The worker never reached this request: give it one try on a fresh worker,
+      // still within its original queue deadline
+      entry.retried = true;
+      try {
+        dispatchToWorker(entry);
+      } catch (dispatchError) {
+        clearTimeout(entry.queueTimer);
+        entry.reject(dispatchError);
+      }
+    }
+  }
+}
+
+function startNextRequest(worker) {
+  if (!worker.ready || worker.exited) return;
+  // Requests are written to the worker only when it is free, so the oldest pending one is the one running
+  const [entry] = worker.pending.values();
+  if (!entry || entry.started) return;
+
+  entry.started = true;
+  clearTimeout(entry.queueTimer);
+  sendToWorker(worker, { ...entry.payload, id: entry.id });
+  entry.timer = setTimeout(() => {
+    worker.pending.delete(entry.id);
+    const timeoutError = new Error('Python analyzer timeout');
+    timeoutError.timedOut = true;
+    entry.reject(timeoutError);
+    // The worker is still busy with (or stuck on) this request; replace it so the queue moves on
+    console.warn('⚠️ Resident Python worker timed out, restarting it');
+    stopWorker(worker, new Error('Python worker restarted after a timeout'));
+  }, RESIDENT_REQUEST_TIMEOUT_MS);
+}
+
+function dispatchToWorker(entry) {
+  const worker = getResidentWorker();
+  if (worker.pending.size >= RESIDENT_MAX_PENDING) {
+    const busyError = new Error('Python worker queue is full');
+    busyError.unavailable = true;
+    throw busyError;
+  }
+  entry.id = worker.nextId++;
+  entry.worker = worker;
+  worker.pending.set(entry.id, entry);
+  startNextRequest(worker);
+}
+
+function callResidentAnalyzer(payload) {
+  return new Promise((resolve, reject) => {
+    const entry = {
+      payload,
+      started: false,
+      retried: false,
+      timer: null,
+      queueTimer: null,
+      resolve: (result) => {
+        result.analysisType = 'ai';
+        resolve(result);
+      },
+      reject
+    };
+    // Not yet written to the worker, so it can simply be dropped from the queue
+    entry.queueTimer = setTimeout(() => {
+      if (entry.started) return;
+      entry.worker.pending.delete(entry.id);
+      const waitError = new Error('Python worker queue wait timeout');
+      waitError.unavailable = true;
+      reject(waitError);
+    }, RESIDENT_QUEUE_WAIT_MS);
+
+    try {
+      dispatchToWorker(entry);
+    } catch (dispatchError) {
+      clearTimeout(entry.queueTimer);
+      reject(dispatchError);
+    }
+  });
+}
+
 async function callPythonAnalyzer(requestData) {
+  if (process.env.RESUME_ANALYZER_RESIDENT !== 'false') {
+    try {
+      return await callResidentAnalyzer({
+        job_description: requestData.jobDescription,
+        job_title: requestData.jobTitle,
+        job_requirements: requestData.jobRequirements || [],
+        resume_path: requestData.resumePath || '',
+        user_skills: requestData.userSkills || [],
+        user_id: requestData.userId
+      });
+    } catch (residentError) {
+      // A timed-out analysis already used its time budget; running it again one-off would double the work.
+      // A worker that is overloaded or cannot start would not do better as a one-off process either.
+      if (residentError.analysisFailed || residentError.timedOut || residentError.unavailable) {
+        throw residentError;
+      }
+      console.warn('⚠️ Resident Python worker failed, spawning one-off analyzer:', residentError.message);
+    }
+  }
+  return callPythonAnalyzerOnce(requestData);
+}
+
+async function callPythonAnalyzerOnce(requestData) {
   return new Promise((resolve, reject) => {
     const pythonScript = path.join(process.cwd(), 'scripts', 'resume_analyzer.py');
 